@@ -1,14 +1,11 @@
 from logging.config import fileConfig
 from sqlalchemy import engine_from_config, pool
 from alembic import context
-from dotenv import dotenv_values
+from back_end.config import settings
 from back_end.models import Base  # Adjust the import according to your project structure
 
-# Read environment variables
-config = dotenv_values()
-
-# Set the SQLAlchemy database URL dynamically
-sqlalchemy_url = f'postgresql://{config["DBUSER"]}:{config["DBPASS"]}@{config["DBHOST"]}/{config["DBNAME"]}'
+# Same URL as the application (DATABASE_URL, or the DB* variables from .env)
+sqlalchemy_url = settings.DATABASE_URL
 
 # This is the Alembic Config object, which provides
 # access to the values within the .ini file in use.
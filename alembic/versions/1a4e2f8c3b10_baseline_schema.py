@@ -0,0 +1,189 @@
+"""baseline schema
+
+Revision ID: 1a4e2f8c3b10
+Revises: 
+Create Date: 2026-10-18 09:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '1a4e2f8c3b10'
+down_revision: Union[str, None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Databases created before migrations were tracked already have these tables:
+# run `alembic stamp 1a4e2f8c3b10` once on them, then `alembic upgrade head`.
+
+
+def upgrade() -> None:
+    op.create_table(
+        'candidate',
+        sa.Column('candidate_id', sa.Integer(), nullable=False),
+        sa.Column('name', sa.String(length=255), nullable=False),
+        sa.Column('interview_token', sa.String(length=255), nullable=True),
+        sa.Column('token_expiry', sa.DateTime(), nullable=True),
+        sa.Column('is_interviewed', sa.Boolean(), nullable=True),
+        sa.Column('is_valid', sa.Boolean(), nullable=True),
+        sa.PrimaryKeyConstraint('candidate_id'),
+    )
+    op.create_index('ix_candidate_candidate_id', 'candidate', ['candidate_id'])
+
+    op.create_table(
+        'job_listing',
+        sa.Column('job_id', sa.Integer(), nullable=False),
+        sa.Column('title', sa.String(length=255), nullable=True),
+        sa.Column('description', sa.Text(), nullable=True),
+        sa.Column('location', sa.String(length=255), nullable=True),
+        sa.Column('salary', sa.String(length=50), nullable=True),
+        sa.Column('date_posted', sa.DateTime(), nullable=True),
+        sa.Column('is_opened', sa.Boolean(), nullable=True),
+        sa.PrimaryKeyConstraint('job_id'),
+    )
+    op.create_index('ix_job_listing_job_id', 'job_listing', ['job_id'])
+
+    op.create_table(
+        'user',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('username', sa.String(length=50), nullable=True),
+        sa.Column('hashed_password', sa.String(length=255), nullable=True),
+        sa.Column('role', sa.Enum('user', 'admin', name='userrole'), nullable=False),
+        sa.Column('is_deleted', sa.Boolean(), nullable=True),
+        sa.Column('created_at', sa.TIMESTAMP(), nullable=True),
+        sa.Column('updated_at', sa.TIMESTAMP(), nullable=True),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index('ix_user_id', 'user', ['id'])
+    op.create_index('ix_user_username', 'user', ['username'], unique=True)
+
+    op.create_table(
+        'prompts',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('name', sa.String(length=255), nullable=True),
+        sa.Column('content', sa.Text(), nullable=False),
+        sa.Column('required_elements', sa.Text(), nullable=True),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+        sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index('ix_prompts_id', 'prompts', ['id'])
+    op.create_index('ix_prompts_name', 'prompts', ['name'], unique=True)
+
+    op.create_table(
+        'interviews',
+        sa.Column('interview_id', sa.Integer(), nullable=False),
+        sa.Column('candidate_id', sa.Integer(), nullable=True),
+        sa.Column('start_time', sa.DateTime(), nullable=True),
+        sa.Column('end_time', sa.DateTime(), nullable=True),
+        sa.Column('duration', sa.Integer(), nullable=True),
+        sa.Column('transcript', sa.Text(), nullable=True),
+        sa.Column('summary', sa.Text(), nullable=True),
+        sa.Column('recording_url', sa.Text(), nullable=True),
+        sa.Column('video_recording_url', sa.Text(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.Column('success_evaluation', sa.Integer(), nullable=True),
+        sa.ForeignKeyConstraint(['candidate_id'], ['candidate.candidate_id']),
+        sa.PrimaryKeyConstraint('interview_id'),
+    )
+    op.create_index('ix_interviews_interview_id', 'interviews', ['interview_id'])
+
+    op.create_table(
+        'contact',
+        sa.Column('contact_id', sa.Integer(), nullable=False),
+        sa.Column('candidate_id', sa.Integer(), nullable=True),
+        sa.Column('email_address', sa.String(length=255), nullable=True),
+        sa.Column('phone_number', sa.String(length=50), nullable=True),
+        sa.ForeignKeyConstraint(['candidate_id'], ['candidate.candidate_id']),
+        sa.PrimaryKeyConstraint('contact_id'),
+    )
+    op.create_index('ix_contact_contact_id', 'contact', ['contact_id'])
+
+    op.create_table(
+        'address',
+        sa.Column('address_id', sa.Integer(), nullable=False),
+        sa.Column('candidate_id', sa.Integer(), nullable=True),
+        sa.Column('address_line_1', sa.Text(), nullable=True),
+        sa.Column('address_line_2', sa.Text(), nullable=True),
+        sa.Column('area', sa.String(length=255), nullable=True),
+        sa.Column('province', sa.String(length=255), nullable=True),
+        sa.Column('country', sa.String(length=255), nullable=True),
+        sa.Column('postal_code', sa.Integer(), nullable=True),
+        sa.ForeignKeyConstraint(['candidate_id'], ['candidate.candidate_id']),
+        sa.PrimaryKeyConstraint('address_id'),
+    )
+    op.create_index('ix_address_address_id', 'address', ['address_id'])
+
+    op.create_table(
+        'skills',
+        sa.Column('skill_id', sa.Integer(), nullable=False),
+        sa.Column('candidate_id', sa.Integer(), nullable=True),
+        sa.Column('skill', sa.String(length=255), nullable=True),
+        sa.ForeignKeyConstraint(['candidate_id'], ['candidate.candidate_id']),
+        sa.PrimaryKeyConstraint('skill_id'),
+    )
+    op.create_index('ix_skills_skill_id', 'skills', ['skill_id'])
+
+    op.create_table(
+        'projects',
+        sa.Column('project_id', sa.Integer(), nullable=False),
+        sa.Column('candidate_id', sa.Integer(), nullable=True),
+        sa.Column('name', sa.String(length=255), nullable=True),
+        sa.Column('description', sa.Text(), nullable=True),
+        sa.ForeignKeyConstraint(['candidate_id'], ['candidate.candidate_id']),
+        sa.PrimaryKeyConstraint('project_id'),
+    )
+    op.create_index('ix_projects_project_id', 'projects', ['project_id'])
+
+    op.create_table(
+        'experiences',
+        sa.Column('experience_id', sa.Integer(), nullable=False),
+        sa.Column('candidate_id', sa.Integer(), nullable=True),
+        sa.Column('job_title', sa.String(length=255), nullable=True),
+        sa.Column('company_name', sa.String(length=255), nullable=True),
+        sa.Column('start_date', sa.String(length=50), nullable=True),
+        sa.Column('end_date', sa.String(length=50), nullable=True),
+        sa.ForeignKeyConstraint(['candidate_id'], ['candidate.candidate_id']),
+        sa.PrimaryKeyConstraint('experience_id'),
+    )
+    op.create_index('ix_experiences_experience_id', 'experiences', ['experience_id'])
+
+    op.create_table(
+        'education',
+        sa.Column('education_id', sa.Integer(), nullable=False),
+        sa.Column('candidate_id', sa.Integer(), nullable=True),
+        sa.Column('degree', sa.String(length=255), nullable=True),
+        sa.Column('institution', sa.String(length=255), nullable=True),
+        sa.Column('start_date', sa.String(length=50), nullable=True),
+        sa.Column('end_date', sa.String(length=50), nullable=True),
+        sa.ForeignKeyConstraint(['candidate_id'], ['candidate.candidate_id']),
+        sa.PrimaryKeyConstraint('education_id'),
+    )
+    op.create_index('ix_education_education_id', 'education', ['education_id'])
+
+    op.create_table(
+        'job_application',
+        sa.Column('application_id', sa.Integer(), nullable=False),
+        sa.Column('job_id', sa.Integer(), nullable=True),
+        sa.Column('candidate_id', sa.Integer(), nullable=True),
+        sa.Column('date_applied', sa.DateTime(), nullable=True),
+        sa.Column('status', sa.String(length=50), nullable=True),
+        sa.Column('match_score', sa.Float(), nullable=True),
+        sa.ForeignKeyConstraint(['candidate_id'], ['candidate.candidate_id']),
+        sa.ForeignKeyConstraint(['job_id'], ['job_listing.job_id']),
+        sa.PrimaryKeyConstraint('application_id'),
+    )
+    op.create_index('ix_job_application_application_id', 'job_application', ['application_id'])
+
+
+def downgrade() -> None:
+    for table in (
+        'job_application', 'education', 'experiences', 'projects', 'skills', 'address',
+        'contact', 'interviews', 'prompts', 'user', 'job_listing', 'candidate',
+    ):
+        op.drop_table(table)
+    sa.Enum(name='userrole').drop(op.get_bind(), checkfirst=True)
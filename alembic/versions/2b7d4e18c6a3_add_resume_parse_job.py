@@ -0,0 +1,45 @@
+"""add resume_parse_job
+
+Revision ID: 2b7d4e18c6a3
+Revises: 1a4e2f8c3b10
+Create Date: 2026-10-18 09:01:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '2b7d4e18c6a3'
+down_revision: Union[str, None] = '1a4e2f8c3b10'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'resume_parse_job',
+        sa.Column('job_id', sa.Integer(), nullable=False),
+        sa.Column('filename', sa.String(length=255), nullable=True),
+        sa.Column('stored_filename', sa.String(length=255), nullable=False),
+        sa.Column('file_hash', sa.String(length=64), nullable=False),
+        sa.Column('status', sa.String(length=50), nullable=False),
+        sa.Column('progress', sa.String(length=50), nullable=True),
+        sa.Column('attempts', sa.Integer(), nullable=False),
+        sa.Column('candidate_id', sa.Integer(), nullable=True),
+        sa.Column('error', sa.Text(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.Column('started_at', sa.DateTime(), nullable=True),
+        sa.Column('heartbeat_at', sa.DateTime(), nullable=True),
+        sa.Column('completed_at', sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(['candidate_id'], ['candidate.candidate_id']),
+        sa.PrimaryKeyConstraint('job_id'),
+    )
+    op.create_index('ix_resume_parse_job_job_id', 'resume_parse_job', ['job_id'])
+    op.create_index('ix_resume_parse_job_status', 'resume_parse_job', ['status'])
+
+
+def downgrade() -> None:
+    op.drop_table('resume_parse_job')
@@ -0,0 +1,57 @@
+"""add canonical skill taxonomy
+
+Revision ID: 3c8e5f29d7b4
+Revises: 2b7d4e18c6a3
+Create Date: 2026-10-18 09:02:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3c8e5f29d7b4'
+down_revision: Union[str, None] = '2b7d4e18c6a3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'canonical_skill',
+        sa.Column('canonical_skill_id', sa.Integer(), nullable=False),
+        sa.Column('name', sa.String(length=255), nullable=False),
+        sa.Column('category', sa.String(length=100), nullable=True),
+        sa.PrimaryKeyConstraint('canonical_skill_id'),
+        sa.UniqueConstraint('name'),
+    )
+    op.create_index('ix_canonical_skill_canonical_skill_id', 'canonical_skill', ['canonical_skill_id'])
+
+    op.create_table(
+        'skill_alias',
+        sa.Column('alias_id', sa.Integer(), nullable=False),
+        sa.Column('canonical_skill_id', sa.Integer(), nullable=False),
+        sa.Column('alias', sa.String(length=255), nullable=False),
+        sa.ForeignKeyConstraint(['canonical_skill_id'], ['canonical_skill.canonical_skill_id']),
+        sa.PrimaryKeyConstraint('alias_id'),
+        sa.UniqueConstraint('alias'),
+    )
+    op.create_index('ix_skill_alias_alias_id', 'skill_alias', ['alias_id'])
+    op.create_index('ix_skill_alias_canonical_skill_id', 'skill_alias', ['canonical_skill_id'])
+
+    # Nullable with no default, so adding it does not rewrite the skills table
+    op.add_column('skills', sa.Column('canonical_skill_id', sa.Integer(), nullable=True))
+    op.create_foreign_key(
+        'skills_canonical_skill_id_fkey', 'skills', 'canonical_skill', ['canonical_skill_id'], ['canonical_skill_id']
+    )
+    op.create_index('ix_skills_canonical_skill_id', 'skills', ['canonical_skill_id'])
+
+
+def downgrade() -> None:
+    op.drop_index('ix_skills_canonical_skill_id', table_name='skills')
+    op.drop_constraint('skills_canonical_skill_id_fkey', 'skills', type_='foreignkey')
+    op.drop_column('skills', 'canonical_skill_id')
+    op.drop_table('skill_alias')
+    op.drop_table('canonical_skill')
@@ -0,0 +1,41 @@
+"""add match_result_cache
+
+Revision ID: 4d9f6a3ae8c5
+Revises: 3c8e5f29d7b4
+Create Date: 2026-10-18 09:03:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '4d9f6a3ae8c5'
+down_revision: Union[str, None] = '3c8e5f29d7b4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'match_result_cache',
+        sa.Column('cache_key', sa.String(length=64), nullable=False),
+        sa.Column('job_hash', sa.String(length=64), nullable=False),
+        sa.Column('resume_hash', sa.String(length=64), nullable=False),
+        sa.Column('prompt_hash', sa.String(length=64), nullable=False),
+        sa.Column('job_id', sa.Integer(), nullable=True),
+        sa.Column('candidate_id', sa.Integer(), nullable=True),
+        sa.Column('match_score', sa.Float(), nullable=False),
+        sa.Column('explanation', sa.Text(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.Column('last_hit_at', sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint('cache_key'),
+    )
+    op.create_index('ix_match_result_cache_job_id', 'match_result_cache', ['job_id'])
+    op.create_index('ix_match_result_cache_candidate_id', 'match_result_cache', ['candidate_id'])
+
+
+def downgrade() -> None:
+    op.drop_table('match_result_cache')
@@ -0,0 +1,62 @@
+"""add indexes for candidate lookups and relationship loads
+
+Revision ID: 5c1e7d2a9b40
+Revises: 8b3dae7e2c09
+Create Date: 2026-10-18 10:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5c1e7d2a9b40'
+down_revision: Union[str, None] = '8b3dae7e2c09'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Names match what `index=True` in models.py generates, so autogenerate sees them as present
+INDEXES = [
+    ("ix_candidate_interview_token", "candidate", ["interview_token"]),
+    ("ix_contact_candidate_id", "contact", ["candidate_id"]),
+    ("ix_contact_email_address", "contact", ["email_address"]),
+    ("ix_contact_phone_number", "contact", ["phone_number"]),
+    ("ix_address_candidate_id", "address", ["candidate_id"]),
+    ("ix_skills_candidate_id", "skills", ["candidate_id"]),
+    ("ix_projects_candidate_id", "projects", ["candidate_id"]),
+    ("ix_experiences_candidate_id", "experiences", ["candidate_id"]),
+    ("ix_education_candidate_id", "education", ["candidate_id"]),
+    ("ix_interviews_candidate_id", "interviews", ["candidate_id"]),
+    ("ix_job_application_candidate_id", "job_application", ["candidate_id"]),
+]
+
+
+def _drop_invalid(name: str) -> None:
+    # An interrupted concurrent build leaves an INVALID index behind that IF NOT EXISTS would keep
+    if op.get_context().as_sql:
+        return
+    invalid = op.get_bind().scalar(
+        sa.text(
+            "SELECT 1 FROM pg_index JOIN pg_class ON pg_class.oid = pg_index.indexrelid "
+            "WHERE pg_class.relname = :name AND NOT pg_index.indisvalid"
+        ),
+        {"name": name},
+    )
+    if invalid:
+        op.drop_index(name, postgresql_concurrently=True)
+
+
+def upgrade() -> None:
+    # CONCURRENTLY cannot run inside a transaction; each build only takes a lock that still allows writes
+    with op.get_context().autocommit_block():
+        for name, table, columns in INDEXES:
+            _drop_invalid(name)
+            op.create_index(name, table, columns, postgresql_concurrently=True, if_not_exists=True)
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, table, columns in reversed(INDEXES):
+            op.drop_index(name, table_name=table, postgresql_concurrently=True, if_exists=True)
@@ -0,0 +1,26 @@
+"""add job_application.match_source
+
+Revision ID: 5e0a7b4bf9d6
+Revises: 4d9f6a3ae8c5
+Create Date: 2026-10-18 09:04:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5e0a7b4bf9d6'
+down_revision: Union[str, None] = '4d9f6a3ae8c5'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('job_application', sa.Column('match_source', sa.String(length=20), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column('job_application', 'match_source')
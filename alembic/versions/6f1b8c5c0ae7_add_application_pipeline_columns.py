@@ -0,0 +1,42 @@
+"""add application pipeline columns
+
+Revision ID: 6f1b8c5c0ae7
+Revises: 5e0a7b4bf9d6
+Create Date: 2026-10-18 09:05:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '6f1b8c5c0ae7'
+down_revision: Union[str, None] = '5e0a7b4bf9d6'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('job_application', sa.Column('match_explanation', sa.Text(), nullable=True))
+    op.add_column('job_application', sa.Column('interview_link', sa.String(length=255), nullable=True))
+    # Applications from before the pipeline were processed inline, so they start out "done" and are
+    # never picked up by the workers. Constant defaults do not rewrite the table; they are dropped
+    # again so new rows get the model defaults ("queued", 0).
+    op.add_column('job_application', sa.Column('stage', sa.String(length=50), server_default='done', nullable=True))
+    op.add_column('job_application', sa.Column('attempts', sa.Integer(), server_default='0', nullable=True))
+    op.alter_column('job_application', 'stage', server_default=None)
+    op.alter_column('job_application', 'attempts', server_default=None)
+    op.add_column('job_application', sa.Column('heartbeat_at', sa.DateTime(), nullable=True))
+    op.add_column('job_application', sa.Column('processed_at', sa.DateTime(), nullable=True))
+    op.add_column('job_application', sa.Column('error', sa.Text(), nullable=True))
+    # The workers poll on stage; build its index without blocking application writes
+    with op.get_context().autocommit_block():
+        op.create_index('ix_job_application_stage', 'job_application', ['stage'], postgresql_concurrently=True)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_job_application_stage', table_name='job_application')
+    for column in ('error', 'processed_at', 'heartbeat_at', 'attempts', 'stage', 'interview_link', 'match_explanation'):
+        op.drop_column('job_application', column)
@@ -0,0 +1,60 @@
+"""add application idempotency key and one application per job and candidate
+
+Revision ID: 8b3dae7e2c09
+Revises: 7a2c9d6d1bf8
+Create Date: 2026-10-18 09:07:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8b3dae7e2c09'
+down_revision: Union[str, None] = '7a2c9d6d1bf8'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+APPLICATION_UNIQUE = "uq_job_application_job_candidate"
+
+
+def _drop_invalid(name: str) -> None:
+    # An interrupted concurrent build leaves an INVALID index behind that IF NOT EXISTS would keep
+    if op.get_context().as_sql:
+        return
+    invalid = op.get_bind().scalar(
+        sa.text(
+            "SELECT 1 FROM pg_index JOIN pg_class ON pg_class.oid = pg_index.indexrelid "
+            "WHERE pg_class.relname = :name AND NOT pg_index.indisvalid"
+        ),
+        {"name": name},
+    )
+    if invalid:
+        op.drop_index(name, postgresql_concurrently=True)
+
+
+def upgrade() -> None:
+    # A new, all-NULL column: the unique constraint is built on an empty index
+    op.add_column('job_application', sa.Column('idempotency_key', sa.String(length=255), nullable=True))
+    op.create_unique_constraint('job_application_idempotency_key_key', 'job_application', ['idempotency_key'])
+
+    # The existing rows need a full index build, so it runs concurrently and is attached as the
+    # constraint afterwards; only the ADD CONSTRAINT takes a (brief) exclusive lock.
+    # Fails if duplicate applications already exist.
+    with op.get_context().autocommit_block():
+        _drop_invalid(APPLICATION_UNIQUE)
+        op.create_index(
+            APPLICATION_UNIQUE, 'job_application', ['job_id', 'candidate_id'],
+            unique=True, postgresql_concurrently=True, if_not_exists=True,
+        )
+        op.execute(
+            f"ALTER TABLE job_application ADD CONSTRAINT {APPLICATION_UNIQUE} UNIQUE USING INDEX {APPLICATION_UNIQUE}"
+        )
+
+
+def downgrade() -> None:
+    op.drop_constraint(APPLICATION_UNIQUE, 'job_application', type_='unique')
+    op.drop_constraint('job_application_idempotency_key_key', 'job_application', type_='unique')
+    op.drop_column('job_application', 'idempotency_key')
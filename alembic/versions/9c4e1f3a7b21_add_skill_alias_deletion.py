@@ -0,0 +1,33 @@
+"""add skill_alias_deletion
+
+Revision ID: 9c4e1f3a7b21
+Revises: 5c1e7d2a9b40
+Create Date: 2026-10-18 14:20:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9c4e1f3a7b21'
+down_revision: Union[str, None] = '5c1e7d2a9b40'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'skill_alias_deletion',
+        sa.Column('deletion_id', sa.Integer(), nullable=False),
+        sa.Column('alias_id', sa.Integer(), nullable=False),
+        sa.Column('deleted_at', sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint('deletion_id'),
+    )
+    op.create_index('ix_skill_alias_deletion_deletion_id', 'skill_alias_deletion', ['deletion_id'])
+
+
+def downgrade() -> None:
+    op.drop_table('skill_alias_deletion')
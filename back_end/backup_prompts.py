@@ -98,3 +98,32 @@ Provide the extracted information in a flat JSON object like this below and don'
 }}
 """
 
+
+
+# Scores several candidates against one job in a single call; used by batch matching.
+# Filled in with str.replace, so the braces below are literal.
+MATCHING_BATCH_EVALUATION_PROMPT = """
+Job Details:
+{job_details}
+
+Candidates (one compact JSON profile per line, identified by "id"):
+{candidates}
+
+Evaluate every candidate independently against the job. Do not compare candidates with each other.
+
+Evaluation Criteria:
+1. Skills Match: Compare required job skills with candidate's skills. Weight: 40%
+2. Experience Relevance: Assess how candidate's experience aligns with job requirements. Weight: 30%
+3. Education Fit: Evaluate if candidate's education meets job requirements. Weight: 15%
+4. Additional Qualifications: Consider certifications, projects, or other relevant factors. Weight: 15%
+
+Instructions:
+- Provide a match score between 0 and 10 (use one decimal place if needed) for each candidate.
+- Offer a concise explanation (max 100 words) per candidate highlighting key match points and any significant gaps.
+- Return exactly one entry per candidate id listed above.
+
+Respond with a JSON array only, in the same order as the candidates, and don't write anything else:
+[
+    {"id": <candidate id>, "match_score": <score>, "explanation": "<brief explanation>"}
+]
+"""
@@ -0,0 +1,158 @@
+"""Fail when a hot lookup query is planned as a sequential scan.
+
+Runs EXPLAIN on the queries behind candidate de-duplication, interview link
+validation, "my jobs", duplicate application checks and every candidate
+relationship load. By default it first seeds synthetic candidates so the
+planner sees production-sized tables; the seed data, and the statistics
+gathered for it, are rolled back at the end.
+
+    python check_query_plans.py                  # seed 100k candidates
+    python check_query_plans.py --candidates 20000
+    python check_query_plans.py --no-seed        # check against existing data as-is
+
+Exits with status 1 if any query scans a table sequentially.
+"""
+import argparse
+import json
+import sys
+
+from sqlalchemy import or_, select, text
+
+from database import SessionLocal
+from models import Candidate, Contact, JobApplication
+
+SEED_JOBS = 20
+
+SEED_STATEMENTS = [
+    """INSERT INTO candidate (name, interview_token, is_interviewed, is_valid)
+       SELECT 'Plan check ' || g, md5('plan-check-' || g), false, true FROM generate_series(1, :candidates) g""",
+    """INSERT INTO job_listing (title, description, is_opened)
+       SELECT 'Plan check job ' || g, 'Seeded by check_query_plans.py', true FROM generate_series(1, :jobs) g""",
+    """INSERT INTO contact (candidate_id, email_address, phone_number)
+       SELECT candidate_id, 'plan' || candidate_id || '@example.com', '+1555' || lpad(candidate_id::text, 8, '0')
+       FROM candidate WHERE candidate_id > :first_candidate""",
+    """INSERT INTO address (candidate_id, area, country)
+       SELECT candidate_id, 'Area', 'Country' FROM candidate WHERE candidate_id > :first_candidate""",
+    """INSERT INTO skills (candidate_id, skill)
+       SELECT candidate_id, 'Skill ' || s FROM candidate, generate_series(1, 5) s WHERE candidate_id > :first_candidate""",
+    """INSERT INTO projects (candidate_id, name, description)
+       SELECT candidate_id, 'Project ' || p, 'Seeded' FROM candidate, generate_series(1, 2) p WHERE candidate_id > :first_candidate""",
+    """INSERT INTO experiences (candidate_id, job_title, company_name)
+       SELECT candidate_id, 'Engineer', 'Company ' || e FROM candidate, generate_series(1, 2) e WHERE candidate_id > :first_candidate""",
+    """INSERT INTO education (candidate_id, degree, institution)
+       SELECT candidate_id, 'BSc', 'University' FROM candidate WHERE candidate_id > :first_candidate""",
+    """INSERT INTO interviews (candidate_id, duration, summary)
+       SELECT candidate_id, 900, 'Seeded' FROM candidate WHERE candidate_id > :first_candidate AND candidate_id % 4 = 0""",
+    """INSERT INTO job_application (job_id, candidate_id, status, stage)
+       SELECT job.job_id, candidate.candidate_id, 'Applied', 'done'
+       FROM candidate
+       JOIN (SELECT job_id, row_number() OVER (ORDER BY job_id) - 1 AS slot FROM job_listing WHERE job_id > :first_job) job
+         ON job.slot = candidate.candidate_id % :jobs
+       WHERE candidate.candidate_id > :first_candidate""",
+]
+
+SEEDED_TABLES = [
+    "candidate", "job_listing", "contact", "address", "skills",
+    "projects", "experiences", "education", "interviews", "job_application",
+]
+
+
+def seed(db, candidates: int):
+    """Insert synthetic rows in the current transaction and return a sample candidate id."""
+    first_candidate = db.scalar(text("SELECT COALESCE(MAX(candidate_id), 0) FROM candidate"))
+    first_job = db.scalar(text("SELECT COALESCE(MAX(job_id), 0) FROM job_listing"))
+    params = {"candidates": candidates, "jobs": SEED_JOBS, "first_candidate": first_candidate, "first_job": first_job}
+    for statement in SEED_STATEMENTS:
+        db.execute(text(statement), params)
+    for table in SEEDED_TABLES:
+        db.execute(text(f"ANALYZE {table}"))
+    print(f"Seeded {candidates} candidates (rolled back when the check finishes)")
+    # Sequences are not rolled back, so seeded ids need not follow the previous maximum
+    return db.scalar(
+        text("SELECT candidate_id FROM candidate WHERE candidate_id > :first_candidate ORDER BY candidate_id OFFSET :middle LIMIT 1"),
+        {"first_candidate": first_candidate, "middle": candidates // 2},
+    )
+
+
+def hot_queries(db, candidate_id: int):
+    """(name, statement) for each lookup that must be served by an index."""
+    candidate = db.get(Candidate, candidate_id) if candidate_id is not None else None
+    if candidate is None:
+        raise ValueError(f"Candidate {candidate_id} not found; seed data or pass --candidate-id")
+    contact = db.scalar(select(Contact).where(Contact.candidate_id == candidate_id))
+    application = db.scalar(select(JobApplication).where(JobApplication.candidate_id == candidate_id))
+    # selectinload batches parents into one IN query per relationship
+    candidate_ids = list(range(candidate_id, candidate_id + 50))
+
+    queries = [
+        ("get_existing_candidate", select(Contact.candidate_id).where(or_(
+            Contact.email_address == (contact.email_address if contact else "nobody@example.com"),
+            Contact.phone_number == (contact.phone_number if contact else "+10000000000"),
+        ))),
+        ("validate_interview_link", select(Candidate).where(Candidate.interview_token == (candidate.interview_token or "missing"))),
+        ("get_my_jobs", select(JobApplication).where(JobApplication.candidate_id == candidate_id)),
+        ("apply_for_job duplicate check", select(JobApplication).where(
+            JobApplication.job_id == (application.job_id if application else 1),
+            JobApplication.candidate_id == candidate_id,
+        )),
+    ]
+    for relationship in Candidate.__mapper__.relationships:
+        model = relationship.mapper.class_
+        queries.append((
+            f"Candidate.{relationship.key} load",
+            select(model).where(model.candidate_id.in_(candidate_ids)),
+        ))
+    return queries
+
+
+def sequential_scans(plan) -> list:
+    """Tables read with a Seq Scan anywhere in an EXPLAIN (FORMAT JSON) plan node."""
+    scans = [plan["Relation Name"]] if plan.get("Node Type") == "Seq Scan" else []
+    for child in plan.get("Plans", []):
+        scans.extend(sequential_scans(child))
+    return scans
+
+
+def explain(db, statement):
+    sql = statement.compile(dialect=db.bind.dialect, compile_kwargs={"literal_binds": True})
+    result = db.scalar(text(f"EXPLAIN (FORMAT JSON) {sql}"))
+    plan = json.loads(result) if isinstance(result, str) else result
+    return plan[0]["Plan"]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--candidates", type=int, default=100_000, help="Synthetic candidates to seed")
+    parser.add_argument("--no-seed", action="store_true", help="Use the data already in the database")
+    parser.add_argument("--candidate-id", type=int, help="Candidate to look up (with --no-seed)")
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    try:
+        if args.no_seed:
+            candidate_id = args.candidate_id or db.scalar(select(Candidate.candidate_id).limit(1))
+        else:
+            candidate_id = seed(db, args.candidates)
+
+        failures = 0
+        for name, statement in hot_queries(db, candidate_id):
+            plan = explain(db, statement)
+            scans = sequential_scans(plan)
+            if scans:
+                failures += 1
+                print(f"FAIL {name}: sequential scan on {', '.join(scans)}")
+                print(json.dumps(plan, indent=2))
+            else:
+                print(f"ok   {name}: {plan['Node Type']}")
+    finally:
+        db.rollback()
+        db.close()
+
+    if failures:
+        print(f"{failures} hot queries use sequential scans")
+        sys.exit(1)
+    print("All hot queries use indexes")
+
+
+if __name__ == "__main__":
+    main()
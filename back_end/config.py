@@ -1,16 +1,127 @@
 import os
 from dotenv import load_dotenv
+from sqlalchemy.engine import URL
 
 load_dotenv()
 
 class Settings:
     OPENAI_API_KEY = os.getenv('OPENAI_API_KEY')
     UPLOAD_FOLDER = './uploads'
+    MAX_UPLOAD_SIZE_MB = int(os.getenv('MAX_UPLOAD_SIZE_MB', 10))
+    UPLOAD_CHUNK_SIZE = int(os.getenv('UPLOAD_CHUNK_SIZE', 1024 * 1024))
     ALLOWED_ORIGINS = ["*"]
     HOST = "127.0.0.1"
     PORT = 8000
-    DATABASE_URL = f"postgresql://{os.getenv('DBUSER')}:{os.getenv('DBPASS')}@{os.getenv('DBHOST')}:{os.getenv('DBPORT')}/{os.getenv('DBNAME')}"
+    # Database; an explicit DATABASE_URL wins over the individual DB* variables
+    DATABASE_URL = os.getenv('DATABASE_URL') or URL.create(
+        "postgresql",
+        username=os.getenv('DBUSER'),
+        password=os.getenv('DBPASS'),  # Escaped by URL.create, so any character is safe
+        host=os.getenv('DBHOST'),
+        port=int(os.getenv('DBPORT')) if os.getenv('DBPORT') else None,
+        database=os.getenv('DBNAME'),
+    ).render_as_string(hide_password=False)
+    # Per engine and per process: size against Postgres max_connections divided by the number of workers
+    DB_POOL_SIZE = int(os.getenv('DB_POOL_SIZE', 5))
+    DB_MAX_OVERFLOW = int(os.getenv('DB_MAX_OVERFLOW', 10))
+    DB_POOL_TIMEOUT_SECONDS = float(os.getenv('DB_POOL_TIMEOUT_SECONDS', 30))
+    DB_POOL_RECYCLE_SECONDS = int(os.getenv('DB_POOL_RECYCLE_SECONDS', 1800))
+    DB_POOL_PRE_PING = os.getenv('DB_POOL_PRE_PING', 'true').lower() == 'true'
+    # Read replicas for dashboards and listings (comma-separated URLs); reads fall back to the primary
+    DB_REPLICA_URLS = [url.strip() for url in os.getenv('DB_REPLICA_URLS', '').split(',') if url.strip()]
+    DB_REPLICA_MAX_LAG_SECONDS = float(os.getenv('DB_REPLICA_MAX_LAG_SECONDS', 5))
+    DB_REPLICA_CHECK_INTERVAL_SECONDS = float(os.getenv('DB_REPLICA_CHECK_INTERVAL_SECONDS', 10))
+    DB_REPLICA_CHECK_TIMEOUT_SECONDS = float(os.getenv('DB_REPLICA_CHECK_TIMEOUT_SECONDS', 2))
     FROM_EMAIL = os.getenv('FROM_EMAIL')
     EMAIL_PASSWORD = os.getenv('EMAIL_PASSWORD')
 
-settings = Settings()
\ No newline at end of file
+    # Outgoing mail; point SMTP_HOST/SMTP_PORT at a local stand-in and disable STARTTLS for development
+    SMTP_HOST = os.getenv('SMTP_HOST', 'smtp.gmail.com')
+    SMTP_PORT = int(os.getenv('SMTP_PORT', 587))
+    SMTP_STARTTLS = os.getenv('SMTP_STARTTLS', 'true').lower() == 'true'
+    SMTP_USE_SSL = os.getenv('SMTP_USE_SSL', 'false').lower() == 'true'
+    SMTP_USERNAME = os.getenv('SMTP_USERNAME')  # Defaults to FROM_EMAIL
+    SMTP_TIMEOUT_SECONDS = float(os.getenv('SMTP_TIMEOUT_SECONDS', 30))
+    SMTP_POOL_SIZE = int(os.getenv('SMTP_POOL_SIZE', 2))
+    SMTP_MAX_IDLE_SECONDS = int(os.getenv('SMTP_MAX_IDLE_SECONDS', 60))
+    EMAIL_SENDER_WORKERS = int(os.getenv('EMAIL_SENDER_WORKERS', 2))
+    EMAIL_BATCH_SIZE = int(os.getenv('EMAIL_BATCH_SIZE', 20))
+    EMAIL_MAX_ATTEMPTS = int(os.getenv('EMAIL_MAX_ATTEMPTS', 5))
+    EMAIL_RETRY_BASE_DELAY = float(os.getenv('EMAIL_RETRY_BASE_DELAY', 30))
+    EMAIL_RETRY_MAX_DELAY = float(os.getenv('EMAIL_RETRY_MAX_DELAY', 3600))
+
+    # LLM gateway
+    LLM_MODEL = os.getenv('LLM_MODEL', 'gpt-4-0125-preview')
+    LLM_TIMEOUT_SECONDS = float(os.getenv('LLM_TIMEOUT_SECONDS', 120))
+    LLM_MAX_CONNECTIONS = int(os.getenv('LLM_MAX_CONNECTIONS', 20))
+    LLM_MAX_CONCURRENCY = int(os.getenv('LLM_MAX_CONCURRENCY', 10))
+    LLM_PURPOSE_CONCURRENCY = {
+        "RESUME_PARSING_PROMPT": int(os.getenv('LLM_RESUME_PARSING_CONCURRENCY', 4)),
+        "MATCHING_EVALUATION_PROMPT": int(os.getenv('LLM_MATCHING_CONCURRENCY', 6)),
+        "JOB_DESCRIPTION_PROMPT": int(os.getenv('LLM_JOB_DESCRIPTION_CONCURRENCY', 2)),
+    }
+    LLM_MAX_RETRIES = int(os.getenv('LLM_MAX_RETRIES', 3))
+    LLM_JSON_RETRIES = int(os.getenv('LLM_JSON_RETRIES', 1))  # Re-asks after a structurally invalid JSON stream
+    LLM_RETRY_BASE_DELAY = float(os.getenv('LLM_RETRY_BASE_DELAY', 1.0))
+    LLM_RETRY_MAX_DELAY = float(os.getenv('LLM_RETRY_MAX_DELAY', 20.0))
+    # USD per 1K tokens, used for the cost metric; defaults are gpt-4-0125-preview list prices
+    LLM_INPUT_PRICE_PER_1K = float(os.getenv('LLM_INPUT_PRICE_PER_1K', 0.01))
+    LLM_OUTPUT_PRICE_PER_1K = float(os.getenv('LLM_OUTPUT_PRICE_PER_1K', 0.03))
+
+    # PDF text extraction
+    PDF_EXTRACTION_WORKERS = int(os.getenv('PDF_EXTRACTION_WORKERS', os.cpu_count() or 2))
+    PDF_EXTRACTION_TIMEOUT_SECONDS = float(os.getenv('PDF_EXTRACTION_TIMEOUT_SECONDS', 30))
+
+    # Resume text sent per parsing call; longer resumes are split into chunks
+    RESUME_PROMPT_TOKEN_BUDGET = int(os.getenv('RESUME_PROMPT_TOKEN_BUDGET', 6000))
+
+    # Bulk resume ingestion
+    BULK_MAX_FILES = int(os.getenv('BULK_MAX_FILES', 500))
+    BULK_MAX_ZIP_SIZE_MB = int(os.getenv('BULK_MAX_ZIP_SIZE_MB', 200))
+    BULK_SUBMIT_CONCURRENCY = int(os.getenv('BULK_SUBMIT_CONCURRENCY', 2))
+    BULK_MAX_BATCHES_KEPT = int(os.getenv('BULK_MAX_BATCHES_KEPT', 100))
+
+    # Background resume parse jobs
+    RESUME_JOB_WORKERS = int(os.getenv('RESUME_JOB_WORKERS', 4))
+    RESUME_JOB_MAX_ATTEMPTS = int(os.getenv('RESUME_JOB_MAX_ATTEMPTS', 3))
+    JOB_POLL_INTERVAL_SECONDS = float(os.getenv('JOB_POLL_INTERVAL_SECONDS', 2))
+    JOB_STALE_AFTER_SECONDS = int(os.getenv('JOB_STALE_AFTER_SECONDS', 300))
+
+    # Background application pipeline (match -> schedule interview -> notify)
+    APPLICATION_WORKERS = int(os.getenv('APPLICATION_WORKERS', 4))
+    APPLICATION_MAX_ATTEMPTS = int(os.getenv('APPLICATION_MAX_ATTEMPTS', 3))
+    APPLICATION_EVENTS_TIMEOUT_SECONDS = int(os.getenv('APPLICATION_EVENTS_TIMEOUT_SECONDS', 300))
+    INTERVIEW_SCORE_THRESHOLD = float(os.getenv('INTERVIEW_SCORE_THRESHOLD', 7))
+
+    # Canonical skill taxonomy
+    SKILL_TAXONOMY_REFRESH_SECONDS = int(os.getenv('SKILL_TAXONOMY_REFRESH_SECONDS', 60))
+
+    # Candidate shortlist index
+    CANDIDATE_INDEX_REBUILD_SECONDS = int(os.getenv('CANDIDATE_INDEX_REBUILD_SECONDS', 900))
+    SHORTLIST_DEFAULT_SIZE = int(os.getenv('SHORTLIST_DEFAULT_SIZE', 50))
+
+    # Batch matching
+    MATCH_BATCH_MAX_CANDIDATES = int(os.getenv('MATCH_BATCH_MAX_CANDIDATES', 500))
+    MATCH_BATCH_CONCURRENCY = int(os.getenv('MATCH_BATCH_CONCURRENCY', 6))
+    MATCH_BATCH_RATE_PER_MINUTE = float(os.getenv('MATCH_BATCH_RATE_PER_MINUTE', 0))  # 0 disables the limit
+    MATCH_PROMPT_BATCH_SIZE = int(os.getenv('MATCH_PROMPT_BATCH_SIZE', 8))  # Candidates per LLM call; 1 disables packing
+
+    # Local pre-score bands (0-10); applications in between are scored by the LLM
+    PRESCORE_REJECT_BELOW = float(os.getenv('PRESCORE_REJECT_BELOW', 2.0))
+    PRESCORE_ACCEPT_FROM = float(os.getenv('PRESCORE_ACCEPT_FROM', 9.0))
+
+    # Parsed resume cache
+    RESUME_CACHE_FOLDER = os.getenv('RESUME_CACHE_FOLDER', './cache/parsed_resumes')
+    RESUME_CACHE_MAX_MB = int(os.getenv('RESUME_CACHE_MAX_MB', 256))
+
+    def __init__(self):
+        # The pipeline compares local decisions against the interview threshold like LLM scores, so a
+        # local "accept" below it would be recorded as Not Qualified (and a "reject" above it invited)
+        if not self.PRESCORE_REJECT_BELOW <= self.INTERVIEW_SCORE_THRESHOLD <= self.PRESCORE_ACCEPT_FROM:
+            raise ValueError(
+                "Pre-score bands must straddle the interview threshold: PRESCORE_REJECT_BELOW "
+                f"({self.PRESCORE_REJECT_BELOW}) <= INTERVIEW_SCORE_THRESHOLD ({self.INTERVIEW_SCORE_THRESHOLD}) "
+                f"<= PRESCORE_ACCEPT_FROM ({self.PRESCORE_ACCEPT_FROM})"
+            )
+
+settings = Settings()
@@ -1,16 +1,76 @@
 from sqlalchemy import create_engine
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
-from dotenv import dotenv_values
-config = dotenv_values()
-SQLALCHEMY_DATABASE_URL = f'postgresql://{config["DBUSER"]}:{config["DBPASS"]}@{config["DBHOST"]}/{config["DBNAME"]}'
+from config import settings
+from utils.db_pool import InstrumentedAsyncQueuePool, InstrumentedQueuePool, track_engine
+from utils.db_routing import ReplicaSet, RoutingSession
 
-engine = create_engine(SQLALCHEMY_DATABASE_URL)
+
+def create_db_engine(url: str = None, name: str = "primary", is_async: bool = True):
+    """Build an engine with the configured pool settings and pool metrics.
+
+    Every engine in the process comes from here, so pool sizing is set in
+    one place. Async engines always use the asyncpg driver. Pool metrics
+    are labelled `name`, with a `_sync` suffix for synchronous engines.
+    """
+    url = make_url(url or settings.DATABASE_URL)
+    label = name if is_async else f"{name}_sync"
+    options = dict(
+        poolclass=InstrumentedAsyncQueuePool if is_async else InstrumentedQueuePool,
+        pool_size=settings.DB_POOL_SIZE,
+        max_overflow=settings.DB_MAX_OVERFLOW,
+        pool_timeout=settings.DB_POOL_TIMEOUT_SECONDS,
+        pool_recycle=settings.DB_POOL_RECYCLE_SECONDS,
+        pool_pre_ping=settings.DB_POOL_PRE_PING,
+        pool_logging_name=label,
+    )
+    if is_async:
+        engine = create_async_engine(url.set(drivername="postgresql+asyncpg"), **options)
+    else:
+        engine = create_engine(url, **options)
+    track_engine(label, engine)
+    return engine
+
+
+# Synchronous engine and sessions, for scripts and one-off maintenance outside the event loop
+engine = create_db_engine(is_async=False)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# The API and its workers use the async engine so queries never block the event loop.
+# Attributes are not expired on commit: reloading them would need IO on plain attribute access.
+async_engine = create_db_engine()
+AsyncSessionLocal = async_sessionmaker(
+    async_engine, class_=AsyncSession, sync_session_class=RoutingSession, autoflush=False, expire_on_commit=False
+)
+
+# Optional read replicas; only sessions from get_read_db use them
+replicas = ReplicaSet({
+    f"replica{number}": create_db_engine(url, name=f"replica{number}")
+    for number, url in enumerate(settings.DB_REPLICA_URLS, start=1)
+})
+
 Base = declarative_base()
 
-def get_db():
+async def get_db():
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
+async def get_read_db():
+    """Session for read-only endpoints (dashboards, listings).
+
+    Queries go to a replica within DB_REPLICA_MAX_LAG_SECONDS, or to the
+    primary when none is configured or current. A write in the session
+    moves it back to the primary for the rest of the request.
+    """
+    async with AsyncSessionLocal() as db:
+        await replicas.route(db)
+        yield db
+
+
+def get_sync_db():
     db = SessionLocal()
     try:
         yield db
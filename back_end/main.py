@@ -1,8 +1,15 @@
 from fastapi import FastAPI
+from fastapi.responses import PlainTextResponse
 from fastapi.middleware.cors import CORSMiddleware
-from routers import resume, candidate, interview, jobs, application, admin, prompts
+from routers import resume, candidate, interview, jobs, application, admin, prompts, skills
 from config import settings
 from middleware import role_dependency
+from utils import llm_utils, pdf_utils
+from utils.metrics import registry
+from services.resume_job_service import resume_job_workers
+from services.application_pipeline_service import application_workers
+from services.email_outbox_service import email_sender
+from utils.email_utils import smtp_pool
 
 app = FastAPI()
 
@@ -30,6 +37,30 @@ app.include_router(
 )
 app.include_router(admin.router, prefix=f"/api/{API_VERSION}", tags=["admin"])
 app.include_router(prompts.router, prefix="/api", tags=["prompts"])
+app.include_router(skills.router, prefix=f"/api/{API_VERSION}", tags=["skills"])
+
+
+@app.on_event("startup")
+async def startup():
+    resume_job_workers.start()
+    application_workers.start()
+    email_sender.start()
+
+
+@app.on_event("shutdown")
+async def shutdown():
+    await resume_job_workers.stop()
+    await application_workers.stop()
+    await email_sender.stop()
+    smtp_pool.close_all()
+    await llm_utils.close()
+    pdf_utils.shutdown_executor()
+
+
+# Prometheus text exposition of LLM, cache and pool metrics
+@app.get("/metrics", response_class=PlainTextResponse, include_in_schema=False)
+async def metrics():
+    return PlainTextResponse(registry.render(), media_type="text/plain; version=0.0.4")
 
 
 @app.get("/")
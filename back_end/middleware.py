@@ -1,5 +1,5 @@
 from fastapi import Request, HTTPException, Depends
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from jose import JWTError, jwt
 from database import get_db
 from models import User
@@ -7,7 +7,7 @@ from utils.admin_utils import SECRET_KEY, ALGORITHM
 from starlette.status import HTTP_401_UNAUTHORIZED
 
 
-async def role_dependency(request: Request, db: Session = Depends(get_db)):
+async def role_dependency(request: Request, db: AsyncSession = Depends(get_db)):
     # Extract token from Authorization header
     token = request.headers.get("Authorization")
     if token is None or not token.startswith("Bearer "):
@@ -9,6 +9,7 @@ from sqlalchemy import (
     TIMESTAMP,
     Enum,
     Float,
+    UniqueConstraint,
     func
 )
 from sqlalchemy.orm import relationship
@@ -25,7 +26,7 @@ class Candidate(Base):
     candidate_id = Column(Integer, primary_key=True, index=True)
     name = Column(String(255), nullable=False)
     interview_token = Column(
-        String(255), nullable=True
+        String(255), nullable=True, index=True
     )  # Nullable to allow for empty values
     token_expiry = Column(DateTime, nullable=True)
     is_interviewed = Column(Boolean, default=False)  # New column
@@ -44,7 +45,7 @@ class Candidate(Base):
 class Interview(Base):
     __tablename__ = "interviews"
     interview_id = Column(Integer, primary_key=True, index=True)
-    candidate_id = Column(Integer, ForeignKey("candidate.candidate_id"))
+    candidate_id = Column(Integer, ForeignKey("candidate.candidate_id"), index=True)
     start_time = Column(DateTime)
     end_time = Column(DateTime)
     duration = Column(Integer)  # Duration in seconds
@@ -60,16 +61,17 @@ class Interview(Base):
 class Contact(Base):
     __tablename__ = "contact"
     contact_id = Column(Integer, primary_key=True, index=True)
-    candidate_id = Column(Integer, ForeignKey("candidate.candidate_id"))
-    email_address = Column(String(255))
-    phone_number = Column(String(50))
+    candidate_id = Column(Integer, ForeignKey("candidate.candidate_id"), index=True)
+    # Looked up on every resume submission to find an existing candidate
+    email_address = Column(String(255), index=True)
+    phone_number = Column(String(50), index=True)
     candidate = relationship("Candidate", back_populates="contacts")
 
 
 class Address(Base):
     __tablename__ = "address"
     address_id = Column(Integer, primary_key=True, index=True)
-    candidate_id = Column(Integer, ForeignKey("candidate.candidate_id"))
+    candidate_id = Column(Integer, ForeignKey("candidate.candidate_id"), index=True)
     address_line_1 = Column(Text)
     address_line_2 = Column(Text)
     area = Column(String(255))
@@ -82,15 +84,47 @@ class Address(Base):
 class Skill(Base):
     __tablename__ = "skills"
     skill_id = Column(Integer, primary_key=True, index=True)
-    candidate_id = Column(Integer, ForeignKey("candidate.candidate_id"))
+    candidate_id = Column(Integer, ForeignKey("candidate.candidate_id"), index=True)
     skill = Column(String(255))
+    canonical_skill_id = Column(
+        Integer, ForeignKey("canonical_skill.canonical_skill_id"), nullable=True, index=True
+    )  # Normalized skill from the taxonomy, if the free text matched one
     candidate = relationship("Candidate", back_populates="skills")
+    canonical_skill = relationship("CanonicalSkill")
+
+
+class CanonicalSkill(Base):
+    __tablename__ = "canonical_skill"
+    canonical_skill_id = Column(Integer, primary_key=True, index=True)
+    name = Column(String(255), unique=True, nullable=False)
+    category = Column(String(100))
+    aliases = relationship(
+        "SkillAlias", back_populates="canonical_skill", cascade="all, delete-orphan"
+    )
+
+
+class SkillAlias(Base):
+    __tablename__ = "skill_alias"
+    alias_id = Column(Integer, primary_key=True, index=True)
+    canonical_skill_id = Column(
+        Integer, ForeignKey("canonical_skill.canonical_skill_id"), nullable=False, index=True
+    )
+    alias = Column(String(255), unique=True, nullable=False)  # Stored lower-cased
+    canonical_skill = relationship("CanonicalSkill", back_populates="aliases")
+
+
+# Append-only log of deleted aliases, so other workers can drop them from their matcher
+class SkillAliasDeletion(Base):
+    __tablename__ = "skill_alias_deletion"
+    deletion_id = Column(Integer, primary_key=True, index=True)
+    alias_id = Column(Integer, nullable=False)
+    deleted_at = Column(DateTime, default=datetime.utcnow)
 
 
 class Project(Base):
     __tablename__ = "projects"
     project_id = Column(Integer, primary_key=True, index=True)
-    candidate_id = Column(Integer, ForeignKey("candidate.candidate_id"))
+    candidate_id = Column(Integer, ForeignKey("candidate.candidate_id"), index=True)
     name = Column(String(255))
     description = Column(Text)
     candidate = relationship("Candidate", back_populates="projects")
@@ -99,7 +133,7 @@ class Project(Base):
 class Experience(Base):
     __tablename__ = "experiences"
     experience_id = Column(Integer, primary_key=True, index=True)
-    candidate_id = Column(Integer, ForeignKey("candidate.candidate_id"))
+    candidate_id = Column(Integer, ForeignKey("candidate.candidate_id"), index=True)
     job_title = Column(String(255))
     company_name = Column(String(255))
     start_date = Column(String(50))
@@ -110,7 +144,7 @@ class Experience(Base):
 class Education(Base):
     __tablename__ = "education"
     education_id = Column(Integer, primary_key=True, index=True)
-    candidate_id = Column(Integer, ForeignKey("candidate.candidate_id"))
+    candidate_id = Column(Integer, ForeignKey("candidate.candidate_id"), index=True)
     degree = Column(String(255))
     institution = Column(String(255))
     start_date = Column(String(50))
@@ -131,12 +165,24 @@ class JobListing(Base):
 
 class JobApplication(Base):
     __tablename__ = "job_application"
+    # One application per candidate and job, however many times the client retries
+    __table_args__ = (UniqueConstraint("job_id", "candidate_id", name="uq_job_application_job_candidate"),)
     application_id = Column(Integer, primary_key=True, index=True)
     job_id = Column(Integer, ForeignKey("job_listing.job_id"))
-    candidate_id = Column(Integer, ForeignKey("candidate.candidate_id"))
+    candidate_id = Column(Integer, ForeignKey("candidate.candidate_id"), index=True)
     date_applied = Column(DateTime)
     status = Column(String(50))
     match_score = Column(Float)  # Add this line
+    match_source = Column(String(20))  # "local" pre-score or "llm"
+    match_explanation = Column(Text)
+    interview_link = Column(String(255))
+    # Background pipeline: queued -> matching -> scheduling -> done | failed
+    stage = Column(String(50), default="queued", index=True)
+    attempts = Column(Integer, default=0)
+    heartbeat_at = Column(DateTime)
+    processed_at = Column(DateTime)
+    error = Column(Text)
+    idempotency_key = Column(String(255), unique=True, nullable=True)
     candidate = relationship("Candidate", back_populates="job_applications")
     job_listing = relationship("JobListing")
 
@@ -172,3 +218,53 @@ class Prompt(Base):
     required_elements = Column(Text)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+
+
+class ResumeParseJob(Base):
+    __tablename__ = "resume_parse_job"
+
+    job_id = Column(Integer, primary_key=True, index=True)
+    filename = Column(String(255))  # Name of the file as uploaded by the client
+    stored_filename = Column(String(255), nullable=False)
+    file_hash = Column(String(64), nullable=False)
+    status = Column(String(50), default="queued", nullable=False, index=True)
+    progress = Column(String(50), default="queued")  # Current pipeline stage
+    attempts = Column(Integer, default=0, nullable=False)
+    candidate_id = Column(Integer, ForeignKey("candidate.candidate_id"), nullable=True)
+    error = Column(Text)
+    created_at = Column(DateTime, default=datetime.utcnow)
+    started_at = Column(DateTime)
+    heartbeat_at = Column(DateTime)
+    completed_at = Column(DateTime)
+
+
+class MatchResultCache(Base):
+    __tablename__ = "match_result_cache"
+
+    # sha256 over the job, parsed resume, prompt and model hashes below
+    cache_key = Column(String(64), primary_key=True)
+    job_hash = Column(String(64), nullable=False)
+    resume_hash = Column(String(64), nullable=False)
+    prompt_hash = Column(String(64), nullable=False)
+    job_id = Column(Integer, index=True)
+    candidate_id = Column(Integer, index=True)
+    match_score = Column(Float, nullable=False)
+    explanation = Column(Text)
+    created_at = Column(DateTime, default=datetime.utcnow)
+    last_hit_at = Column(DateTime)
+
+
+class EmailOutbox(Base):
+    __tablename__ = "email_outbox"
+
+    email_id = Column(Integer, primary_key=True, index=True)
+    to_email = Column(String(255), nullable=False)
+    subject = Column(String(255), nullable=False)
+    body = Column(Text, nullable=False)
+    status = Column(String(20), default="pending", nullable=False, index=True)  # pending, sending, sent, failed
+    attempts = Column(Integer, default=0, nullable=False)
+    next_attempt_at = Column(DateTime, default=datetime.utcnow, index=True)
+    locked_at = Column(DateTime)
+    last_error = Column(Text)
+    created_at = Column(DateTime, default=datetime.utcnow)
+    sent_at = Column(DateTime)
@@ -1,6 +1,6 @@
 from fastapi import APIRouter, Depends, Query, HTTPException, status
-from sqlalchemy.orm import Session
-from database import get_db
+from sqlalchemy.ext.asyncio import AsyncSession
+from database import get_db, get_read_db
 from services import admin_service
 from typing import Optional
 from models import User
@@ -18,7 +18,7 @@ router = APIRouter()
 # Admin Login
 @router.post("/login-admin")
 async def login(
-    form_data: OAuth2PasswordRequestForm = Depends(), db: Session = Depends(get_db)
+    form_data: OAuth2PasswordRequestForm = Depends(), db: AsyncSession = Depends(get_db)
 ):
     return await admin_service.login(form_data, db)
 
@@ -27,7 +27,7 @@ async def login(
 @router.get("/admin-dashboard")
 async def admin_dashboard(
     current_user: User = Depends(role_dependency),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
 ):
     print(current_user)
     if current_user != "admin":
@@ -41,7 +41,7 @@ async def admin_dashboard(
 @router.get("/admin-dashboard/filters")
 async def admin_dashboard_filters(
     current_user: User = Depends(role_dependency),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     skill: Optional[str] = Query(None),
     interviewed: Optional[bool] = Query(None),
     non_interviewed_expired: Optional[bool] = Query(None),
@@ -67,7 +67,7 @@ async def admin_dashboard_filters(
 async def create_admin(
     admin_data: AdminCreate,
     current_user: User = Depends(role_dependency),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
 ):
     if current_user.role != "admin":
         raise HTTPException(status_code=403, detail="Access denied")
@@ -79,7 +79,7 @@ async def create_admin(
 async def delete_admin(
     admin_id: int,
     current_user: User = Depends(role_dependency),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
 ):
     if current_user.role != "admin":
         raise HTTPException(status_code=403, detail="Access denied")
@@ -92,7 +92,7 @@ async def update_admin(
     admin_id: int,
     admin_data: AdminUpdate,
     current_user: User = Depends(role_dependency),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
 ):
     if current_user.role != "admin":
         raise HTTPException(status_code=403, detail="Access denied")
@@ -101,6 +101,6 @@ async def update_admin(
 
 # Get All Admins
 @router.get("/all-admins")
-async def get_all_admins(current_user: User = Depends(role_dependency), db: Session = Depends(get_db)):
+async def get_all_admins(current_user: User = Depends(role_dependency), db: AsyncSession = Depends(get_db)):
     admins = await admin_service.get_all_admins(db)
     return JSONResponse(content=admins)
@@ -1,37 +1,63 @@
 from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List
-from services import application_service
-from database import get_db
-from schemas import JobApplicationCreate, JobApplicationUpdate, JobApplicationResponse,PaginatedApplicationsResponse
+from services import application_service, application_pipeline_service
+from database import get_db, get_read_db
+from schemas import JobApplicationCreate, JobApplicationUpdate, JobApplicationResponse,PaginatedApplicationsResponse, ApplicationStatus
+import json
 
 router = APIRouter()
 
 # Create a new job application
 @router.post("/applications/", response_model=JobApplicationResponse)
-async def create_application(application: JobApplicationCreate, db: Session = Depends(get_db)):
+async def create_application(application: JobApplicationCreate, db: AsyncSession = Depends(get_db)):
     return await application_service.create_application(db, application)
 
 # Retrieve all job applications
 @router.get("/applications/",response_model=PaginatedApplicationsResponse)
-async def get_applications(db: Session = Depends(get_db)):
+async def get_applications(db: AsyncSession = Depends(get_read_db)):
     return await application_service.get_applications(db)
 
 # Retrieve a specific job application by ID
 @router.get("/applications/{application_id}/", response_model=JobApplicationResponse)
-async def get_application(application_id: int, db: Session = Depends(get_db)):
+async def get_application(application_id: int, db: AsyncSession = Depends(get_db)):
     application = await application_service.get_application(db, application_id)
     if not application:
         raise HTTPException(status_code=404, detail="Application not found")
     return application
 
+# Current pipeline status of an application, for polling clients
+@router.get("/applications/{application_id}/status", response_model=ApplicationStatus)
+async def get_application_status(application_id: int, db: AsyncSession = Depends(get_db)):
+    status = await application_pipeline_service.get_application_status(db, application_id)
+    if not status:
+        raise HTTPException(status_code=404, detail="Application not found")
+    return status
+
+# Server-sent events: one "status" event per change until the application is processed
+@router.get("/applications/{application_id}/events")
+async def stream_application_status(application_id: int, db: AsyncSession = Depends(get_db)):
+    if not await application_pipeline_service.get_application_status(db, application_id):
+        raise HTTPException(status_code=404, detail="Application not found")
+
+    async def events():
+        async for status in application_pipeline_service.watch_application(application_id):
+            yield f"event: status\ndata: {json.dumps(status)}\n\n"
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
 # Update a job application by ID
 @router.put("/applications/{application_id}/", response_model=JobApplicationResponse)
-async def update_application(application_id: int, application: JobApplicationUpdate, db: Session = Depends(get_db)):
+async def update_application(application_id: int, application: JobApplicationUpdate, db: AsyncSession = Depends(get_db)):
     return await application_service.update_application(db, application_id, application)
 
 # Delete a job application by ID
 @router.delete("/applications/{application_id}/")
-async def delete_application(application_id: int, db: Session = Depends(get_db)):
+async def delete_application(application_id: int, db: AsyncSession = Depends(get_db)):
     await application_service.delete_application(db, application_id)
     return {"detail": "Application deleted successfully"}
@@ -1,5 +1,5 @@
 from fastapi import APIRouter, Depends, Request, HTTPException
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from database import get_db
 from schemas import InterviewRequest
 from database import get_db
@@ -9,23 +9,23 @@ from services import interview_service
 router = APIRouter()
 
 @router.post("/schedule")
-async def schedule_interview(request_body: InterviewRequest, db: Session = Depends(get_db)):
+async def schedule_interview(request_body: InterviewRequest, db: AsyncSession = Depends(get_db)):
     return await interview_service.schedule_interview(request_body, db)
 
 @router.get("/validate_interview_link/{token}")
-async def validate_interview_link(request: Request, db: Session = Depends(get_db)):
+async def validate_interview_link(request: Request, db: AsyncSession = Depends(get_db)):
     return await interview_service.validate_interview_link(request, db)
 
 @router.post("/vapi-end-of-call")
-async def handle_vapi_end_of_call(request: Request, db: Session = Depends(get_db)):
+async def handle_vapi_end_of_call(request: Request, db: AsyncSession = Depends(get_db)):
     return await interview_service.handle_vapi_end_of_call(request, db)
 
 @router.post("/end-interview/{candidate_id}")
 async def end_interview(
     candidate_id: int,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
-    updated_candidate = interview_service.end_interview(db, candidate_id)
+    updated_candidate = await interview_service.end_interview(db, candidate_id)
     
     if not updated_candidate:
         raise HTTPException(status_code=404, detail="Candidate not found or update failed")
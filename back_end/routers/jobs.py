@@ -1,12 +1,15 @@
-from fastapi import APIRouter, Depends, HTTPException, Query
-from sqlalchemy.orm import Session
-from typing import List
-from services import job_service, application_service
-from database import get_db
-from schemas import JobListingCreate, JobListingUpdate, JobListingResponse, ApplicationRequest, ApplicationResponse,PaginatedJobsResponse, JobDescriptionSuggestion
+from fastapi import APIRouter, Depends, HTTPException, Query, Header, Response
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List, Optional
+from services import job_service, application_service, candidate_index_service, match_cache_service, matching_service
+from database import get_db, get_read_db, AsyncSessionLocal
+from schemas import JobListingCreate, JobListingUpdate, JobListingResponse, ApplicationRequest, ApplicationResponse,PaginatedJobsResponse, JobDescriptionSuggestion, ShortlistedCandidate, MatchCacheStats, BatchMatchRequest
 from utils.jobs_utils import generate_job_description
-from sqlalchemy import func
+from sqlalchemy import func, select
 from models import JobListing
+from config import settings
+import json
 import logging
 
 logger = logging.getLogger(__name__)
@@ -19,7 +22,7 @@ router = APIRouter()
 async def suggest_job_description(
     title: str = Query(..., description="Job title"),
     keywords: str = Query(..., description="Keywords related to the job"),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     try:
         logger.info(f"Received request for job description. Title: {title}, Keywords: {keywords}")
@@ -30,16 +33,21 @@ async def suggest_job_description(
         logger.error(f"Error in suggest_job_description: {str(e)}", exc_info=True)
         raise HTTPException(status_code=500, detail=f"An error occurred while generating the description: {str(e)}")
 
+# Hit/miss counters for the persisted match-result cache
+@router.get("/match-cache/stats", response_model=MatchCacheStats)
+async def get_match_cache_stats(db: AsyncSession = Depends(get_db)):
+    return await match_cache_service.get_match_cache_stats(db)
+
 # Create a new job listing
 @router.post("/jobs/", response_model=JobListingResponse)
-async def create_job(job: JobListingCreate, db: Session = Depends(get_db)):
+async def create_job(job: JobListingCreate, db: AsyncSession = Depends(get_db)):
     return await job_service.create_job(db, job)
 
 # Retrieve all job listings
 @router.get("/jobs/", response_model=PaginatedJobsResponse)
 async def get_jobs(
     page: int = Query(1, ge=1, description="Page number"),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ):
     page_size = 15  # Set the page size to 15 jobs per page
 
@@ -47,10 +55,10 @@ async def get_jobs(
     offset = (page - 1) * page_size
 
     # Query for paginated jobs
-    jobs = db.query(JobListing).offset(offset).limit(page_size).all()
+    jobs = (await db.scalars(select(JobListing).offset(offset).limit(page_size))).all()
 
     # Get total count of jobs
-    total_jobs = db.query(func.count(JobListing.job_id)).scalar()
+    total_jobs = await db.scalar(select(func.count(JobListing.job_id)))
 
     # Calculate total pages
     total_pages = (total_jobs + page_size - 1) // page_size
@@ -69,36 +77,87 @@ async def get_jobs(
 
 # Retrieve a specific job listing by ID
 @router.get("/jobs/{job_id}/", response_model=JobListingResponse)
-async def get_job(job_id: int, db: Session = Depends(get_db)):
+async def get_job(job_id: int, db: AsyncSession = Depends(get_db)):
     job = await job_service.get_job(db, job_id)
     if not job:
         raise HTTPException(status_code=404, detail="Job not found")
     return job
 
+# Rank candidates for a job with the local lexical index, before any LLM scoring
+@router.get("/jobs/{job_id}/shortlist", response_model=List[ShortlistedCandidate])
+async def shortlist_candidates(
+    job_id: int,
+    k: int = Query(settings.SHORTLIST_DEFAULT_SIZE, ge=1, le=1000, description="Number of candidates to return"),
+    db: AsyncSession = Depends(get_db)
+):
+    try:
+        return await candidate_index_service.shortlist_candidates(db, job_id, k)
+    except ValueError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+
+# Score many candidates against one job; results stream back as NDJSON lines as they complete
+@router.post("/jobs/{job_id}/match-batch")
+async def match_batch(job_id: int, request: BatchMatchRequest, db: AsyncSession = Depends(get_db)):
+    if await job_service.get_job(db, job_id) is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+
+    if request.candidate_ids:
+        candidate_ids = request.candidate_ids
+    elif request.shortlist:
+        shortlist = await candidate_index_service.shortlist_candidates(db, job_id, request.shortlist)
+        candidate_ids = [item["candidate_id"] for item in shortlist]
+    else:
+        raise HTTPException(status_code=400, detail="Provide candidate_ids or shortlist")
+
+    if len(candidate_ids) > settings.MATCH_BATCH_MAX_CANDIDATES:
+        raise HTTPException(
+            status_code=400,
+            detail=f"At most {settings.MATCH_BATCH_MAX_CANDIDATES} candidates can be matched per request"
+        )
+
+    async def stream_results():
+        # The request-scoped session is closed once the handler returns, so the stream gets its own
+        async with AsyncSessionLocal() as stream_db:
+            try:
+                async for result in matching_service.evaluate_matches(
+                    stream_db, job_id, candidate_ids, request.batch_size, request.score_only
+                ):
+                    yield json.dumps(result) + "\n"
+            except ValueError as e:
+                yield json.dumps({"error": str(e)}) + "\n"
+
+    return StreamingResponse(stream_results(), media_type="application/x-ndjson")
+
 # Update a job listing by ID
 @router.put("/jobs/{job_id}/", response_model=JobListingResponse)
-async def update_job(job_id: int, job: JobListingUpdate, db: Session = Depends(get_db)):
+async def update_job(job_id: int, job: JobListingUpdate, db: AsyncSession = Depends(get_db)):
     return await job_service.update_job(db, job_id, job)
 
 # Delete a job listing by ID
 @router.delete("/jobs/{job_id}/")
-async def delete_job(job_id: int, db: Session = Depends(get_db)):
+async def delete_job(job_id: int, db: AsyncSession = Depends(get_db)):
     await job_service.delete_job(db, job_id)
     return {"detail": "Job deleted successfully"}
 
-# New route for job application
-@router.post("/jobs/apply/{job_id}", response_model=ApplicationResponse)
-async def apply_for_job(job_id: int, application: ApplicationRequest, db: Session = Depends(get_db)):
+# New route for job application; matching and scheduling continue in the background.
+# Repeats (same Idempotency-Key, or same job and candidate) return the existing application with 200.
+@router.post("/jobs/apply/{job_id}", response_model=ApplicationResponse, status_code=202)
+async def apply_for_job(
+    job_id: int,
+    application: ApplicationRequest,
+    response: Response,
+    idempotency_key: Optional[str] = Header(None, alias="Idempotency-Key", max_length=255),
+    db: AsyncSession = Depends(get_db)
+):
     try:
-        result = await job_service.apply_for_job(db, job_id, application.candidate_id)
+        result, created = await job_service.apply_for_job(db, job_id, application.candidate_id, idempotency_key)
+        if not created:
+            response.status_code = 200
+            response.headers["Idempotent-Replayed"] = "true"
         return result
+    except HTTPException:
+        raise
     except ValueError as e:
         raise HTTPException(status_code=404, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"An error occurred: {str(e)}")
-
-
-
-
-
-
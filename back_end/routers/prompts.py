@@ -1,5 +1,5 @@
 from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List
 from database import get_db
 from schemas import PromptCreate, PromptUpdate, PromptResponse
@@ -9,19 +9,19 @@ from middleware import role_dependency
 router = APIRouter()
 
 @router.post("/prompts/", response_model=PromptResponse)
-async def create_prompt(prompt: PromptCreate, db: Session = Depends(get_db), current_user: str = Depends(role_dependency)):
+async def create_prompt(prompt: PromptCreate, db: AsyncSession = Depends(get_db), current_user: str = Depends(role_dependency)):
     if current_user != "admin":
         raise HTTPException(status_code=403, detail="Not authorized")
     return await prompt_service.create_prompt(db, prompt)
 
 @router.get("/prompts/", response_model=List[PromptResponse])
-async def read_prompts(db: Session = Depends(get_db), current_user: str = Depends(role_dependency)):
+async def read_prompts(db: AsyncSession = Depends(get_db), current_user: str = Depends(role_dependency)):
     if current_user != "admin":
         raise HTTPException(status_code=403, detail="Not authorized")
     return await prompt_service.get_prompts(db)
 
 @router.get("/prompts/{name}", response_model=PromptResponse)
-async def read_prompt(name: str, db: Session = Depends(get_db), current_user: str = Depends(role_dependency)):
+async def read_prompt(name: str, db: AsyncSession = Depends(get_db), current_user: str = Depends(role_dependency)):
     if current_user != "admin":
         raise HTTPException(status_code=403, detail="Not authorized")
     prompt = await prompt_service.get_prompt_by_name(db, name)
@@ -30,7 +30,7 @@ async def read_prompt(name: str, db: Session = Depends(get_db), current_user: st
     return prompt
 
 @router.put("/prompts/{name}", response_model=PromptResponse)
-async def update_prompt(name: str, prompt: PromptUpdate, db: Session = Depends(get_db), current_user: str = Depends(role_dependency)):
+async def update_prompt(name: str, prompt: PromptUpdate, db: AsyncSession = Depends(get_db), current_user: str = Depends(role_dependency)):
     if current_user != "admin":
         raise HTTPException(status_code=403, detail="Not authorized")
     updated_prompt = await prompt_service.update_prompt(db, name, prompt)
@@ -39,7 +39,7 @@ async def update_prompt(name: str, prompt: PromptUpdate, db: Session = Depends(g
     return updated_prompt
 
 @router.delete("/prompts/{name}")
-async def delete_prompt(name: str, db: Session = Depends(get_db), current_user: str = Depends(role_dependency)):
+async def delete_prompt(name: str, db: AsyncSession = Depends(get_db), current_user: str = Depends(role_dependency)):
     if current_user != "admin":
         raise HTTPException(status_code=403, detail="Not authorized")
     result = await prompt_service.delete_prompt(db, name)
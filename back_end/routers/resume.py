@@ -1,7 +1,9 @@
-from fastapi import APIRouter, File, UploadFile, Depends
-from sqlalchemy.orm import Session
-from services import resume_service
+from fastapi import APIRouter, File, UploadFile, Depends, BackgroundTasks, HTTPException
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List
+from services import resume_service, ingestion_service, resume_job_service
 from database import get_db
+from schemas import ResumeParseJobResponse
 from services.resume_service import upload_resume, retrieve_resume, submit_resume
 
 
@@ -9,13 +11,43 @@ from services.resume_service import upload_resume, retrieve_resume, submit_resum
 router = APIRouter()
 
 @router.post("/upload/")
-async def upload_resume(file: UploadFile = File(...), db: Session = Depends(get_db)):
+async def upload_resume(file: UploadFile = File(...), db: AsyncSession = Depends(get_db)):
     return await resume_service.upload_resume(file, db)
 
+@router.post("/upload-async/", status_code=202, response_model=ResumeParseJobResponse)
+async def upload_resume_async(file: UploadFile = File(...), db: AsyncSession = Depends(get_db)):
+    try:
+        return await resume_job_service.enqueue_resume_job(file, db)
+    except ValueError as e:
+        raise HTTPException(status_code=413, detail=str(e))
+
+@router.get("/upload-jobs/{job_id}", response_model=ResumeParseJobResponse)
+async def get_upload_job(job_id: int, db: AsyncSession = Depends(get_db)):
+    job = await resume_job_service.get_resume_job(db, job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Upload job not found")
+    return job
+
+@router.post("/bulk-upload/", status_code=202)
+async def bulk_upload_resumes(background_tasks: BackgroundTasks, files: List[UploadFile] = File(...)):
+    batch = await ingestion_service.create_batch(files)
+    background_tasks.add_task(ingestion_service.process_batch, batch["batch_id"])
+    return batch
+
+@router.get("/bulk-upload/{batch_id}")
+async def get_bulk_upload_status(batch_id: str):
+    batch = ingestion_service.get_batch(batch_id)
+    if not batch:
+        raise HTTPException(status_code=404, detail="Batch not found")
+    return batch
+
 @router.get("/retrieve/")
-async def retrieve_resume(filename: str, db: Session = Depends(get_db)):
-    return await resume_service.retrieve_resume(filename, db)
+async def retrieve_resume(filename: str, db: AsyncSession = Depends(get_db)):
+    try:
+        return await resume_service.retrieve_resume(filename, db)
+    except resume_service.ResumeParseError as e:
+        raise HTTPException(status_code=502, detail=str(e))
 
 @router.post("/submit/")
-async def submit_resume(form_data: dict, db: Session = Depends(get_db)):
+async def submit_resume(form_data: dict, db: AsyncSession = Depends(get_db)):
     return await resume_service.submit_resume(form_data, db)
@@ -0,0 +1,45 @@
+from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List
+from database import get_db
+from schemas import CanonicalSkillCreate, CanonicalSkillResponse, SkillAliasCreate, SkillAliasResponse, SkillExtractRequest, ExtractedSkill
+from services import skill_service
+from middleware import role_dependency
+
+router = APIRouter()
+
+@router.post("/skills/taxonomy/", response_model=CanonicalSkillResponse)
+async def create_canonical_skill(skill: CanonicalSkillCreate, db: AsyncSession = Depends(get_db), current_user: str = Depends(role_dependency)):
+    if current_user != "admin":
+        raise HTTPException(status_code=403, detail="Not authorized")
+    return await skill_service.create_canonical_skill(db, skill)
+
+@router.get("/skills/taxonomy/", response_model=List[CanonicalSkillResponse])
+async def read_canonical_skills(db: AsyncSession = Depends(get_db)):
+    return await skill_service.get_canonical_skills(db)
+
+@router.post("/skills/taxonomy/{canonical_skill_id}/aliases/", response_model=SkillAliasResponse)
+async def add_alias(canonical_skill_id: int, alias: SkillAliasCreate, db: AsyncSession = Depends(get_db), current_user: str = Depends(role_dependency)):
+    if current_user != "admin":
+        raise HTTPException(status_code=403, detail="Not authorized")
+    return await skill_service.add_alias(db, canonical_skill_id, alias)
+
+@router.delete("/skills/taxonomy/aliases/{alias_id}")
+async def delete_alias(alias_id: int, db: AsyncSession = Depends(get_db), current_user: str = Depends(role_dependency)):
+    if current_user != "admin":
+        raise HTTPException(status_code=403, detail="Not authorized")
+    if await skill_service.delete_alias(db, alias_id):
+        return {"message": "Deleted successfully"}
+    raise HTTPException(status_code=404, detail="Alias not found")
+
+@router.delete("/skills/taxonomy/{canonical_skill_id}")
+async def delete_canonical_skill(canonical_skill_id: int, db: AsyncSession = Depends(get_db), current_user: str = Depends(role_dependency)):
+    if current_user != "admin":
+        raise HTTPException(status_code=403, detail="Not authorized")
+    if await skill_service.delete_canonical_skill(db, canonical_skill_id):
+        return {"message": "Deleted successfully"}
+    raise HTTPException(status_code=404, detail="Skill not found")
+
+@router.post("/skills/extract/", response_model=List[ExtractedSkill])
+async def extract_skills(request: SkillExtractRequest, db: AsyncSession = Depends(get_db)):
+    return await skill_service.extract_skills(db, request.text)
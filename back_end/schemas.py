@@ -46,6 +46,7 @@ class JobApplicationBase(BaseModel):
     candidate_id: int
     status: str = "pending"
     match_score: Optional[float] = None
+    match_source: Optional[str] = None
 
 
 class JobApplicationCreate(JobApplicationBase):
@@ -62,6 +63,8 @@ class JobApplicationResponse(JobApplicationBase):
     date_applied: datetime
     job_listing: JobListingResponse  # Nested Job Listing in response
     interview_link: Optional[str] = None
+    match_explanation: Optional[str] = None
+    stage: Optional[str] = None
 
     class Config:
         from_attributes = True
@@ -104,19 +107,47 @@ class ApplicationResponse(BaseModel):
     candidate_id: int
     status: str
     date_applied: datetime
-    match_score: float
+    match_score: Optional[float] = None  # Filled in by the application pipeline
     interview_link: Optional[str] = None
-    explanation: str
+    explanation: Optional[str] = None
+    match_source: Optional[str] = None
+    stage: Optional[str] = None
 
     class Config:
         from_attributes = True
 
 
+class ApplicationStatus(BaseModel):
+    application_id: int
+    status: str
+    stage: Optional[str] = None
+    match_score: Optional[float] = None
+    match_source: Optional[str] = None
+    explanation: Optional[str] = None
+    interview_link: Optional[str] = None
+    error: Optional[str] = None
+
+
 class MatchingResult(BaseModel):
     match_score: float
     explanation: str
 
 
+class BatchMatchRequest(BaseModel):
+    candidate_ids: Optional[List[int]] = None
+    shortlist: Optional[int] = Field(None, ge=1, description="Score the top-N candidates from the shortlist index instead")
+    batch_size: Optional[int] = Field(None, ge=1, le=25, description="Candidates packed into each LLM call")
+    score_only: bool = Field(False, description="Stop each generation once the score is known; explanations are left empty")
+
+
+class MatchCacheStats(BaseModel):
+    hits: int
+    misses: int
+    stores: int
+    hit_rate: float
+    entries: int
+
+
 class PaginatedApplicationsResponse(BaseModel):
     page: int
     page_size: int
@@ -181,3 +212,61 @@ class PromptResponse(PromptBase):
 
     class Config:
         from_attributes = True
+
+
+class SkillAliasCreate(BaseModel):
+    alias: str
+
+
+class SkillAliasResponse(BaseModel):
+    alias_id: int
+    alias: str
+
+    class Config:
+        from_attributes = True
+
+
+class CanonicalSkillCreate(BaseModel):
+    name: str
+    category: Optional[str] = None
+    aliases: List[str] = []
+
+
+class CanonicalSkillResponse(BaseModel):
+    canonical_skill_id: int
+    name: str
+    category: Optional[str] = None
+    aliases: List[SkillAliasResponse] = []
+
+    class Config:
+        from_attributes = True
+
+
+class SkillExtractRequest(BaseModel):
+    text: str
+
+
+class ExtractedSkill(BaseModel):
+    canonical_skill_id: int
+    name: str
+
+
+class ShortlistedCandidate(BaseModel):
+    candidate_id: int
+    score: float
+
+
+class ResumeParseJobResponse(BaseModel):
+    job_id: int
+    filename: Optional[str] = None
+    status: str
+    progress: Optional[str] = None
+    attempts: int
+    candidate_id: Optional[int] = None
+    error: Optional[str] = None
+    created_at: datetime
+    started_at: Optional[datetime] = None
+    completed_at: Optional[datetime] = None
+
+    class Config:
+        from_attributes = True
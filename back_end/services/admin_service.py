@@ -3,8 +3,11 @@ from fastapi.responses import JSONResponse
 from fastapi.security import OAuth2PasswordRequestForm
 from utils.admin_utils import get_current_admin, verify_password, create_access_token
 from typing import List, Optional
-from models import Candidate
-from sqlalchemy.orm import Session
+from models import Candidate, Skill
+from utils.skill_matcher import get_skill_matcher, normalize_skill_text
+from sqlalchemy import func, or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
 from database import get_db
 from models import User, UserRole
 from schemas import AdminCreate, AdminUpdate, AdminResponse
@@ -13,8 +16,8 @@ from fastapi.encoders import jsonable_encoder
 from datetime import datetime
 
 
-async def login(form_data: OAuth2PasswordRequestForm, db: Session):
-    user = db.query(User).filter(User.username == form_data.username).first()
+async def login(form_data: OAuth2PasswordRequestForm, db: AsyncSession):
+    user = await db.scalar(select(User).where(User.username == form_data.username))
     if not user or not verify_password(form_data.password, user.hashed_password):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -27,9 +30,19 @@ async def login(form_data: OAuth2PasswordRequestForm, db: Session):
     return {"access_token": access_token, "token_type": "bearer"}
 
 
-async def admin_dashboard(db: Session = Depends(get_db)):
+async def admin_dashboard(db: AsyncSession = Depends(get_db)):
     # Fetch all candidates
-    candidates = db.query(Candidate).all()
+    candidates = (await db.scalars(
+        select(Candidate).options(
+            selectinload(Candidate.contacts),
+            selectinload(Candidate.addresses),
+            selectinload(Candidate.skills),
+            selectinload(Candidate.projects),
+            selectinload(Candidate.experiences),
+            selectinload(Candidate.educations),
+            selectinload(Candidate.interviews),
+        )
+    )).all()
 
     def serialize_datetime(dt):
         return dt.isoformat() if isinstance(dt, datetime) else None
@@ -109,7 +122,7 @@ async def admin_dashboard(db: Session = Depends(get_db)):
 
 async def admin_dashboard_filters(
     current_admin: str = Depends(get_current_admin),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     skill: Optional[str] = Query(None),
     interviewed: Optional[bool] = Query(None),
     non_interviewed_expired: Optional[bool] = Query(None),
@@ -117,7 +130,15 @@ async def admin_dashboard_filters(
 ):
     # Query candidates with related data using joins
     candidates_query = (
-        db.query(Candidate)
+        select(Candidate)
+        .options(
+            selectinload(Candidate.contacts),
+            selectinload(Candidate.addresses),
+            selectinload(Candidate.skills),
+            selectinload(Candidate.projects),
+            selectinload(Candidate.experiences),
+            selectinload(Candidate.educations),
+        )
         .join(Candidate.contacts)
         .join(Candidate.addresses)
         .join(Candidate.skills)
@@ -129,26 +150,37 @@ async def admin_dashboard_filters(
 
     # Apply filters based on the query parameters
     if interviewed is not None:
-        candidates_query = candidates_query.filter(
+        candidates_query = candidates_query.where(
             Candidate.is_interviewed == interviewed
         )
 
     if non_interviewed_expired is not None:
-        candidates_query = candidates_query.filter(
+        candidates_query = candidates_query.where(
             Candidate.is_interviewed == False, Candidate.is_valid == False
         )
 
     if pending_interviews is not None:
-        candidates_query = candidates_query.filter(
+        candidates_query = candidates_query.where(
             Candidate.is_interviewed == False, Candidate.is_valid == True
         )
 
-    # Apply skill filter if present
+    # Apply skill filter if present, matching on the canonical skill when the taxonomy knows it.
+    # Text is compared for equality (case-insensitive), so "%" and "_" in the filter are literal.
     if skill:
-        candidates_query = candidates_query.filter(Candidate.skills.any(skill == skill))
+        matcher = await get_skill_matcher(db)
+        canonical_skill_id = matcher.normalize(skill)
+        skill_texts = {normalize_skill_text(skill)}
+        skill_text = func.lower(func.trim(Skill.skill))
+        if canonical_skill_id is not None:
+            # Rows written before the alias (or the canonical skill) existed have no canonical id yet
+            skill_texts.update(matcher.aliases(canonical_skill_id))
+            skill_condition = or_(Skill.canonical_skill_id == canonical_skill_id, skill_text.in_(skill_texts))
+        else:
+            skill_condition = skill_text.in_(skill_texts)
+        candidates_query = candidates_query.where(Candidate.skills.any(skill_condition))
 
     # Execute query to get the filtered candidates
-    filtered_candidates = candidates_query.all()
+    filtered_candidates = (await db.scalars(candidates_query)).all()
 
     # Prepare the response data in the required format
     response_data = []
@@ -208,9 +240,9 @@ async def admin_dashboard_filters(
 
 
 # Create Admin
-async def create_admin(admin_data: AdminCreate, db: Session) -> AdminResponse:
+async def create_admin(admin_data: AdminCreate, db: AsyncSession) -> AdminResponse:
     # Check if the username already exists
-    existing_user = db.query(User).filter(User.username == admin_data.username).first()
+    existing_user = await db.scalar(select(User).where(User.username == admin_data.username))
     if existing_user:
         raise HTTPException(status_code=400, detail="Username already exists")
 
@@ -223,8 +255,8 @@ async def create_admin(admin_data: AdminCreate, db: Session) -> AdminResponse:
     )
 
     db.add(new_admin)
-    db.commit()
-    db.refresh(new_admin)
+    await db.commit()
+    await db.refresh(new_admin)
 
     return AdminResponse(
         id=new_admin.id, username=new_admin.username, role=new_admin.role
@@ -232,24 +264,24 @@ async def create_admin(admin_data: AdminCreate, db: Session) -> AdminResponse:
 
 
 # Delete Admin
-async def delete_admin(admin_id: int, db: Session):
-    admin = (
-        db.query(User).filter(User.id == admin_id, User.role == UserRole.admin).first()
+async def delete_admin(admin_id: int, db: AsyncSession):
+    admin = await db.scalar(
+        select(User).where(User.id == admin_id, User.role == UserRole.admin)
     )
     if not admin:
         raise HTTPException(status_code=404, detail="Admin not found")
 
     # Soft-delete the admin by setting is_deleted to True
     admin.is_deleted = True
-    db.commit()
+    await db.commit()
 
 
 # Update Admin
 async def update_admin(
-    admin_id: int, admin_data: AdminUpdate, db: Session
+    admin_id: int, admin_data: AdminUpdate, db: AsyncSession
 ) -> AdminResponse:
-    admin = (
-        db.query(User).filter(User.id == admin_id, User.role == UserRole.admin).first()
+    admin = await db.scalar(
+        select(User).where(User.id == admin_id, User.role == UserRole.admin)
     )
     if not admin:
         raise HTTPException(status_code=404, detail="Admin not found")
@@ -260,19 +292,18 @@ async def update_admin(
         admin_data.password
     )  # Re-hash the new password
 
-    db.commit()
-    db.refresh(admin)
+    await db.commit()
+    await db.refresh(admin)
 
     return AdminResponse(id=admin.id, username=admin.username, role=admin.role)
 
 
 # Get All Admins
-async def get_all_admins(db: Session) -> List[dict]:
-    admins = (
-        db.query(User)
-        .filter(User.role == UserRole.admin, User.is_deleted == False)
-        .all()
-    )
+async def get_all_admins(db: AsyncSession) -> List[dict]:
+    admins = (await db.scalars(
+        select(User)
+        .where(User.role == UserRole.admin, User.is_deleted == False)
+    )).all()
 
     def serialize_datetime(dt):
         return dt.isoformat() if isinstance(dt, datetime) else None
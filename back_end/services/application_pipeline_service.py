@@ -0,0 +1,236 @@
+import asyncio
+import logging
+from datetime import datetime, timedelta
+
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from config import settings
+from database import AsyncSessionLocal
+from models import JobApplication
+from schemas import InterviewRequest, MatchingResult
+from services import matching_service, interview_service, prescore_service, email_outbox_service
+from utils.worker_utils import WorkerPool, heartbeat
+
+logger = logging.getLogger(__name__)
+
+FINAL_STAGES = ("done", "failed")
+ACTIVE_STAGES = ("matching", "scheduling")
+# Several beats per stale window, so one slow or failed beat does not get a running application requeued
+HEARTBEAT_INTERVAL_SECONDS = settings.JOB_STALE_AFTER_SECONDS / 3
+
+# application_id -> events of the status streams following it in this process
+_listeners = {}
+
+
+def application_status(application: JobApplication) -> dict:
+    return {
+        "application_id": application.application_id,
+        "status": application.status,
+        "stage": application.stage,
+        "match_score": application.match_score,
+        "match_source": application.match_source,
+        "explanation": application.match_explanation,
+        "interview_link": application.interview_link,
+        "error": application.error,
+    }
+
+
+def _publish(application_id: int):
+    for event in _listeners.get(application_id, ()):
+        event.set()
+
+
+def _owned_by(application_id: int, attempt: int):
+    """Rows this attempt still owns: not requeued by the sweeper (and possibly claimed again) meanwhile."""
+    return (
+        JobApplication.application_id == application_id,
+        JobApplication.attempts == attempt,
+        JobApplication.stage.in_(ACTIVE_STAGES),
+    )
+
+
+async def _update_owned(db: AsyncSession, application_id: int, attempt: int, **values) -> bool:
+    """Write `values` to the application if this attempt still owns it. The caller commits."""
+    result = await db.execute(
+        update(JobApplication)
+        .where(*_owned_by(application_id, attempt))
+        .values(**values)
+        .execution_options(synchronize_session=False)
+    )
+    return result.rowcount == 1
+
+
+async def _touch(application_id: int, attempt: int):
+    async with AsyncSessionLocal() as db:
+        await _update_owned(db, application_id, attempt, heartbeat_at=datetime.utcnow())
+        await db.commit()
+
+
+async def claim_next_application():
+    # SKIP LOCKED lets workers in every process claim applications without blocking each other
+    async with AsyncSessionLocal() as db:
+        application = await db.scalar(
+            select(JobApplication)
+            .where(JobApplication.stage == "queued")
+            .order_by(JobApplication.application_id)
+            .limit(1)
+            .with_for_update(skip_locked=True)
+        )
+        if not application:
+            return None
+
+        application.stage = "matching"
+        application.attempts = (application.attempts or 0) + 1
+        application.heartbeat_at = datetime.utcnow()
+        await db.commit()
+        _publish(application.application_id)
+        return application.application_id
+
+
+async def run_application(application_id: int):
+    """Match, then schedule the interview or reject, recording each stage on the application row.
+
+    The row is heart-beaten while the stages run, and every write is
+    conditional on this attempt still owning it. If the sweeper requeued
+    the application anyway, the interview and email this attempt prepared
+    are rolled back instead of being committed a second time.
+    """
+    async with AsyncSessionLocal() as db:
+        application = await db.get(JobApplication, application_id)
+        job_id, candidate_id, attempt = application.job_id, application.candidate_id, application.attempts
+        interview_scheduled = False
+        async with heartbeat(lambda: _touch(application_id, attempt), HEARTBEAT_INTERVAL_SECONDS):
+            try:
+                # Clear rejects and clear accepts are decided locally; only the uncertain band goes to the LLM
+                pre_score = await prescore_service.prescore_application(db, job_id, candidate_id)
+                if pre_score is not None and pre_score.decision is not None:
+                    logger.info(f"Local pre-score {pre_score.score} decided application {application_id} ({pre_score.decision})")
+                    match_result = MatchingResult(match_score=pre_score.score, explanation=pre_score.explanation)
+                    match_source = prescore_service.LOCAL
+                else:
+                    match_result = await matching_service.evaluate_match(db, job_id, candidate_id, raise_errors=True)
+                    match_source = prescore_service.LLM
+                logger.info(f"Match result for application {application_id}: {match_result}")
+
+                owned = await _update_owned(
+                    db, application_id, attempt,
+                    match_score=match_result.match_score,
+                    match_source=match_source,
+                    match_explanation=match_result.explanation,
+                    stage="scheduling",
+                    heartbeat_at=datetime.utcnow(),
+                )
+                await db.commit()
+                if not owned:
+                    logger.warning(f"Application {application_id} was requeued while attempt {attempt} ran; dropping its result")
+                    return
+                _publish(application_id)
+
+                if match_result.match_score >= settings.INTERVIEW_SCORE_THRESHOLD:
+                    # The interview token and the outbox email are committed together with the status below
+                    interview_result = await interview_service.schedule_interview(
+                        InterviewRequest(candidate_id=candidate_id), db, commit=False
+                    )
+                    outcome = {"status": "Interview Scheduled", "interview_link": interview_result.get("interview_link")}
+                    interview_scheduled = True
+                else:
+                    outcome = {"status": "Not Qualified"}
+                outcome.update(stage="done", error=None, processed_at=datetime.utcnow())
+            except Exception as e:
+                await db.rollback()
+                interview_scheduled = False
+                if attempt < settings.APPLICATION_MAX_ATTEMPTS:
+                    # Usually an LLM or provider outage: try again rather than reject the applicant
+                    logger.warning(f"Application {application_id} attempt {attempt} failed, requeueing: {str(e)}")
+                    outcome = {"stage": "queued", "error": str(e)}
+                else:
+                    logger.warning(f"Application {application_id} failed: {str(e)}")
+                    outcome = {"stage": "failed", "error": str(e), "processed_at": datetime.utcnow()}
+
+            if not await _update_owned(db, application_id, attempt, **outcome):
+                # Another attempt owns the row now; its interview and email are the ones that count
+                await db.rollback()
+                logger.warning(f"Application {application_id} was requeued while attempt {attempt} ran; dropping its result")
+                return
+            await db.commit()
+        _publish(application_id)
+        if interview_scheduled:
+            email_outbox_service.email_sender.notify()
+        if outcome["stage"] == "queued":
+            application_workers.notify()
+
+
+async def requeue_stale_applications():
+    """Put applications whose worker stopped heart-beating (crash or restart) back on the queue."""
+    async with AsyncSessionLocal() as db:
+        cutoff = datetime.utcnow() - timedelta(seconds=settings.JOB_STALE_AFTER_SECONDS)
+        stale = (await db.scalars(
+            select(JobApplication)
+            .where(JobApplication.stage.in_(ACTIVE_STAGES), JobApplication.heartbeat_at < cutoff)
+            .with_for_update(skip_locked=True)
+        )).all()
+        for application in stale:
+            if (application.attempts or 0) >= settings.APPLICATION_MAX_ATTEMPTS:
+                application.stage = "failed"
+                application.error = "Application abandoned by its worker too many times"
+                application.processed_at = datetime.utcnow()
+            else:
+                application.stage = "queued"
+        await db.commit()
+        if stale:
+            logger.info("Recovered %d stale applications", len(stale))
+
+
+async def get_application_status(db: AsyncSession, application_id: int):
+    application = await db.get(JobApplication, application_id)
+    return application_status(application) if application else None
+
+
+async def watch_application(application_id: int):
+    """Yield the application's status each time it changes, until processing finishes.
+
+    Changes made by this process wake the stream at once; changes made by
+    workers in other processes are picked up within one poll interval.
+    """
+    event = asyncio.Event()
+    _listeners.setdefault(application_id, set()).add(event)
+    deadline = asyncio.get_running_loop().time() + settings.APPLICATION_EVENTS_TIMEOUT_SECONDS
+    last_status = None
+    try:
+        while True:
+            event.clear()
+            async with AsyncSessionLocal() as db:
+                status = await get_application_status(db, application_id)
+            if status is None:
+                return
+            if status != last_status:
+                last_status = status
+                yield status
+            if status["stage"] in FINAL_STAGES:
+                return
+
+            remaining = deadline - asyncio.get_running_loop().time()
+            if remaining <= 0:
+                return
+            try:
+                await asyncio.wait_for(event.wait(), timeout=min(settings.JOB_POLL_INTERVAL_SECONDS, remaining))
+            except asyncio.TimeoutError:
+                pass
+    finally:
+        listeners = _listeners.get(application_id)
+        if listeners is not None:
+            listeners.discard(event)
+            if not listeners:
+                _listeners.pop(application_id, None)
+
+
+application_workers = WorkerPool(
+    "application",
+    claim=claim_next_application,
+    process=run_application,
+    concurrency=settings.APPLICATION_WORKERS,
+    poll_interval=settings.JOB_POLL_INTERVAL_SECONDS,
+    recover=requeue_stale_applications,
+    recover_interval=settings.JOB_STALE_AFTER_SECONDS / 2,
+)
@@ -1,4 +1,6 @@
-from sqlalchemy.orm import Session
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
 from models import JobApplication
 from schemas import JobApplicationCreate, JobApplicationUpdate
 from datetime import datetime
@@ -6,9 +8,10 @@ from services import matching_service, interview_service
 from utils import db_utils
 from schemas import ApplicationResponse, MatchingResult
 from fastapi import HTTPException
+from sqlalchemy.exc import IntegrityError
 
 # Create a new job application
-async def create_application(db: Session, application: JobApplicationCreate):
+async def create_application(db: AsyncSession, application: JobApplicationCreate):
     new_application = JobApplication(
         job_id=application.job_id,
         candidate_id=application.candidate_id,
@@ -16,19 +19,23 @@ async def create_application(db: Session, application: JobApplicationCreate):
         status=application.status
     )
     db.add(new_application)
-    db.commit()
-    db.refresh(new_application)
+    try:
+        await db.commit()
+    except IntegrityError:
+        await db.rollback()
+        raise HTTPException(status_code=409, detail="Candidate has already applied for this job")
+    await db.refresh(new_application, ["job_listing"])
     return new_application
 
 # Get all job applications
-async def get_applications(db: Session, page: int = 1, page_size: int = 15):
+async def get_applications(db: AsyncSession, page: int = 1, page_size: int = 15):
     """
     Fetch paginated job applications. Defaults to page 1 and 15 applications per page.
     """
     offset = (page - 1) * page_size
-    total_applications = db.query(JobApplication).count()
+    total_applications = await db.scalar(select(func.count()).select_from(JobApplication))
     total_pages = (total_applications + page_size - 1) // page_size
-    applications = db.query(JobApplication).offset(offset).limit(page_size).all()
+    applications = (await db.scalars(select(JobApplication).offset(offset).limit(page_size))).all()
     if not applications:
         raise HTTPException(status_code=404, detail="No applications found.")
     return {
@@ -41,25 +48,25 @@ async def get_applications(db: Session, page: int = 1, page_size: int = 15):
     
     
 # Get a specific job application by ID
-async def get_application(db: Session, application_id: int):
-    return db.query(JobApplication).filter(JobApplication.application_id == application_id).first()
+async def get_application(db: AsyncSession, application_id: int):
+    return await db.get(JobApplication, application_id, options=[selectinload(JobApplication.job_listing)])
 
 # Update a job application
-async def update_application(db: Session, application_id: int, application: JobApplicationUpdate):
-    db_application = db.query(JobApplication).filter(JobApplication.application_id == application_id).first()
+async def update_application(db: AsyncSession, application_id: int, application: JobApplicationUpdate):
+    db_application = await db.get(JobApplication, application_id)
     if not db_application:
         return None
     db_application.status = application.status
-    db.commit()
-    db.refresh(db_application)
+    await db.commit()
+    await db.refresh(db_application, ["job_listing"])
     return db_application
 
 # Delete a job application
-async def delete_application(db: Session, application_id: int):
-    db_application = db.query(JobApplication).filter(JobApplication.application_id == application_id).first()
+async def delete_application(db: AsyncSession, application_id: int):
+    db_application = await db.get(JobApplication, application_id)
     if db_application:
-        db.delete(db_application)
-        db.commit()
+        await db.delete(db_application)
+        await db.commit()
 
 
 
@@ -69,7 +76,7 @@ async def process_application(job_id: int, candidate_id: int, db) -> dict:
 
     if match_result.match_score >= 7:  # Assuming 7 is the threshold
         # Create application record
-        application_id = db_utils.create_application_record(db, job_id, candidate_id)
+        application_id = await db_utils.create_application_record(db, job_id, candidate_id)
         
         # Schedule interview
         interview_result = await interview_service.schedule_interview(candidate_id, db)
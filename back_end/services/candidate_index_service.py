@@ -0,0 +1,158 @@
+import asyncio
+import logging
+import threading
+import time
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
+
+from config import settings
+from database import AsyncSessionLocal
+from models import Candidate, JobListing
+from utils.entity_loader import get_loader
+from utils.search_index import BM25Index, tokenize
+from utils.skill_matcher import get_skill_matcher
+
+logger = logging.getLogger(__name__)
+
+_CANDIDATE_LOAD_OPTIONS = (
+    selectinload(Candidate.skills),
+    selectinload(Candidate.projects),
+    selectinload(Candidate.experiences),
+    selectinload(Candidate.educations),
+)
+
+_index = BM25Index()
+_built_at = None
+_lock = threading.Lock()
+_rebuild_lock = asyncio.Lock()  # One rebuild at a time
+_rebuild_task = None
+# candidate_id -> tokens (None when removed) re-indexed while a rebuild runs, replayed onto the new index
+_pending_updates = None
+
+
+def _skill_tokens(skill_ids):
+    # Canonical skills get their own token so "JS" on a resume matches "JavaScript" in a job
+    return [f"skill:{skill_id}" for skill_id in skill_ids]
+
+
+def candidate_tokens(candidate: Candidate, matcher):
+    parts = []
+    parts.extend(skill.skill or "" for skill in candidate.skills)
+    for experience in candidate.experiences:
+        parts.extend([experience.job_title or "", experience.company_name or ""])
+    for project in candidate.projects:
+        parts.extend([project.name or "", project.description or ""])
+    for education in candidate.educations:
+        parts.extend([education.degree or "", education.institution or ""])
+    text = "\n".join(part for part in parts if part)
+
+    skill_ids = {skill.canonical_skill_id for skill in candidate.skills if skill.canonical_skill_id}
+    skill_ids.update(matcher.find_skill_ids(text))
+    return tokenize(text) + _skill_tokens(skill_ids)
+
+
+def job_tokens(job: JobListing, matcher):
+    text = f"{job.title or ''}\n{job.title or ''}\n{job.description or ''}"  # Title counts double
+    return tokenize(text) + _skill_tokens(matcher.find_skill_ids(text))
+
+
+async def rebuild_index(db: AsyncSession):
+    """Rebuild the whole index from the database. Callers hold `_rebuild_lock`."""
+    global _index, _built_at, _pending_updates
+    matcher = await get_skill_matcher(db)
+    started = time.perf_counter()
+    index = BM25Index()
+    with _lock:
+        _pending_updates = {}
+    try:
+        candidates = await db.stream_scalars(
+            select(Candidate)
+            .options(*_CANDIDATE_LOAD_OPTIONS)
+            .execution_options(yield_per=500)
+        )
+        async for candidate in candidates:
+            index.upsert(candidate.candidate_id, candidate_tokens(candidate, matcher))
+        with _lock:
+            # Resumes submitted during the scan may have been read before they were written
+            for candidate_id, tokens in _pending_updates.items():
+                if tokens is None:
+                    index.remove(candidate_id)
+                else:
+                    index.upsert(candidate_id, tokens)
+            _index, _built_at = index, time.monotonic()
+    finally:
+        with _lock:
+            _pending_updates = None
+    logger.info("Built candidate index with %d candidates in %.2fs", len(index), time.perf_counter() - started)
+
+
+def _is_stale():
+    return _built_at is None or time.monotonic() - _built_at > settings.CANDIDATE_INDEX_REBUILD_SECONDS
+
+
+async def _rebuild_in_background():
+    try:
+        async with _rebuild_lock:
+            if not _is_stale():
+                return
+            async with AsyncSessionLocal() as db:
+                await rebuild_index(db)
+    except Exception:
+        # The old index keeps serving; the next stale request tries again
+        logger.exception("Candidate index rebuild failed")
+
+
+async def ensure_index(db: AsyncSession):
+    """The current index, built inline only when there is none yet.
+
+    Periodic full rebuilds pick up edits made outside submit_resume (admin
+    tools, scripts, other workers). They run in the background while
+    requests keep searching the previous index.
+    """
+    global _rebuild_task
+    if _built_at is None:
+        async with _rebuild_lock:
+            if _built_at is None:
+                await rebuild_index(db)
+    elif _is_stale() and (_rebuild_task is None or _rebuild_task.done()):
+        _rebuild_task = asyncio.create_task(_rebuild_in_background())
+    return _index
+
+
+async def index_candidate(db: AsyncSession, candidate_id: int):
+    """Re-index one candidate after their resume was written. No-op until the index is first built."""
+    if _built_at is None:
+        return
+    try:
+        candidate = await db.scalar(
+            select(Candidate)
+            .options(*_CANDIDATE_LOAD_OPTIONS)
+            .where(Candidate.candidate_id == candidate_id)
+            .execution_options(populate_existing=True)
+        )
+        matcher = await get_skill_matcher(db)
+        tokens = None if candidate is None else candidate_tokens(candidate, matcher)
+        with _lock:
+            if tokens is None:
+                _index.remove(candidate_id)
+            else:
+                _index.upsert(candidate_id, tokens)
+            if _pending_updates is not None:
+                _pending_updates[candidate_id] = tokens
+    except Exception as e:
+        # The next full rebuild catches up; a failed index update must never fail the submission
+        logger.error(f"Failed to index candidate {candidate_id}: {str(e)}")
+
+
+async def shortlist_candidates(db: AsyncSession, job_id: int, k: int = 50):
+    job = await get_loader(db).job(job_id)
+    if not job:
+        raise ValueError("Job not found")
+
+    index = await ensure_index(db)
+    query = job_tokens(job, await get_skill_matcher(db))
+    with _lock:
+        results = index.search(query, k)
+    return [{"candidate_id": candidate_id, "score": round(score, 4)} for candidate_id, score in results]
@@ -19,13 +19,15 @@
 #     return results
 
 
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
 from models import Candidate,JobListing,JobApplication
 from schemas import CandidateCreate, CandidateUpdate
 from datetime import datetime
 from fastapi import HTTPException
 # Create a new candidate
-async def create_candidate(db: Session, candidate: CandidateCreate):
+async def create_candidate(db: AsyncSession, candidate: CandidateCreate):
     new_candidate = Candidate(
         name=candidate.name,
         interview_token=candidate.interview_token,
@@ -34,21 +36,21 @@ async def create_candidate(db: Session, candidate: CandidateCreate):
         is_valid=candidate.is_valid
     )
     db.add(new_candidate)
-    db.commit()
-    db.refresh(new_candidate)
+    await db.commit()
+    await db.refresh(new_candidate)
     return new_candidate
 
 # Get all candidates
-async def get_candidates(db: Session):
-    return db.query(Candidate).all()
+async def get_candidates(db: AsyncSession):
+    return (await db.scalars(select(Candidate))).all()
 
 # Get a specific candidate by ID
-async def get_candidate(db: Session, candidate_id: int):
-    return db.query(Candidate).filter(Candidate.candidate_id == candidate_id).first()
+async def get_candidate(db: AsyncSession, candidate_id: int):
+    return await db.get(Candidate, candidate_id)
 
 # Update a candidate
-async def update_candidate(db: Session, candidate_id: int, candidate: CandidateUpdate):
-    db_candidate = db.query(Candidate).filter(Candidate.candidate_id == candidate_id).first()
+async def update_candidate(db: AsyncSession, candidate_id: int, candidate: CandidateUpdate):
+    db_candidate = await db.get(Candidate, candidate_id)
     if not db_candidate:
         return None
     db_candidate.name = candidate.name
@@ -56,25 +58,30 @@ async def update_candidate(db: Session, candidate_id: int, candidate: CandidateU
     db_candidate.token_expiry = candidate.token_expiry
     db_candidate.is_interviewed = candidate.is_interviewed
     db_candidate.is_valid = candidate.is_valid
-    db.commit()
-    db.refresh(db_candidate)
+    await db.commit()
+    await db.refresh(db_candidate)
     return db_candidate
 
 # Delete a candidate
-async def delete_candidate(db: Session, candidate_id: int):
-    db_candidate = db.query(Candidate).filter(Candidate.candidate_id == candidate_id).first()
+async def delete_candidate(db: AsyncSession, candidate_id: int):
+    db_candidate = await db.get(Candidate, candidate_id)
     if db_candidate:
-        db.delete(db_candidate)
-        db.commit()
+        await db.delete(db_candidate)
+        await db.commit()
 
 
-async def get_my_jobs(candidate_id: int, db: Session):
+async def get_my_jobs(candidate_id: int, db: AsyncSession):
     """
     Get all job applications for a specific candidate along with the job details.
     """
-    applications = db.query(JobApplication).join(JobListing).filter(JobApplication.candidate_id == candidate_id).all()
+    applications = (await db.scalars(
+        select(JobApplication)
+        .join(JobListing)
+        .options(selectinload(JobApplication.job_listing))
+        .where(JobApplication.candidate_id == candidate_id)
+    )).all()
     
     if not applications:
         raise HTTPException(status_code=404, detail="No job applications found for this candidate.")
     
-    return applications
\ No newline at end of file
+    return applications
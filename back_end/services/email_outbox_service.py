@@ -0,0 +1,100 @@
+import asyncio
+import logging
+import random
+from datetime import datetime, timedelta
+
+from config import settings
+from sqlalchemy import select
+
+from database import AsyncSessionLocal
+from models import EmailOutbox
+from utils import email_utils
+from utils.worker_utils import WorkerPool
+
+logger = logging.getLogger(__name__)
+
+
+def _retry_delay(attempts: int) -> float:
+    # Exponential backoff with jitter, so a flapping SMTP server is not hammered by every worker at once
+    ceiling = min(settings.EMAIL_RETRY_MAX_DELAY, settings.EMAIL_RETRY_BASE_DELAY * (2 ** (attempts - 1)))
+    return random.uniform(ceiling / 2, ceiling)
+
+
+async def claim_email_batch():
+    # SKIP LOCKED lets senders in every process claim disjoint batches
+    async with AsyncSessionLocal() as db:
+        now = datetime.utcnow()
+        emails = (await db.scalars(
+            select(EmailOutbox)
+            .where(EmailOutbox.status == "pending", EmailOutbox.next_attempt_at <= now)
+            .order_by(EmailOutbox.email_id)
+            .limit(settings.EMAIL_BATCH_SIZE)
+            .with_for_update(skip_locked=True)
+        )).all()
+        if not emails:
+            return None
+        for email in emails:
+            email.status = "sending"
+            email.locked_at = now
+            email.attempts += 1
+        await db.commit()
+        return [email.email_id for email in emails]
+
+
+async def send_email_batch(email_ids):
+    async with AsyncSessionLocal() as db:
+        emails = (await db.scalars(
+            select(EmailOutbox).where(EmailOutbox.email_id.in_(email_ids)).order_by(EmailOutbox.email_id)
+        )).all()
+        messages = [(email.to_email, email.subject, email.body) for email in emails]
+        # smtplib blocks, so the whole batch goes to a thread over one pooled connection
+        errors = await asyncio.to_thread(email_utils.send_batch, messages)
+
+        now = datetime.utcnow()
+        for email, error in zip(emails, errors):
+            if error is None:
+                email.status = "sent"
+                email.sent_at = now
+                email.last_error = None
+            elif email.attempts >= settings.EMAIL_MAX_ATTEMPTS:
+                email.status = "failed"
+                email.last_error = error
+                logger.error("Giving up on email %s to %s: %s", email.email_id, email.to_email, error)
+            else:
+                email.status = "pending"
+                email.last_error = error
+                email.next_attempt_at = now + timedelta(seconds=_retry_delay(email.attempts))
+                logger.warning("Email %s to %s failed, will retry: %s", email.email_id, email.to_email, error)
+            email.locked_at = None
+        await db.commit()
+        sent = errors.count(None)
+        if sent:
+            logger.info("Sent %d of %d emails", sent, len(emails))
+
+
+async def requeue_stale_emails():
+    """Release batches claimed by a sender that crashed or was restarted mid-send."""
+    async with AsyncSessionLocal() as db:
+        cutoff = datetime.utcnow() - timedelta(seconds=settings.JOB_STALE_AFTER_SECONDS)
+        stale = (await db.scalars(
+            select(EmailOutbox)
+            .where(EmailOutbox.status == "sending", EmailOutbox.locked_at < cutoff)
+            .with_for_update(skip_locked=True)
+        )).all()
+        for email in stale:
+            email.status = "pending"
+            email.locked_at = None
+        await db.commit()
+        if stale:
+            logger.info("Recovered %d stale outbox emails", len(stale))
+
+
+email_sender = WorkerPool(
+    "email-sender",
+    claim=claim_email_batch,
+    process=send_email_batch,
+    concurrency=settings.EMAIL_SENDER_WORKERS,
+    poll_interval=settings.JOB_POLL_INTERVAL_SECONDS,
+    recover=requeue_stale_emails,
+    recover_interval=settings.JOB_STALE_AFTER_SECONDS / 2,
+)
@@ -0,0 +1,185 @@
+import asyncio
+import logging
+import os
+import shutil
+import uuid
+from collections import OrderedDict
+from datetime import datetime
+from typing import List
+
+from fastapi import UploadFile
+from starlette.concurrency import run_in_threadpool
+
+from config import settings
+from database import AsyncSessionLocal
+from services import prompt_service, resume_service
+from utils import llm_utils, pdf_utils
+from utils.cache_utils import parsed_resume_cache, resume_cache_key
+from utils.file_utils import save_upload, extract_zip_pdfs
+
+logger = logging.getLogger(__name__)
+
+# Batch progress lives in memory on the worker that accepted the upload;
+# only the most recent BULK_MAX_BATCHES_KEPT batches are retained.
+_batches = OrderedDict()
+
+
+def _new_entry(filename, stored_filename=None, sha256=None, error=None):
+    return {
+        "filename": filename,
+        "stored_filename": stored_filename,
+        "sha256": sha256,
+        "status": "failed" if error else "queued",
+        "candidate_id": None,
+        "error": error,
+    }
+
+
+async def create_batch(files: List[UploadFile]) -> dict:
+    """Stream every uploaded PDF (or PDF inside a zip) to disk and register a batch for it."""
+    batch_id = uuid.uuid4().hex
+    entries = []
+
+    for file in files:
+        filename = file.filename or "upload"
+        try:
+            if filename.lower().endswith(".zip"):
+                # Archives are unpacked from a private folder so concurrent batches never share a path
+                zip_folder = os.path.join(settings.UPLOAD_FOLDER, ".bulk", batch_id)
+                try:
+                    stored_zip, _, _ = await save_upload(
+                        file, folder=zip_folder, max_bytes=settings.BULK_MAX_ZIP_SIZE_MB * 1024 * 1024
+                    )
+                    members = await run_in_threadpool(extract_zip_pdfs, os.path.join(zip_folder, stored_zip))
+                finally:
+                    shutil.rmtree(zip_folder, ignore_errors=True)
+                for member in members:
+                    entries.append(_new_entry(
+                        f"{filename}/{member['filename']}",
+                        member.get("stored_filename"),
+                        member.get("sha256"),
+                        member.get("error"),
+                    ))
+            elif filename.lower().endswith(".pdf"):
+                stored_filename, pdf_hash, _ = await save_upload(file)
+                entries.append(_new_entry(filename, stored_filename, pdf_hash))
+            else:
+                entries.append(_new_entry(filename, error="Unsupported file type, expected a PDF or a zip archive"))
+        except Exception as e:
+            entries.append(_new_entry(filename, error=str(e)))
+
+    for entry in entries[settings.BULK_MAX_FILES:]:
+        entry.update(status="failed", error=f"Batch is limited to {settings.BULK_MAX_FILES} files")
+
+    _batches[batch_id] = {
+        "batch_id": batch_id,
+        "status": "processing",
+        "created_at": datetime.utcnow().isoformat(),
+        "completed_at": None,
+        "files": entries,
+    }
+    while len(_batches) > settings.BULK_MAX_BATCHES_KEPT:
+        _batches.popitem(last=False)
+
+    return get_batch(batch_id)
+
+
+def get_batch(batch_id: str):
+    batch = _batches.get(batch_id)
+    if batch is None:
+        return None
+
+    files = [dict(entry) for entry in batch["files"]]
+    completed = sum(1 for entry in files if entry["status"] == "completed")
+    failed = sum(1 for entry in files if entry["status"] == "failed")
+    return {
+        **batch,
+        "total_files": len(files),
+        "completed": completed,
+        "failed": failed,
+        "in_progress": len(files) - completed - failed,
+        "files": files,
+    }
+
+
+async def process_batch(batch_id: str):
+    """Run every queued file of a batch through extraction, parsing and submit_resume.
+
+    Each stage has its own concurrency limit so extraction keeps the process
+    pool busy while parsing is bounded by the LLM budget. Failures are
+    recorded per file and never stop the rest of the batch.
+    """
+    batch = _batches.get(batch_id)
+    if batch is None:
+        return
+
+    pending = [entry for entry in batch["files"] if entry["status"] == "queued"]
+
+    async with AsyncSessionLocal() as db:
+        resume_parsing_prompt = await prompt_service.get_prompt_by_name(db, "RESUME_PARSING_PROMPT")
+
+    if not resume_parsing_prompt:
+        for entry in pending:
+            entry.update(status="failed", error="Resume parsing prompt not found in the database")
+    else:
+        stages = {
+            "extract": asyncio.Semaphore(settings.PDF_EXTRACTION_WORKERS),
+            "parse": asyncio.Semaphore(
+                settings.LLM_PURPOSE_CONCURRENCY.get(llm_utils.RESUME_PARSING, settings.LLM_MAX_CONCURRENCY)
+            ),
+            "submit": asyncio.Semaphore(settings.BULK_SUBMIT_CONCURRENCY),
+        }
+        # Identical PDFs within a batch are parsed once and shared
+        parse_tasks = {}
+        await asyncio.gather(*(
+            _process_file(entry, resume_parsing_prompt.content, stages, parse_tasks)
+            for entry in pending
+        ))
+
+    batch["status"] = "completed"
+    batch["completed_at"] = datetime.utcnow().isoformat()
+    logger.info("Bulk batch %s completed", batch_id)
+
+
+async def _process_file(entry: dict, prompt_content: str, stages: dict, parse_tasks: dict):
+    try:
+        task = parse_tasks.get(entry["sha256"])
+        if task is None:
+            task = asyncio.ensure_future(_parse_file(entry, prompt_content, stages))
+            parse_tasks[entry["sha256"]] = task
+        else:
+            entry["status"] = "parsing"
+        parsed_data = await task
+
+        entry["status"] = "submitting"
+        async with stages["submit"]:
+            async with AsyncSessionLocal() as db:
+                result = await resume_service.submit_resume(parsed_data, db)
+
+        entry.update(status="completed", candidate_id=result["candidate_id"])
+    except Exception as e:
+        logger.warning("Bulk ingestion failed for %s: %s", entry["filename"], e)
+        entry.update(status="failed", error=str(e))
+
+
+async def _parse_file(entry: dict, prompt_content: str, stages: dict) -> dict:
+    cache_key = resume_cache_key(entry["sha256"], resume_service.resume_prompt_version(prompt_content))
+    cached_data = await parsed_resume_cache.get_async(cache_key)
+    if cached_data is not None:
+        return cached_data
+
+    entry["status"] = "extracting"
+    async with stages["extract"]:
+        pdf_text = await pdf_utils.extract_text_from_pdf_async(
+            os.path.join(settings.UPLOAD_FOLDER, entry["stored_filename"])
+        )
+
+    entry["status"] = "parsing"
+    async with stages["parse"]:
+        parsed_data = await resume_service.parse_resume_text(pdf_text, prompt_content)
+
+    if not isinstance(parsed_data, dict) or not parsed_data:
+        raise ValueError("Could not parse resume")
+
+    await parsed_resume_cache.set_async(cache_key, parsed_data)
+    return parsed_data
@@ -1,7 +1,10 @@
 from fastapi import HTTPException, Request, Depends
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
 from models import Candidate, Interview
 from utils import email_utils, db_utils
+from services import email_outbox_service
 from datetime import datetime, timedelta
 from zoneinfo import ZoneInfo
 import json
@@ -13,12 +16,17 @@ import logging
 # logger = logging.getLogger(__name__)
 
 
-async def schedule_interview(request_body, db: Session):
+async def schedule_interview(request_body, db: AsyncSession, commit: bool = True):
+    """Issue an interview link and queue the invitation email.
+
+    With `commit=False` the outbox row is left in the caller's transaction, so
+    the email is only sent if the caller's own status change commits.
+    """
     candidate_id = request_body.candidate_id
-    candidate_email, candidate_name = db_utils.get_candidate_details(db, candidate_id)
+    candidate_email, candidate_name = await db_utils.get_candidate_details(db, candidate_id)
     
     if candidate_email:
-        token, expiration_time_utc = db_utils.generate_candidate_link(db, candidate_id)
+        token, expiration_time_utc = await db_utils.generate_candidate_link(db, candidate_id)
         interview_url = f"http://localhost:5173/vapi/{token}"  # Replace with actual frontend URL
 
         expiration_time_pst = expiration_time_utc.astimezone(ZoneInfo("Asia/Karachi"))
@@ -45,22 +53,32 @@ async def schedule_interview(request_body, db: Session):
                 "Best regards,\n"
                 "EDVENITY Recruitment Team")
 
-        email_utils.send_interview_email(candidate_email, subject, body)
+        email_utils.queue_email(db, candidate_email, subject, body)
+        if commit:
+            await db.commit()
+            email_outbox_service.email_sender.notify()
 
         return {"message": f"Interview scheduled for candidate ID {candidate_id} ({candidate_name}).",
                 "interview_link": interview_url}
     else:
         raise HTTPException(status_code=404, detail=f"Candidate with ID {candidate_id} not found.")
 
-async def validate_interview_link(request: Request, db: Session = Depends(get_db)):
+async def validate_interview_link(request: Request, db: AsyncSession = Depends(get_db)):
 
     token = request.path_params.get("token")
     # Fetch the candidate by token and check if the token is valid and the interview has not been completed
-    candidate = db.query(Candidate).filter(
+    candidate = await db.scalar(select(Candidate).options(
+        selectinload(Candidate.contacts),
+        selectinload(Candidate.addresses),
+        selectinload(Candidate.skills),
+        selectinload(Candidate.projects),
+        selectinload(Candidate.experiences),
+        selectinload(Candidate.educations),
+    ).where(
         Candidate.interview_token == token,
         Candidate.is_valid.is_(True),   # Check if token is still valid
         Candidate.is_interviewed.is_(False)  # Check if interview has not been completed
-    ).first()
+    ))
 
     # If no candidate is found or the token is invalid or interview is completed
     if not candidate:
@@ -73,7 +91,7 @@ async def validate_interview_link(request: Request, db: Session = Depends(get_db
     if current_time > candidate.token_expiry:
         # Mark the token as invalid because it has expired
         candidate.is_valid = False
-        db.commit()  # Save the changes in the database
+        await db.commit()  # Save the changes in the database
 
         raise HTTPException(status_code=400, detail="Link has expired due to token expiration.")
 
@@ -92,7 +110,7 @@ async def validate_interview_link(request: Request, db: Session = Depends(get_db
     # Return the candidate data if the token is still valid and the interview has not been completed
     return candidate_data
 
-async def handle_vapi_end_of_call(request: Request, db: Session):
+async def handle_vapi_end_of_call(request: Request, db: AsyncSession):
     try:
         # Parse and validate incoming JSON data
         data = await request.json()
@@ -117,7 +135,7 @@ async def handle_vapi_end_of_call(request: Request, db: Session):
         candidate_id = variable_values.get('candidateId')
         # ... (validation checks for candidate_id)
 
-        candidate = db.query(Candidate).filter(Candidate.candidate_id == candidate_id).first()
+        candidate = await db.get(Candidate, candidate_id)
         if not candidate:
             raise HTTPException(status_code=404, detail=f"Candidate with ID {candidate_id} not found")
 
@@ -141,11 +159,11 @@ async def handle_vapi_end_of_call(request: Request, db: Session):
             candidate.is_valid = False
             candidate.interview_token = None
 
-            db.commit()
-            db.refresh(new_interview)
+            await db.commit()
+            await db.refresh(new_interview)
 
         except Exception as e:
-            db.rollback()
+            await db.rollback()
             raise HTTPException(status_code=500, detail=f"Failed to store interview data: {str(e)}")
 
         # Return success response with interview details
@@ -164,10 +182,10 @@ async def handle_vapi_end_of_call(request: Request, db: Session):
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"An error occurred while processing the request: {str(e)}")
 
-def end_interview(db: Session, candidate_id: int):
+async def end_interview(db: AsyncSession, candidate_id: int):
     try:
         # Fetch the candidate
-        candidate = db.query(Candidate).filter(Candidate.candidate_id == candidate_id).first()
+        candidate = await db.get(Candidate, candidate_id)
         
         if not candidate:
             return None
@@ -179,10 +197,10 @@ def end_interview(db: Session, candidate_id: int):
         candidate.is_valid = False
 
         # Commit changes to the database
-        db.commit()
+        await db.commit()
         
         return candidate
     except Exception as e:
-        db.rollback()
+        await db.rollback()
         print(f"Error updating candidate: {e}")
         return None
@@ -1,21 +1,23 @@
-from sqlalchemy.orm import Session
-from models import JobListing, JobApplication
+from sqlalchemy.ext.asyncio import AsyncSession
+from models import Candidate, JobListing, JobApplication
 from schemas import JobListingCreate, JobListingUpdate, ApplicationResponse, MatchingResult, PaginatedJobsResponse, JobListingResponse
 from datetime import datetime
-from services import matching_service, interview_service, resume_service
+from services import application_pipeline_service
 from fastapi import HTTPException
 import logging
 from config import settings
 from utils.jobs_utils import generate_job_description
 import asyncio
-from sqlalchemy import func
+from sqlalchemy import func, select
+from sqlalchemy.exc import IntegrityError
+from utils.entity_loader import get_loader
 
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 # Create a new job listing
-async def create_job(db: Session, job: JobListingCreate):
+async def create_job(db: AsyncSession, job: JobListingCreate):
     db_job = JobListing(
         title=job.title,
         description=job.description,
@@ -25,20 +27,20 @@ async def create_job(db: Session, job: JobListingCreate):
         date_posted=datetime.now()
     )
     db.add(db_job)
-    db.commit()
-    db.refresh(db_job)
+    await db.commit()
+    await db.refresh(db_job)
     return db_job
 
 # Get all job listings
-async def get_jobs(db: Session, page: int, page_size: int = 15) -> PaginatedJobsResponse:
+async def get_jobs(db: AsyncSession, page: int, page_size: int = 15) -> PaginatedJobsResponse:
     # Calculate the offset
     offset = (page - 1) * page_size
 
     # Query for paginated jobs
-    jobs = db.query(JobListing).offset(offset).limit(page_size).all()
+    jobs = (await db.scalars(select(JobListing).offset(offset).limit(page_size))).all()
 
     # Get total count of jobs
-    total_jobs = db.query(func.count(JobListing.id)).scalar()
+    total_jobs = await db.scalar(select(func.count()).select_from(JobListing))
 
     # Calculate total pages
     total_pages = (total_jobs + page_size - 1) // page_size
@@ -55,12 +57,12 @@ async def get_jobs(db: Session, page: int, page_size: int = 15) -> PaginatedJobs
     )
 
 # Get a specific job by ID
-async def get_job(db: Session, job_id: int):
-    return db.query(JobListing).filter(JobListing.job_id == job_id).first()
+async def get_job(db: AsyncSession, job_id: int):
+    return await db.get(JobListing, job_id)
 
 # Update a job listing
-async def update_job(db: Session, job_id: int, job: JobListingUpdate):
-    db_job = db.query(JobListing).filter(JobListing.job_id == job_id).first()
+async def update_job(db: AsyncSession, job_id: int, job: JobListingUpdate):
+    db_job = await db.get(JobListing, job_id)
     if not db_job:
         return None
     db_job.title = job.title
@@ -68,22 +70,25 @@ async def update_job(db: Session, job_id: int, job: JobListingUpdate):
     db_job.location = job.location
     db_job.salary = job.salary
     db_job.is_opened = job.is_opened
-    db.commit()
-    db.refresh(db_job)
+    await db.commit()
+    await db.refresh(db_job)
     return db_job
 
 # Delete a job listing
-async def delete_job(db: Session, job_id: int):
-    db_job = db.query(JobListing).filter(JobListing.job_id == job_id).first()
+async def delete_job(db: AsyncSession, job_id: int):
+    db_job = await db.get(JobListing, job_id)
     if db_job:
-        db.delete(db_job)
-        db.commit()
+        await db.delete(db_job)
+        await db.commit()
 
-async def get_job_details(db: Session, job_id: int) -> dict:
-    job = db.query(JobListing).filter(JobListing.job_id == job_id).first()
+async def get_job_details(db: AsyncSession, job_id: int) -> dict:
+    job = await get_loader(db).job(job_id)
     if not job:
         return None
-    
+    return serialize_job_details(job)
+
+
+def serialize_job_details(job: JobListing) -> dict:
     return {
         "title": job.title or None,
         "description": job.description or None,
@@ -94,15 +99,37 @@ async def get_job_details(db: Session, job_id: int) -> dict:
     }
 
 
-async def apply_for_job(db: Session, job_id: int, candidate_id: int) -> ApplicationResponse:
+async def apply_for_job(db: AsyncSession, job_id: int, candidate_id: int, idempotency_key: str = None):
+    """Record the application and hand matching, scheduling and notification to the application workers.
+
+    Returns `(response, created)`. Retries with the same idempotency key, and
+    any repeat application for the same job and candidate, get the existing
+    application back instead of a new one, so they follow the evaluation that
+    is already in flight rather than starting another.
+    """
     logger.info(f"Applying for job_id: {job_id}, candidate_id: {candidate_id}")
-    
-    job = db.query(JobListing).filter(JobListing.job_id == job_id).first()
+
+    if idempotency_key:
+        existing = await db.scalar(select(JobApplication).where(JobApplication.idempotency_key == idempotency_key))
+        if existing:
+            if (existing.job_id, existing.candidate_id) != (job_id, candidate_id):
+                raise HTTPException(status_code=409, detail="Idempotency-Key was already used for a different application")
+            return _application_response(existing), False
+
+    existing = await _find_application(db, job_id, candidate_id)
+    if existing:
+        logger.info(f"Candidate {candidate_id} already applied for job {job_id}: {existing.application_id}")
+        return _application_response(existing), False
+
+    job = await get_loader(db).job(job_id)
     if not job:
         logger.error(f"Job with id {job_id} not found")
         raise ValueError(f"Job with id {job_id} not found")
 
-    logger.info(f"Job details: {job.__dict__}")
+    # Checked up front so a bad candidate_id is a 404, not a foreign key violation mistaken for a race below
+    if not await _candidate_exists(db, candidate_id):
+        logger.error(f"Candidate with id {candidate_id} not found")
+        raise ValueError(f"Candidate with id {candidate_id} not found")
 
     # Create a new application with initial status "Pending"
     new_application = JobApplication(
@@ -110,58 +137,53 @@ async def apply_for_job(db: Session, job_id: int, candidate_id: int) -> Applicat
         candidate_id=candidate_id,
         date_applied=datetime.utcnow(),
         status="Pending",
-        match_score=None  # We'll update this after evaluation
+        match_score=None,  # Filled in by the application pipeline
+        stage="queued",
+        attempts=0,
+        idempotency_key=idempotency_key
     )
-    
+
     db.add(new_application)
-    db.commit()
-    db.refresh(new_application)
-    logger.info(f"New application created: {new_application.__dict__}")
-
-    # Fetch and log the parsed resume
-    parsed_resume = await resume_service.get_parsed_resume(db, candidate_id)
-    logger.info(f"Parsed resume for candidate {candidate_id}: {parsed_resume}")
-
-    # Evaluate the match
-    match_result: MatchingResult = await matching_service.evaluate_match(db, job_id, candidate_id)
-    logger.info(f"Match result: {match_result}")
-
-    # Update the application with the match score
-    new_application.match_score = match_result.match_score
-
-    if match_result.match_score >= 7:
-        logger.info("High match score: Scheduling interview")
-        class RequestBody:
-            def __init__(self, candidate_id):
-                self.candidate_id = candidate_id
-
-        request_body = RequestBody(candidate_id)
-        interview_result = await interview_service.schedule_interview(request_body, db)
-        new_application.status = "Interview Scheduled"
-        interview_link = interview_result.get("interview_link")
-        logger.info(f"Interview scheduled: {interview_link}")
-    # elif match_result.match_score >= 5:
-    #     logger.info("Medium match score: Keeping as 'Pending' for manual review")
-    #     new_application.status = "Pending"
-    #     interview_link = None
-    else:
-        logger.info("Low match score: Marking as 'Not Qualified'")
-        new_application.status = "Not Qualified"
-        interview_link = None
-
-    db.commit()
-    logger.info(f"Application status updated: {new_application.status}")
-
-    response = ApplicationResponse(
-        application_id=new_application.application_id,
-        job_id=job_id,
-        candidate_id=candidate_id,
-        status=new_application.status,
-        date_applied=new_application.date_applied,
-        match_score=match_result.match_score,
-        interview_link=interview_link,
-        explanation=match_result.explanation
+    try:
+        await db.commit()
+    except IntegrityError:
+        # A concurrent request for the same job and candidate (or key) won the insert
+        await db.rollback()
+        existing = await _find_application(db, job_id, candidate_id)
+        if existing is None:
+            if not await _candidate_exists(db, candidate_id):
+                # Deleted after the check above
+                raise ValueError(f"Candidate with id {candidate_id} not found")
+            raise HTTPException(status_code=409, detail="Idempotency-Key was already used for a different application")
+        return _application_response(existing), False
+    await db.refresh(new_application)
+    logger.info(f"New application queued: {new_application.application_id}")
+
+    application_pipeline_service.application_workers.notify()
+    return _application_response(new_application), True
+
+
+async def _candidate_exists(db: AsyncSession, candidate_id: int) -> bool:
+    return await db.scalar(select(Candidate.candidate_id).where(Candidate.candidate_id == candidate_id)) is not None
+
+
+async def _find_application(db: AsyncSession, job_id: int, candidate_id: int):
+    return await db.scalar(
+        select(JobApplication)
+        .where(JobApplication.job_id == job_id, JobApplication.candidate_id == candidate_id)
     )
-    logger.info(f"Application response: {response}")
 
-    return response
+
+def _application_response(application: JobApplication) -> ApplicationResponse:
+    return ApplicationResponse(
+        application_id=application.application_id,
+        job_id=application.job_id,
+        candidate_id=application.candidate_id,
+        status=application.status,
+        date_applied=application.date_applied,
+        match_score=application.match_score,
+        interview_link=application.interview_link,
+        explanation=application.match_explanation,
+        match_source=application.match_source,
+        stage=application.stage
+    )
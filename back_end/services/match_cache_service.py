@@ -0,0 +1,106 @@
+import json
+import logging
+from datetime import datetime
+
+from sqlalchemy import func, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from config import settings
+from models import MatchResultCache
+from schemas import MatchingResult
+from utils.cache_utils import sha256_text
+from utils.metrics import registry
+
+logger = logging.getLogger(__name__)
+
+# Process-local counters; every worker process keeps its own
+MATCH_CACHE_LOOKUPS = registry.counter("match_cache_lookups_total", "Match-result cache lookups", ("result",))
+MATCH_CACHE_STORES = registry.counter("match_cache_stores_total", "Match results written to the cache")
+
+
+def _content_hash(value) -> str:
+    return sha256_text(json.dumps(value, sort_keys=True, default=str))
+
+
+def match_cache_keys(job_details: dict, parsed_resume: dict, prompt_content: str) -> dict:
+    """Content hashes for one evaluation; any change to the inputs yields a new cache key."""
+    keys = {
+        "job_hash": _content_hash(job_details),
+        "resume_hash": _content_hash(parsed_resume),
+        "prompt_hash": sha256_text(f"{settings.LLM_MODEL}:{prompt_content}"),
+    }
+    keys["cache_key"] = sha256_text(f"{keys['job_hash']}:{keys['resume_hash']}:{keys['prompt_hash']}")
+    return keys
+
+
+async def get_cached_match(db: AsyncSession, *cache_keys: str):
+    """Cached result under any of `cache_keys` (e.g. single and batched prompt variants), counted as one lookup."""
+    return (await get_cached_matches(db, {None: cache_keys})).get(None)
+
+
+async def get_cached_matches(db: AsyncSession, cache_keys_by_owner: dict) -> dict:
+    """Cached results for many lookups at once: one SELECT, one hit-time UPDATE and one commit.
+
+    `cache_keys_by_owner` maps an owner (e.g. a candidate id) to its cache
+    keys in order of preference. Returns owner -> MatchingResult for the hits.
+    """
+    all_keys = {key for cache_keys in cache_keys_by_owner.values() for key in cache_keys}
+    entries = {}
+    if all_keys:
+        entries = {
+            entry.cache_key: entry
+            for entry in await db.scalars(select(MatchResultCache).where(MatchResultCache.cache_key.in_(all_keys)))
+        }
+
+    results, hit_keys = {}, set()
+    for owner, cache_keys in cache_keys_by_owner.items():
+        entry = next((entries[key] for key in cache_keys if key in entries), None)
+        if entry is None:
+            MATCH_CACHE_LOOKUPS.inc(result="miss")
+            continue
+        MATCH_CACHE_LOOKUPS.inc(result="hit")
+        results[owner] = MatchingResult(match_score=entry.match_score, explanation=entry.explanation)
+        hit_keys.add(entry.cache_key)
+
+    if hit_keys:
+        await db.execute(
+            update(MatchResultCache)
+            .where(MatchResultCache.cache_key.in_(hit_keys))
+            .values(last_hit_at=datetime.utcnow())
+            .execution_options(synchronize_session=False)
+        )
+        await db.commit()
+    return results
+
+
+async def store_match(db: AsyncSession, keys: dict, job_id: int, candidate_id: int, result: MatchingResult):
+    """Persist a successful evaluation. Failed evaluations are never cached."""
+    try:
+        # A savepoint, so losing the race below does not roll back (and expire) the caller's session
+        async with db.begin_nested():
+            db.add(MatchResultCache(
+                **keys,
+                job_id=job_id,
+                candidate_id=candidate_id,
+                match_score=result.match_score,
+                explanation=result.explanation,
+            ))
+    except IntegrityError:
+        # A concurrent evaluation of the same inputs stored it first
+        pass
+    else:
+        MATCH_CACHE_STORES.inc()
+    await db.commit()
+
+
+async def get_match_cache_stats(db: AsyncSession) -> dict:
+    hits = MATCH_CACHE_LOOKUPS.value(result="hit")
+    misses = MATCH_CACHE_LOOKUPS.value(result="miss")
+    return {
+        "hits": hits,
+        "misses": misses,
+        "stores": MATCH_CACHE_STORES.value(),
+        "hit_rate": round(hits / (hits + misses), 4) if hits + misses else 0.0,
+        "entries": await db.scalar(select(func.count(MatchResultCache.cache_key))) or 0,
+    }
@@ -1,16 +1,74 @@
-import re
+import asyncio
+import logging
 import traceback
 from schemas import MatchingResult
-from services import resume_service, job_service, prompt_service
-from langchain_openai import ChatOpenAI
+from services import resume_service, job_service, prompt_service, match_cache_service
+from utils import llm_utils
+from utils.json_stream import JSONStreamError
+from utils.worker_utils import RateLimiter
 from config import settings
+from backup_prompts import MATCHING_BATCH_EVALUATION_PROMPT
+from utils.entity_loader import get_loader
 import json
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
-# Initialize the LLM
-llm = ChatOpenAI(model="gpt-4-0125-preview", openai_api_key=settings.OPENAI_API_KEY)
+logger = logging.getLogger(__name__)
 
-async def evaluate_match(db: Session, job_id: int, candidate_id: int) -> MatchingResult:
+
+# (cache_key, score_only) -> _Flight scoring that pair in this process
+_in_flight = {}
+
+
+class LLMResponseError(Exception):
+    """The model answered, but not with a usable evaluation."""
+
+
+class _Flight:
+    """A shared `score_match` task and the number of callers still awaiting it."""
+
+    def __init__(self, task: asyncio.Future):
+        self.task = task
+        self.waiters = 0
+
+
+def _land(flight_key, flight: _Flight):
+    if _in_flight.get(flight_key) is flight:
+        del _in_flight[flight_key]
+
+
+async def _score_once(cache_key: str, prompt_content: str, job_details: dict, parsed_resume: dict, score_only: bool = False) -> MatchingResult:
+    """Run `score_match`, sharing one LLM call between concurrent requests for the same inputs.
+
+    A caller that is cancelled stops waiting without cancelling the call for
+    the others; the call itself is cancelled once no caller is left.
+    """
+    flight_key = (cache_key, score_only)
+    flight = _in_flight.get(flight_key)
+    if flight is None:
+        flight = _Flight(asyncio.ensure_future(score_match(prompt_content, job_details, parsed_resume, score_only)))
+        _in_flight[flight_key] = flight
+        flight.task.add_done_callback(lambda _: _land(flight_key, flight))
+    else:
+        logger.debug(f"Joining in-flight match evaluation {cache_key}")
+    flight.waiters += 1
+    try:
+        return await asyncio.shield(flight.task)
+    finally:
+        flight.waiters -= 1
+        if flight.waiters == 0 and not flight.task.done():
+            # Everyone gave up: a later request starts a fresh call instead of joining a cancelled one
+            _land(flight_key, flight)
+            flight.task.cancel()
+
+
+async def evaluate_match(db: AsyncSession, job_id: int, candidate_id: int, score_only: bool = False, raise_errors: bool = False) -> MatchingResult:
+    """Score one candidate against one job, from the match cache when possible.
+
+    LLM and transport failures come back as a zero score with the error as
+    explanation, unless `raise_errors` is set. Callers that act on the score
+    (the application pipeline) set it, so an outage is retried rather than
+    recorded as a rejection.
+    """
     try:
         job_details = await job_service.get_job_details(db, job_id)
         parsed_resume = await resume_service.get_parsed_resume(db, candidate_id)
@@ -27,48 +85,246 @@ async def evaluate_match(db: Session, job_id: int, candidate_id: int) -> Matchin
                 explanation=f"Resume for candidate with id {candidate_id} not found."
             )
 
-        print(f"Job details: {json.dumps(job_details, indent=2)}")
-        print(f"Parsed resume: {json.dumps(parsed_resume, indent=2)}")
-
         # Fetch the prompt from the database
         matching_prompt = await prompt_service.get_prompt_by_name(db, "MATCHING_EVALUATION_PROMPT")
         if not matching_prompt:
             raise ValueError("Matching evaluation prompt not found in the database")
 
-        # Use a safer string formatting method
-        prompt = matching_prompt.content.replace(
-            "{job_details}", json.dumps(job_details, indent=2)
-        ).replace(
-            "{parsed_resume}", json.dumps(parsed_resume, indent=2)
-        )
+        cache_keys = match_cache_service.match_cache_keys(job_details, parsed_resume, matching_prompt.content)
+        cached_result = await match_cache_service.get_cached_match(db, cache_keys["cache_key"])
+        if cached_result is not None:
+            logger.debug(f"Match cache hit for job {job_id}, candidate {candidate_id}")
+            return cached_result
 
-        print(f"Sending prompt to LLM: {prompt}")
-        response = await llm.ainvoke(prompt)
-        print(f"LLM Response: {response.content}")  # Debug print
-        
-        if not response.content.strip():
-            return MatchingResult(
-                match_score=0,
-                explanation="Error: Empty response from LLM."
-            )
+        result = await _score_once(cache_keys["cache_key"], matching_prompt.content, job_details, parsed_resume, score_only)
+        if not score_only:
+            await match_cache_service.store_match(db, cache_keys, job_id, candidate_id, result)
+        return result
+    except LLMResponseError as e:
+        if raise_errors:
+            raise
+        logger.warning(f"Matching job {job_id} and candidate {candidate_id} failed: {str(e)}")
+        return MatchingResult(match_score=0, explanation=str(e))
+    except Exception as e:
+        if raise_errors:
+            raise
+        error_msg = f"Error during matching process: {str(e)}\n{traceback.format_exc()}"
+        logger.error(error_msg)
+        return MatchingResult(match_score=0, explanation=error_msg)
 
-        # Remove Markdown code block syntax if present
-        json_content = re.sub(r'```json\n|\n```', '', response.content).strip()
 
-        result = json.loads(json_content)
-        
+async def score_match(prompt_content: str, job_details: dict, parsed_resume: dict, score_only: bool = False) -> MatchingResult:
+    """Ask the LLM to score one candidate against one job. Raises instead of returning error results.
+
+    The answer is streamed and parsed incrementally; with `score_only` the
+    generation is stopped as soon as `match_score` is complete and the
+    explanation is left empty.
+    """
+    # Use a safer string formatting method
+    prompt = prompt_content.replace(
+        "{job_details}", json.dumps(job_details, indent=2)
+    ).replace(
+        "{parsed_resume}", json.dumps(parsed_resume, indent=2)
+    )
+
+    try:
+        result = await llm_utils.complete_json(
+            prompt,
+            purpose=llm_utils.MATCHING_EVALUATION,
+            on_field=(lambda key, value: key == "match_score") if score_only else None,
+        )
+    except JSONStreamError as e:
+        raise LLMResponseError(f"Error parsing LLM response: {str(e)}")
+
+    try:
         # Ensure the match_score is between 0 and 10
         match_score = min(max(float(result["match_score"]), 0), 10)
-        
-        return MatchingResult(
-            match_score=match_score,
-            explanation=result["explanation"]
-        )
-    except json.JSONDecodeError as e:
-        error_msg = f"Error parsing LLM response: {str(e)}\nResponse content: {response.content}"
-        print(error_msg)
-        return MatchingResult(match_score=0, explanation=error_msg)
-    except Exception as e:
-        error_msg = f"Error during matching process: {str(e)}\n{traceback.format_exc()}"
-        print(error_msg)
-        return MatchingResult(match_score=0, explanation=error_msg)
+        explanation = "" if score_only else result["explanation"]
+    except (KeyError, TypeError, ValueError) as e:
+        raise LLMResponseError(f"Error parsing LLM response: {str(e)}\nResponse content: {result}")
+
+    return MatchingResult(
+        match_score=match_score,
+        explanation=explanation
+    )
+
+
+async def evaluate_matches(db: AsyncSession, job_id: int, candidate_ids, batch_size: int = None, score_only: bool = False):
+    """Score many candidates against one job, yielding a result dict per candidate as each one finishes.
+
+    The job, prompts and all resumes are loaded up front in a handful of
+    queries; cache lookups and stores happen here in the generator, so the
+    concurrent LLM calls never touch the session. With `batch_size` > 1,
+    candidates are packed into multi-candidate prompts (see score_match_batch).
+    `score_only` stops every generation at the score, which only the
+    single-candidate prompt allows, so it also disables packing.
+    """
+    batch_size = 1 if score_only else max(batch_size or settings.MATCH_PROMPT_BATCH_SIZE, 1)
+    loader = get_loader(db)
+    job = await loader.job(job_id)
+    if not job:
+        raise ValueError(f"Job with id {job_id} not found")
+    matching_prompt = await prompt_service.get_prompt_by_name(db, "MATCHING_EVALUATION_PROMPT")
+    if not matching_prompt:
+        raise ValueError("Matching evaluation prompt not found in the database")
+    batch_prompt = await prompt_service.get_prompt_by_name(db, "MATCHING_BATCH_EVALUATION_PROMPT")
+    batch_prompt_content = batch_prompt.content if batch_prompt else MATCHING_BATCH_EVALUATION_PROMPT
+    job_details = job_service.serialize_job_details(job)
+
+    candidate_ids = list(dict.fromkeys(candidate_ids))
+    candidates = await loader.candidates(candidate_ids)
+
+    lookups = {}
+    for candidate_id in candidate_ids:
+        candidate = candidates.get(candidate_id)
+        if candidate is None:
+            yield _batch_result(candidate_id, 0, f"Resume for candidate with id {candidate_id} not found.", error=True)
+            continue
+        parsed_resume = resume_service.serialize_parsed_resume(candidate)
+        lookups[candidate_id] = parsed_resume, {
+            "single": match_cache_service.match_cache_keys(job_details, parsed_resume, matching_prompt.content),
+            "batch": match_cache_service.match_cache_keys(job_details, parsed_resume, batch_prompt_content),
+        }
+
+    # Every candidate's cache entry in one query, rather than a lookup and a commit per candidate
+    cached_results = await match_cache_service.get_cached_matches(db, {
+        candidate_id: (cache_keys["single"]["cache_key"], cache_keys["batch"]["cache_key"])
+        for candidate_id, (_, cache_keys) in lookups.items()
+    })
+    pending = []
+    for candidate_id, (parsed_resume, cache_keys) in lookups.items():
+        cached_result = cached_results.get(candidate_id)
+        if cached_result is not None:
+            yield _batch_result(candidate_id, cached_result.match_score, cached_result.explanation, cached=True)
+            continue
+        pending.append((candidate_id, parsed_resume, cache_keys))
+
+    semaphore = asyncio.Semaphore(max(settings.MATCH_BATCH_CONCURRENCY, 1))
+    rate_limiter = RateLimiter(settings.MATCH_BATCH_RATE_PER_MINUTE)
+
+    async def score_single(candidate_id, parsed_resume, cache_keys):
+        try:
+            result = await _score_once(
+                cache_keys["single"]["cache_key"], matching_prompt.content, job_details, parsed_resume, score_only
+            )
+            return candidate_id, cache_keys["single"], result, None
+        except Exception as e:
+            return candidate_id, cache_keys["single"], None, e
+
+    async def rescore_single(item):
+        async with semaphore:
+            await rate_limiter.wait()
+            return await score_single(*item)
+
+    async def score_group(group):
+        async with semaphore:
+            await rate_limiter.wait()
+            if len(group) == 1:
+                return [await score_single(*group[0])]
+
+            try:
+                results = await score_match_batch(
+                    batch_prompt_content, job_details, [(candidate_id, parsed_resume) for candidate_id, parsed_resume, _ in group]
+                )
+            except Exception as e:
+                logger.warning(f"Batched evaluation failed for job {job_id}, falling back to single evaluation: {e}")
+                results = {}
+
+            outcomes = [
+                (candidate_id, cache_keys["batch"], results[candidate_id], None)
+                for candidate_id, _, cache_keys in group
+                if candidate_id in results
+            ]
+            retry = [item for item in group if item[0] not in results]
+        if retry:
+            # Candidates missing or malformed in the batched answer are scored one by one,
+            # under the same concurrency and rate limits as every other call
+            outcomes.extend(await asyncio.gather(*(rescore_single(item) for item in retry)))
+        return outcomes
+
+    groups = [pending[index:index + batch_size] for index in range(0, len(pending), batch_size)]
+    tasks = [asyncio.create_task(score_group(group)) for group in groups]
+    try:
+        for next_done in asyncio.as_completed(tasks):
+            for candidate_id, cache_keys, result, error in await next_done:
+                if error is not None:
+                    logger.warning(f"Error matching candidate {candidate_id} for job {job_id}: {error}")
+                    yield _batch_result(candidate_id, 0, str(error), error=True)
+                    continue
+                if not score_only:
+                    await match_cache_service.store_match(db, cache_keys, job_id, candidate_id, result)
+                yield _batch_result(candidate_id, result.match_score, result.explanation)
+    finally:
+        # The client went away or the caller stopped iterating: don't keep spending tokens
+        for task in tasks:
+            task.cancel()
+
+
+def compact_profile(candidate_id: int, parsed_resume: dict) -> str:
+    """Single-line JSON profile for batched prompts: no contact details, no empty fields, no indentation."""
+    profile = {"id": candidate_id}
+    for field in ("skills", "education", "experiences", "projects"):
+        value = parsed_resume.get(field)
+        if isinstance(value, dict):
+            value = {key: item for key, item in value.items() if item}
+        elif isinstance(value, list):
+            value = [{key: item for key, item in entry.items() if item} for entry in value]
+            value = [entry for entry in value if entry]
+        if value:
+            profile[field] = value
+    return json.dumps(profile, separators=(",", ":"), ensure_ascii=False)
+
+
+async def score_match_batch(prompt_content: str, job_details: dict, candidates) -> dict:
+    """Score several `(candidate_id, parsed_resume)` pairs in one LLM call.
+
+    Returns a dict of candidate_id -> MatchingResult holding only the entries
+    that came back well-formed; callers re-score anything missing.
+    """
+    job_details = {key: value for key, value in job_details.items() if value is not None}
+    prompt = prompt_content.replace(
+        "{job_details}", json.dumps(job_details, separators=(",", ":"), ensure_ascii=False)
+    ).replace(
+        "{candidates}", "\n".join(compact_profile(candidate_id, parsed_resume) for candidate_id, parsed_resume in candidates)
+    )
+
+    logger.debug(f"Sending batched prompt for {len(candidates)} candidates to LLM")
+    try:
+        entries = await llm_utils.complete_json(prompt, purpose=llm_utils.MATCHING_EVALUATION)
+    except JSONStreamError as e:
+        raise LLMResponseError(f"Error parsing batched LLM response: {str(e)}")
+    if isinstance(entries, dict):
+        entries = entries.get("results", [])
+    if not isinstance(entries, list):
+        raise LLMResponseError("Batched LLM response is not a JSON array")
+
+    expected = {candidate_id for candidate_id, _ in candidates}
+    results, duplicates = {}, set()
+    for entry in entries:
+        try:
+            candidate_id = int(entry["id"])
+            match_score = float(entry["match_score"])
+            explanation = entry["explanation"]
+        except (KeyError, TypeError, ValueError):
+            continue
+        if candidate_id not in expected or not isinstance(explanation, str) or match_score != match_score:
+            continue
+        if candidate_id in results:
+            duplicates.add(candidate_id)
+            continue
+        results[candidate_id] = MatchingResult(match_score=min(max(match_score, 0), 10), explanation=explanation)
+
+    # Two answers for the same id means the model lost track of which profile was which
+    for candidate_id in duplicates:
+        results.pop(candidate_id, None)
+    return results
+
+
+def _batch_result(candidate_id, match_score, explanation, cached=False, error=False):
+    return {
+        "candidate_id": candidate_id,
+        "match_score": match_score,
+        "explanation": explanation,
+        "cached": cached,
+        "error": error,
+    }
@@ -0,0 +1,120 @@
+import re
+from dataclasses import dataclass
+from datetime import datetime
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from config import settings
+from models import Candidate, JobListing
+from utils.entity_loader import get_loader
+from utils.search_index import tokenize
+from utils.skill_matcher import get_skill_matcher
+
+YEAR_RE = re.compile(r"\b(?:19|20)\d{2}\b")
+ONGOING_RE = re.compile(r"present|current|now|ongoing", re.IGNORECASE)
+
+# Component weights of the local score; they sum to 1
+SKILL_WEIGHT = 0.6
+TITLE_WEIGHT = 0.25
+EXPERIENCE_WEIGHT = 0.15
+FULL_EXPERIENCE_YEARS = 5
+
+LOCAL = "local"
+LLM = "llm"
+
+
+@dataclass
+class PreScore:
+    score: float
+    explanation: str
+    skill_coverage: float
+    title_similarity: float
+    experience_years: float
+
+    @property
+    def decision(self):
+        """"reject", "accept" or None when the score falls in the uncertain band and needs the LLM."""
+        if self.score < settings.PRESCORE_REJECT_BELOW:
+            return "reject"
+        if self.score >= settings.PRESCORE_ACCEPT_FROM:
+            return "accept"
+        return None
+
+
+def _year(value, ongoing_year):
+    if not value:
+        return None
+    if ONGOING_RE.search(value):
+        return ongoing_year
+    match = YEAR_RE.search(value)
+    return int(match.group()) if match else None
+
+
+def experience_years(experiences) -> float:
+    current_year = datetime.utcnow().year
+    years = 0
+    for experience in experiences:
+        start = _year(experience.start_date, current_year)
+        end = _year(experience.end_date, current_year) or start
+        if start and end and end >= start:
+            years += max(end - start, 0.5)
+    return years
+
+
+def title_similarity(job_title: str, experiences) -> float:
+    job_tokens = set(tokenize(job_title))
+    if not job_tokens:
+        return 0.0
+    best = 0.0
+    for experience in experiences:
+        title_tokens = set(tokenize(experience.job_title))
+        if title_tokens:
+            best = max(best, len(job_tokens & title_tokens) / len(job_tokens | title_tokens))
+    return best
+
+
+async def prescore(db: AsyncSession, job: JobListing, candidate: Candidate):
+    """Cheap local estimate of the match score on the same 0-10 scale as the LLM.
+
+    Returns None when the job mentions no skills from the taxonomy, since
+    there is then nothing reliable to compare against.
+    """
+    matcher = await get_skill_matcher(db)
+    job_skill_ids = set(matcher.find_skill_ids(f"{job.title or ''}\n{job.description or ''}"))
+    if not job_skill_ids:
+        return None
+
+    candidate_skill_ids = set()
+    for skill in candidate.skills:
+        if skill.canonical_skill_id:
+            candidate_skill_ids.add(skill.canonical_skill_id)
+        else:
+            candidate_skill_ids.update(matcher.find_skill_ids(skill.skill or ""))
+
+    matched = job_skill_ids & candidate_skill_ids
+    coverage = len(matched) / len(job_skill_ids)
+    similarity = title_similarity(job.title, candidate.experiences)
+    years = experience_years(candidate.experiences)
+    score = 10 * (
+        SKILL_WEIGHT * coverage
+        + TITLE_WEIGHT * similarity
+        + EXPERIENCE_WEIGHT * min(years / FULL_EXPERIENCE_YEARS, 1)
+    )
+
+    matched_names = sorted(matcher.name(skill_id) or str(skill_id) for skill_id in matched)
+    missing_names = sorted(matcher.name(skill_id) or str(skill_id) for skill_id in job_skill_ids - matched)
+    explanation = (
+        f"Local pre-score: {len(matched)} of {len(job_skill_ids)} required skills matched"
+        + (f" ({', '.join(matched_names)})" if matched_names else "")
+        + (f"; missing {', '.join(missing_names)}" if missing_names else "")
+        + f"; title similarity {similarity:.2f}; about {years:g} years of experience."
+    )
+    return PreScore(round(score, 1), explanation, coverage, similarity, years)
+
+
+async def prescore_application(db: AsyncSession, job_id: int, candidate_id: int):
+    loader = get_loader(db)
+    job, candidate = await loader.job(job_id), await loader.candidate(candidate_id)
+    if job is None or candidate is None:
+        return None
+    return await prescore(db, job, candidate)
@@ -0,0 +1,161 @@
+import logging
+from datetime import datetime, timedelta
+
+from fastapi import UploadFile
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from config import settings
+from database import AsyncSessionLocal
+from models import ResumeParseJob
+from services import resume_service
+from utils.file_utils import save_upload
+from utils.worker_utils import WorkerPool, heartbeat
+
+logger = logging.getLogger(__name__)
+
+# Several beats per stale window, so a long parse is never mistaken for a dead worker
+HEARTBEAT_INTERVAL_SECONDS = settings.JOB_STALE_AFTER_SECONDS / 3
+
+
+async def enqueue_resume_job(file: UploadFile, db: AsyncSession) -> ResumeParseJob:
+    """Persist the upload and a queued parse job, then wake a worker."""
+    stored_filename, file_hash, _ = await save_upload(file)
+
+    job = ResumeParseJob(
+        filename=file.filename,
+        stored_filename=stored_filename,
+        file_hash=file_hash,
+        status="queued",
+        progress="queued",
+        attempts=0,
+        created_at=datetime.utcnow()
+    )
+    db.add(job)
+    await db.commit()
+    await db.refresh(job)
+
+    resume_job_workers.notify()
+    return job
+
+
+async def get_resume_job(db: AsyncSession, job_id: int):
+    return await db.get(ResumeParseJob, job_id)
+
+
+async def claim_next_job():
+    # SKIP LOCKED lets workers in every process claim jobs without blocking each other
+    async with AsyncSessionLocal() as db:
+        job = await db.scalar(
+            select(ResumeParseJob)
+            .where(ResumeParseJob.status == "queued")
+            .order_by(ResumeParseJob.job_id)
+            .limit(1)
+            .with_for_update(skip_locked=True)
+        )
+        if not job:
+            return None
+
+        now = datetime.utcnow()
+        job.status = "running"
+        job.progress = "starting"
+        job.attempts += 1
+        job.started_at = now
+        job.heartbeat_at = now
+        await db.commit()
+        return job.job_id
+
+
+async def run_job(job_id: int):
+    """Parse and submit one resume, heart-beating the job while PDF extraction and LLM calls run.
+
+    A resume that cannot be parsed (ValueError) fails at once. Anything else,
+    such as an LLM outage, puts the job back on the queue until
+    RESUME_JOB_MAX_ATTEMPTS is reached.
+    """
+    async with AsyncSessionLocal() as db:
+        job = await db.get(ResumeParseJob, job_id)
+        attempt = job.attempts
+        requeued = False
+        async with heartbeat(lambda: _touch(job_id, attempt), HEARTBEAT_INTERVAL_SECONDS):
+            try:
+                await _set_progress(db, job, "parsing")
+                parsed_data = await resume_service.retrieve_resume(job.stored_filename, db, pdf_hash=job.file_hash)
+                if not isinstance(parsed_data, dict) or not parsed_data or "error" in parsed_data:
+                    raise ValueError((parsed_data or {}).get("error", "Could not parse resume"))
+
+                await _set_progress(db, job, "submitting")
+                result = await resume_service.submit_resume(parsed_data, db)
+
+                job.status = "completed"
+                job.progress = "completed"
+                job.candidate_id = result["candidate_id"]
+                job.error = None
+            except Exception as e:
+                # Rolling back expires the row, so nothing below reads its attributes
+                await db.rollback()
+                job.error = str(e)
+                if not isinstance(e, ValueError) and attempt < settings.RESUME_JOB_MAX_ATTEMPTS:
+                    logger.warning("Resume parse job %s attempt %d failed, requeueing: %s", job_id, attempt, e)
+                    job.status = "queued"
+                    job.progress = "queued"
+                    requeued = True
+                else:
+                    logger.warning("Resume parse job %s failed: %s", job_id, e)
+                    job.status = "failed"
+                    job.progress = "failed"
+            if not requeued:
+                job.completed_at = datetime.utcnow()
+            await db.commit()
+        if requeued:
+            resume_job_workers.notify()
+
+
+async def _touch(job_id: int, attempt: int):
+    async with AsyncSessionLocal() as db:
+        await db.execute(
+            update(ResumeParseJob)
+            .where(ResumeParseJob.job_id == job_id, ResumeParseJob.attempts == attempt, ResumeParseJob.status == "running")
+            .values(heartbeat_at=datetime.utcnow())
+        )
+        await db.commit()
+
+
+async def _set_progress(db: AsyncSession, job: ResumeParseJob, progress: str):
+    job.progress = progress
+    job.heartbeat_at = datetime.utcnow()
+    await db.commit()
+
+
+async def requeue_stale_jobs():
+    """Put jobs whose worker stopped heart-beating (crash or restart) back on the queue."""
+    async with AsyncSessionLocal() as db:
+        cutoff = datetime.utcnow() - timedelta(seconds=settings.JOB_STALE_AFTER_SECONDS)
+        stale_jobs = (await db.scalars(
+            select(ResumeParseJob)
+            .where(ResumeParseJob.status == "running", ResumeParseJob.heartbeat_at < cutoff)
+            .with_for_update(skip_locked=True)
+        )).all()
+        for job in stale_jobs:
+            if job.attempts >= settings.RESUME_JOB_MAX_ATTEMPTS:
+                job.status = "failed"
+                job.progress = "failed"
+                job.error = "Job abandoned by its worker too many times"
+                job.completed_at = datetime.utcnow()
+            else:
+                job.status = "queued"
+                job.progress = "queued"
+        await db.commit()
+        if stale_jobs:
+            logger.info("Recovered %d stale resume parse jobs", len(stale_jobs))
+
+
+resume_job_workers = WorkerPool(
+    "resume-parse",
+    claim=claim_next_job,
+    process=run_job,
+    concurrency=settings.RESUME_JOB_WORKERS,
+    poll_interval=settings.JOB_POLL_INTERVAL_SECONDS,
+    recover=requeue_stale_jobs,
+    recover_interval=settings.JOB_STALE_AFTER_SECONDS / 2,
+)
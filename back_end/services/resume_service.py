@@ -2,34 +2,46 @@
 # print(f"__name__ is: {__name__}")
 
 from fastapi import UploadFile, Depends
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from utils import pdf_utils, db_utils
 from config import settings
 import os
 import json
-from langchain_openai import ChatOpenAI
+import asyncio
+import logging
 from langchain.prompts import PromptTemplate
 from models import Candidate, Contact, Address, Skill, Project, Experience, Education
 from database import get_db
 # from backend.backup_prompts import RESUME_PARSING_PROMPT
-from services import prompt_service
-from langchain.chains.llm import LLMChain
+from services import prompt_service, candidate_index_service
+from utils import llm_utils
+from utils.cache_utils import parsed_resume_cache, resume_cache_key, sha256_file, sha256_text
+from utils.file_utils import save_upload
+from utils import resume_text_utils
+from utils.json_stream import JSONStreamError
+from utils.entity_loader import get_loader
 
-async def upload_resume(file: UploadFile, db: Session):
-    file_location = os.path.join(settings.UPLOAD_FOLDER, file.filename)
+logger = logging.getLogger(__name__)
+
+
+class ResumeParseError(Exception):
+    """The model returned nothing usable for the resume or one of its chunks; retrying may succeed."""
+
+
+async def upload_resume(file: UploadFile, db: AsyncSession):
     try:
-        os.makedirs(settings.UPLOAD_FOLDER, exist_ok=True)
-        with open(file_location, "wb+") as file_object:
-            file_object.write(await file.read())
+        # Stream the upload to disk under a content-addressed name
+        stored_filename, pdf_hash, _ = await save_upload(file)
         
-        # Parse the uploaded resume
-        parsed_data = await retrieve_resume(file.filename, db)
+        # Parse the uploaded resume (served from the cache for re-uploads of the same PDF)
+        parsed_data = await retrieve_resume(stored_filename, db, pdf_hash=pdf_hash)
         
         # Submit the parsed data to create or update a candidate
         result = await submit_resume(parsed_data, db)
         
         return {
             "info": f"File '{file.filename}' uploaded successfully.",
+            "filename": stored_filename,
             "candidate_id": result["candidate_id"],
             "message": result["info"]
         }
@@ -40,85 +52,126 @@ async def upload_resume(file: UploadFile, db: Session):
 
 
 
-async def retrieve_resume(filename: str, db: Session):
+async def retrieve_resume(filename: str, db: AsyncSession, pdf_hash: str = None):
     file_location = os.path.join(settings.UPLOAD_FOLDER, filename)
     if not os.path.exists(file_location):
         return {"error": "File not found"}
 
-    pdf_text = pdf_utils.extract_text_from_pdf(file_location)
-    llm = ChatOpenAI(model="gpt-4-0125-preview", openai_api_key=settings.OPENAI_API_KEY)
-    
     # Fetch the prompt from the database
     resume_parsing_prompt = await prompt_service.get_prompt_by_name(db, "RESUME_PARSING_PROMPT")
     if not resume_parsing_prompt:
         return {"error": "Resume parsing prompt not found in the database"}
-    
-    print(f"Retrieved prompt: {resume_parsing_prompt.content}")
-    
+
+    # Same PDF bytes parsed with the same prompt always give the same result
+    if pdf_hash is None:
+        pdf_hash = await asyncio.to_thread(sha256_file, file_location)
+    cache_key = resume_cache_key(pdf_hash, resume_prompt_version(resume_parsing_prompt.content))
+    cached_data = await parsed_resume_cache.get_async(cache_key)
+    if cached_data is not None:
+        logger.info(f"Parsed resume cache hit for {filename}")
+        return cached_data
+
+    pdf_text = await pdf_utils.extract_text_from_pdf_async(file_location)
+    parsed_data = await parse_resume_text(pdf_text, resume_parsing_prompt.content)
+
+    if isinstance(parsed_data, dict) and parsed_data:
+        await parsed_resume_cache.set_async(cache_key, parsed_data)
+    return parsed_data
+
+
+def resume_prompt_version(prompt_content: str) -> str:
+    # Covers both the stored prompt and the local pre-extraction that shapes its input
+    return sha256_text(f"{resume_text_utils.PREPROCESSOR_VERSION}:{prompt_content}")
+
+
+async def parse_resume_text(pdf_text: str, prompt_content: str):
+    # Contacts and section boundaries are found locally; only the sections the
+    # prompt still needs are sent to the model
+    pre_extracted = resume_text_utils.pre_extract(pdf_text)
+
     resume_prompt_template = PromptTemplate(
         input_variables=["text"],
-        template=resume_parsing_prompt.content
+        template=prompt_content
     )
-    
-    final_prompt = resume_prompt_template.format(text=pdf_text)
-    response = llm(final_prompt)
-    
-    # print(f"Type of response: {type(response)}")
-    # print(f"Response: {response}")
-
-    if isinstance(response.content, str):
-        try:
-            # Clean response by stripping whitespace and removing backticks or any unnecessary characters
-            cleaned_response = response.content.strip().replace('"null"', 'null').replace('JSON', '').replace('json', '')
-            
-            # Remove any backticks if present in the LLM response
-            cleaned_response = cleaned_response.replace('```', '').strip()
-            
-            print("Original response content:", response.content)
-            print(f"Cleaned response: {cleaned_response}")
-            
-            # Ensure the cleaned response is not empty before attempting to parse
-            if cleaned_response:
-                parsed_data = json.loads(cleaned_response)
-            else:
-                print("Cleaned response is empty!")
-                parsed_data = {}  # Default to empty dict in case of empty response
-            
-        except json.JSONDecodeError as e:
-            print("JSON decoding error:", e)
-            print(f"Problematic response: {cleaned_response}")
-            parsed_data = {}  # Default to an empty dict in case of error
+
+    model_text = resume_text_utils.build_model_text(pre_extracted)
+    if resume_text_utils.count_tokens(model_text) <= settings.RESUME_PROMPT_TOKEN_BUDGET:
+        parsed_data = await _complete_resume_prompt(resume_prompt_template.format(text=model_text))
+        if not parsed_data:
+            raise ResumeParseError("Resume parsing returned no data")
     else:
-        parsed_data = response.content  # Assume it's already a dictionary
-    
-    print(f"Parsed data: {parsed_data}")
-    return parsed_data
+        # Long resumes are parsed as section-aligned chunks in parallel and merged,
+        # so latency follows the slowest chunk rather than the document length
+        chunks = resume_text_utils.chunk_model_text(pre_extracted, settings.RESUME_PROMPT_TOKEN_BUDGET)
+        logger.info(f"Resume text over token budget, parsing {len(chunks)} chunks")
+        chunk_results = await asyncio.gather(*(
+            _complete_resume_prompt(resume_prompt_template.format(text=chunk)) for chunk in chunks
+        ))
+        # A failed chunk would silently drop its sections, and the partial result would be cached for good
+        failed = sum(1 for result in chunk_results if not result)
+        if failed:
+            raise ResumeParseError(f"Resume parsing failed for {failed} of {len(chunks)} chunks")
+        parsed_data = resume_text_utils.merge_parsed_chunks(chunk_results)
+
+    return resume_text_utils.apply_local_fields(parsed_data, pre_extracted)
+
+
+async def _complete_resume_prompt(final_prompt: str):
+    # Streamed and validated as it arrives: malformed output is abandoned (and
+    # re-asked) at the first bad character instead of after the full completion
+    try:
+        parsed_data = await llm_utils.complete_json(final_prompt, purpose=llm_utils.RESUME_PARSING)
+    except JSONStreamError as e:
+        logger.warning(f"JSON decoding error: {e}")
+        return {}  # Default to an empty dict in case of error
+
+    if not isinstance(parsed_data, dict):
+        # Not the content itself: it is the candidate's personal data
+        logger.warning(f"Unexpected response shape: {type(parsed_data).__name__}")
+        return {}
+    return _null_strings_to_none(parsed_data)
 
 
+def _null_strings_to_none(value):
+    # The model sometimes writes "null" as a string
+    if isinstance(value, dict):
+        return {key: _null_strings_to_none(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [_null_strings_to_none(item) for item in value]
+    return None if value == "null" else value
 
-async def submit_resume(form_data: dict, db: Session):
+
+
+async def submit_resume(form_data: dict, db: AsyncSession):
     email = form_data.get("email")
     phone_number = form_data.get("phone_number")
 
     if email or phone_number:
-        existing_candidate = db_utils.get_existing_candidate(db, email, phone_number)
+        existing_candidate = await db_utils.get_existing_candidate(db, email, phone_number)
         if existing_candidate:
             candidate_id = existing_candidate[0]
-            db_utils.update_candidate(db, candidate_id, form_data)
+            await db_utils.update_candidate(db, candidate_id, form_data)
+            await candidate_index_service.index_candidate(db, candidate_id)
             return {"info": f"Resume for email '{email}' updated successfully", "candidate_id": candidate_id}
         else:
-            candidate_id = db_utils.insert_candidate(db, form_data)
+            candidate_id = await db_utils.insert_candidate(db, form_data)
+            await candidate_index_service.index_candidate(db, candidate_id)
             return {"info": f"New candidate inserted successfully", "candidate_id": candidate_id}
     else:
-        candidate_id = db_utils.insert_candidate(db, form_data)
+        candidate_id = await db_utils.insert_candidate(db, form_data)
+        await candidate_index_service.index_candidate(db, candidate_id)
         return {"info": "New candidate inserted successfully", "candidate_id": candidate_id}
 
 
-async def get_parsed_resume(db: Session, candidate_id: int) -> dict:
-    candidate = db.query(Candidate).filter(Candidate.candidate_id == candidate_id).first()
+async def get_parsed_resume(db: AsyncSession, candidate_id: int) -> dict:
+    candidate = await get_loader(db).candidate(candidate_id)
     if not candidate:
         return None
+    return serialize_parsed_resume(candidate)
+
 
+def serialize_parsed_resume(candidate: Candidate) -> dict:
+    """The parsed-resume dict for a loaded candidate, in the shape the matching prompt expects."""
     parsed_resume = {
         "name": candidate.name or None,
         "email": None,
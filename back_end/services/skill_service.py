@@ -0,0 +1,102 @@
+from fastapi import HTTPException
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
+
+from models import CanonicalSkill, SkillAlias, SkillAliasDeletion, Skill
+from schemas import CanonicalSkillCreate, SkillAliasCreate
+from utils.skill_matcher import get_skill_matcher, normalize_skill_text, skill_matcher
+
+
+# Create a canonical skill; its own name is always registered as an alias
+async def create_canonical_skill(db: AsyncSession, skill: CanonicalSkillCreate):
+    if await db.scalar(select(CanonicalSkill).where(CanonicalSkill.name == skill.name)):
+        raise HTTPException(status_code=400, detail="Skill already exists")
+
+    db_skill = CanonicalSkill(name=skill.name, category=skill.category)
+    db.add(db_skill)
+    await db.flush()
+
+    aliases = []
+    for alias in [skill.name] + skill.aliases:
+        alias = normalize_skill_text(alias)
+        if alias and alias not in aliases:
+            aliases.append(alias)
+    await _ensure_aliases_free(db, aliases)
+    for alias in aliases:
+        db.add(SkillAlias(canonical_skill_id=db_skill.canonical_skill_id, alias=alias))
+
+    await db.commit()
+    await db.refresh(db_skill, ["aliases"])
+    for db_alias in db_skill.aliases:
+        skill_matcher.add_alias(db_alias.alias_id, db_alias.alias, db_skill.canonical_skill_id, db_skill.name)
+    return db_skill
+
+
+async def get_canonical_skills(db: AsyncSession):
+    return (await db.scalars(
+        select(CanonicalSkill).options(selectinload(CanonicalSkill.aliases)).order_by(CanonicalSkill.name)
+    )).all()
+
+
+async def add_alias(db: AsyncSession, canonical_skill_id: int, alias: SkillAliasCreate):
+    db_skill = await db.get(CanonicalSkill, canonical_skill_id)
+    if not db_skill:
+        raise HTTPException(status_code=404, detail="Skill not found")
+
+    normalized = normalize_skill_text(alias.alias)
+    await _ensure_aliases_free(db, [normalized])
+    db_alias = SkillAlias(canonical_skill_id=canonical_skill_id, alias=normalized)
+    db.add(db_alias)
+    await db.commit()
+    await db.refresh(db_alias)
+    skill_matcher.add_alias(db_alias.alias_id, db_alias.alias, canonical_skill_id, db_skill.name)
+    return db_alias
+
+
+async def delete_alias(db: AsyncSession, alias_id: int):
+    db_alias = await db.get(SkillAlias, alias_id)
+    if db_alias:
+        await db.delete(db_alias)
+        db.add(SkillAliasDeletion(alias_id=alias_id))
+        await db.commit()
+        skill_matcher.remove_alias(alias_id)
+        return True
+    return False
+
+
+async def delete_canonical_skill(db: AsyncSession, canonical_skill_id: int):
+    db_skill = await db.get(CanonicalSkill, canonical_skill_id)
+    if not db_skill:
+        return False
+    # Candidate skill rows keep their free text and simply lose the link
+    await db.execute(
+        update(Skill).where(Skill.canonical_skill_id == canonical_skill_id).values(canonical_skill_id=None),
+        execution_options={"synchronize_session": False},
+    )
+    alias_ids = (await db.execute(
+        select(SkillAlias.alias_id).where(SkillAlias.canonical_skill_id == canonical_skill_id)
+    )).scalars().all()
+    await db.delete(db_skill)
+    db.add_all(SkillAliasDeletion(alias_id=alias_id) for alias_id in alias_ids)
+    await db.commit()
+    skill_matcher.remove_canonical_skill(canonical_skill_id)
+    return True
+
+
+async def extract_skills(db: AsyncSession, text: str):
+    matcher = await get_skill_matcher(db)
+    return [
+        {"canonical_skill_id": skill_id, "name": matcher.name(skill_id)}
+        for skill_id in matcher.find_skill_ids(text)
+    ]
+
+
+async def _ensure_aliases_free(db: AsyncSession, aliases):
+    taken = (await db.execute(select(SkillAlias.alias).where(SkillAlias.alias.in_(aliases)))).all()
+    if taken:
+        await db.rollback()
+        raise HTTPException(
+            status_code=400,
+            detail=f"Alias already in use: {', '.join(alias for (alias,) in taken)}"
+        )
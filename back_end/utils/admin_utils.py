@@ -2,7 +2,8 @@ import os
 from dotenv import load_dotenv
 from database import get_db
 from fastapi import Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from jose import JWTError, jwt
 from datetime import datetime, timedelta
 from fastapi.security import OAuth2PasswordBearer
@@ -43,8 +44,8 @@ def create_access_token(user: User, expires_delta: timedelta = None):
     return encoded_jwt
 
 
-def get_current_user(
-    token: str = Depends(oauth2_scheme), db: Session = Depends(get_db)
+async def get_current_user(
+    token: str = Depends(oauth2_scheme), db: AsyncSession = Depends(get_db)
 ):
     credentials_exception = HTTPException(
         status_code=status.HTTP_403_FORBIDDEN,
@@ -61,15 +62,15 @@ def get_current_user(
         raise credentials_exception
 
     # Query the user (could be admin or normal user)
-    user = db.query(User).filter(User.username == username).first()
+    user = await db.scalar(select(User).where(User.username == username))
     if user is None or user.is_deleted:
         raise credentials_exception
 
     return user
 
 
-def get_current_admin(
-    token: str = Depends(oauth2_scheme), db: Session = Depends(get_db)
+async def get_current_admin(
+    token: str = Depends(oauth2_scheme), db: AsyncSession = Depends(get_db)
 ):
     credentials_exception = HTTPException(
         status_code=status.HTTP_403_FORBIDDEN,
@@ -88,7 +89,7 @@ def get_current_admin(
     except JWTError:
         raise credentials_exception
 
-    user = db.query(User).filter(User.id == user_id).first()
+    user = await db.get(User, user_id)
     if user is None or role != "admin":  # Check if the user exists and has admin role
         raise credentials_exception
 
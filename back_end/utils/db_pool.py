@@ -0,0 +1,80 @@
+import time
+
+from sqlalchemy import exc
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+
+from utils.metrics import registry
+
+# Checkouts normally take microseconds; anything in the upper buckets means the pool is saturated
+POOL_WAIT_BUCKETS = (0.001, 0.005, 0.01, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+
+DB_POOL_CHECKOUT_WAIT = registry.histogram(
+    "db_pool_checkout_wait_seconds", "Time to check out a connection, including opening a new one",
+    ("pool",), buckets=POOL_WAIT_BUCKETS
+)
+DB_POOL_OVERFLOW_EVENTS = registry.counter(
+    "db_pool_overflow_total", "Connections opened beyond pool_size", ("pool",)
+)
+DB_POOL_TIMEOUTS = registry.counter(
+    "db_pool_timeouts_total", "Checkouts that gave up after pool_timeout", ("pool",)
+)
+DB_POOL_SIZE = registry.gauge("db_pool_size", "Configured pool_size", ("pool",))
+DB_POOL_CHECKED_OUT = registry.gauge("db_pool_checked_out", "Connections currently in use", ("pool",))
+DB_POOL_IDLE = registry.gauge("db_pool_idle", "Open connections waiting in the pool", ("pool",))
+DB_POOL_OVERFLOW = registry.gauge("db_pool_overflow", "Overflow connections currently open", ("pool",))
+
+_engines = {}  # pool label -> engine
+
+
+class _InstrumentedPoolMixin:
+    """Records checkout waits, timeouts and overflow growth, labelled with the pool's logging name."""
+
+    @property
+    def _metrics_label(self):
+        return self._orig_logging_name or "default"
+
+    def connect(self):
+        # Timed here rather than in _do_get, which QueuePool calls recursively when it retries
+        # overflow, so one checkout would be observed (and its timeout counted) more than once
+        started = time.perf_counter()
+        try:
+            return super().connect()
+        except exc.TimeoutError:
+            DB_POOL_TIMEOUTS.inc(pool=self._metrics_label)
+            raise
+        finally:
+            DB_POOL_CHECKOUT_WAIT.observe(time.perf_counter() - started, pool=self._metrics_label)
+
+    def _inc_overflow(self):
+        # _overflow counts up from -pool_size, so only positive values are real overflow
+        created = super()._inc_overflow()
+        if created and self._overflow > 0:
+            DB_POOL_OVERFLOW_EVENTS.inc(pool=self._metrics_label)
+        return created
+
+
+class InstrumentedQueuePool(_InstrumentedPoolMixin, QueuePool):
+    pass
+
+
+class InstrumentedAsyncQueuePool(_InstrumentedPoolMixin, AsyncAdaptedQueuePool):
+    pass
+
+
+def track_engine(label: str, engine):
+    """Report the engine's pool gauges on every metrics render."""
+    _engines[label] = engine
+
+
+def _collect_pool_gauges():
+    for label, engine in _engines.items():
+        pool = getattr(engine, "sync_engine", engine).pool  # Read each time: dispose() swaps the pool
+        if not isinstance(pool, QueuePool):
+            continue
+        DB_POOL_SIZE.set(pool.size(), pool=label)
+        DB_POOL_CHECKED_OUT.set(pool.checkedout(), pool=label)
+        DB_POOL_IDLE.set(pool.checkedin(), pool=label)
+        DB_POOL_OVERFLOW.set(max(pool.overflow(), 0), pool=label)
+
+
+registry.add_collector(_collect_pool_gauges)
@@ -0,0 +1,104 @@
+import asyncio
+import logging
+import random
+import time
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from config import settings
+from utils.metrics import registry
+
+logger = logging.getLogger(__name__)
+
+# Seconds of replay lag. A standby that has replayed everything it received is current even when the
+# primary has been idle, and a server that is not in recovery at all (a plain second instance) never lags.
+REPLICA_LAG_SQL = text(
+    "SELECT CASE WHEN NOT pg_is_in_recovery() OR pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0 "
+    "ELSE EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()) END"
+)
+
+DB_REPLICA_LAG = registry.gauge(
+    "db_replica_lag_seconds", "Replication lag at the last check, -1 when the replica could not be checked", ("pool",)
+)
+DB_READ_SESSIONS = registry.counter(
+    "db_read_sessions_total", "Read-only sessions by the database their queries were routed to", ("target",)
+)
+
+
+class RoutingSession(Session):
+    """Sends the queries of a read-only session to the replica stored in `info["replica"]`.
+
+    Without a replica every query goes to the bound primary. The first write
+    (a flush, an INSERT/UPDATE/DELETE or a SELECT ... FOR UPDATE) drops the
+    replica, so the write and every read after it in the same session see
+    the primary.
+    """
+
+    def get_bind(self, mapper=None, clause=None, **kw):
+        replica = self.info.get("replica")
+        if replica is not None:
+            writes = self._flushing or (
+                clause is not None and (getattr(clause, "is_dml", False) or getattr(clause, "_for_update_arg", None) is not None)
+            )
+            if not writes:
+                return replica
+            del self.info["replica"]
+        return super().get_bind(mapper=mapper, clause=clause, **kw)
+
+
+class ReplicaSet:
+    """Async replica engines with their replication lag, rechecked every DB_REPLICA_CHECK_INTERVAL_SECONDS.
+
+    A replica is used only while its last check succeeded with a lag within
+    DB_REPLICA_MAX_LAG_SECONDS. One request runs the checks; concurrent
+    requests route on the previous results instead of waiting for it.
+    """
+
+    def __init__(self, engines: dict):
+        self.engines = engines  # pool label -> async engine
+        self._lags = {}
+        self._checked_at = None
+        self._lock = asyncio.Lock()
+
+    async def _check(self, label, engine):
+        try:
+            async with engine.connect() as connection:
+                lag = await asyncio.wait_for(
+                    connection.scalar(REPLICA_LAG_SQL), settings.DB_REPLICA_CHECK_TIMEOUT_SECONDS
+                )
+            lag = None if lag is None else float(lag)
+        except Exception as e:
+            logger.warning(f"Replica {label} lag check failed: {e}")
+            lag = None
+        DB_REPLICA_LAG.set(-1 if lag is None else lag, pool=label)
+        self._lags[label] = lag
+
+    async def _refresh(self):
+        if self._lock.locked():
+            return
+        async with self._lock:
+            due = self._checked_at is None or time.monotonic() - self._checked_at >= settings.DB_REPLICA_CHECK_INTERVAL_SECONDS
+            if not due:
+                return
+            await asyncio.gather(*(self._check(label, engine) for label, engine in self.engines.items()))
+            self._checked_at = time.monotonic()
+
+    async def pick(self):
+        """An engine for one replica within the lag tolerance, or None to read from the primary."""
+        if not self.engines:
+            return None
+        await self._refresh()
+        current = [
+            label for label, lag in self._lags.items()
+            if lag is not None and lag <= settings.DB_REPLICA_MAX_LAG_SECONDS
+        ]
+        return self.engines[random.choice(current)] if current else None
+
+    async def route(self, db: AsyncSession):
+        """Point the session's reads at a current replica when there is one."""
+        engine = await self.pick()
+        if engine is not None:
+            db.info["replica"] = engine.sync_engine
+        DB_READ_SESSIONS.inc(target="replica" if engine is not None else "primary")
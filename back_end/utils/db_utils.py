@@ -1,19 +1,27 @@
-from sqlalchemy import text
+from sqlalchemy import text, bindparam, select
+from sqlalchemy.orm import selectinload
 from models import Candidate
+from utils.skill_matcher import get_skill_matcher
+from utils.entity_loader import get_loader
+from collections import defaultdict
 import uuid
 from datetime import datetime, timedelta
 
 def sanitize_value(value):
     return None if value == "null" else value
 
-def get_existing_candidate(db, email, phone_number):
-    return db.execute(
+async def get_existing_candidate(db, email, phone_number):
+    return (await db.execute(
         text("""SELECT candidate_id FROM contact WHERE email_address = :email OR phone_number = :phone_number"""),
         {"email": email, "phone_number": phone_number}
-    ).fetchone()
+    )).fetchone()
 
-def update_candidate(db, candidate_id, form_data):
-    candidate = db.query(Candidate).filter(Candidate.candidate_id == candidate_id).first()
+async def update_candidate(db, candidate_id, form_data):
+    candidate = await db.scalar(
+        select(Candidate)
+        .options(selectinload(Candidate.contacts))
+        .where(Candidate.candidate_id == candidate_id)
+    )
     if candidate.name != form_data.get("name"):
         candidate.name = sanitize_value(form_data.get("name"))
 
@@ -22,7 +30,7 @@ def update_candidate(db, candidate_id, form_data):
         contact.email_address = sanitize_value(form_data.get("email"))
         contact.phone_number = sanitize_value(form_data.get("phone_number"))
     else:
-        db.execute(
+        await db.execute(
             text("INSERT INTO contact (candidate_id, email_address, phone_number) VALUES (:candidate_id, :email, :phone)"),
             {
                 "candidate_id": candidate_id,
@@ -31,19 +39,19 @@ def update_candidate(db, candidate_id, form_data):
             }
         )
 
-    update_skills(db, candidate_id, form_data.get("skills", ""))
-    update_experiences(db, candidate_id, form_data.get("experiences", []))
-    update_projects(db, candidate_id, form_data.get("projects", []))
-    update_education(db, candidate_id, form_data.get("education", {}))
+    await update_skills(db, candidate_id, form_data.get("skills", ""))
+    await update_experiences(db, candidate_id, form_data.get("experiences", []))
+    await update_projects(db, candidate_id, form_data.get("projects", []))
+    await update_education(db, candidate_id, form_data.get("education", {}))
 
-    db.commit()
+    await db.commit()
 
-def insert_candidate(db, form_data):
+async def insert_candidate(db, form_data):
     new_candidate = Candidate(name=sanitize_value(form_data.get("name")))
     db.add(new_candidate)
-    db.flush()
+    await db.flush()
 
-    db.execute(
+    await db.execute(
         text("INSERT INTO contact (candidate_id, email_address, phone_number) VALUES (:candidate_id, :email, :phone)"),
         {
             "candidate_id": new_candidate.candidate_id,
@@ -52,98 +60,125 @@ def insert_candidate(db, form_data):
         }
     )
 
-    update_skills(db, new_candidate.candidate_id, form_data.get("skills", ""))
-    update_experiences(db, new_candidate.candidate_id, form_data.get("experiences", []))
-    update_projects(db, new_candidate.candidate_id, form_data.get("projects", []))
-    update_education(db, new_candidate.candidate_id, form_data.get("education", {}))
+    # A fresh candidate has no child rows yet, so skip the diff lookups
+    await update_skills(db, new_candidate.candidate_id, form_data.get("skills", ""), new_candidate=True)
+    await update_experiences(db, new_candidate.candidate_id, form_data.get("experiences", []), new_candidate=True)
+    await update_projects(db, new_candidate.candidate_id, form_data.get("projects", []), new_candidate=True)
+    await update_education(db, new_candidate.candidate_id, form_data.get("education", {}), new_candidate=True)
 
-    db.commit()
+    await db.commit()
     return new_candidate.candidate_id
 
-def update_skills(db, candidate_id, skills):
-    db.execute(
-        text("DELETE FROM skills WHERE candidate_id = :candidate_id"),
-        {"candidate_id": candidate_id}
-    )
-    skills_list = skills.split(",") if skills != "null" else []
-    for skill in skills_list:
-        db.execute(
-            text("INSERT INTO skills (candidate_id, skill) VALUES (:candidate_id, :skill)"),
-            {
-                "candidate_id": candidate_id,
-                "skill": skill.strip() if skill.strip() else None
-            }
+async def sync_child_rows(db, table, id_column, candidate_id, columns, rows, new_candidate=False):
+    """Bring a candidate's rows in `table` in line with `rows` using at most three statements.
+
+    Rows are matched on their column values, so unchanged rows are left
+    untouched. Stale rows are removed with a single DELETE and new rows are
+    written with a single executemany INSERT. `table`, `id_column` and
+    `columns` must be trusted identifiers, never user input.
+    """
+    existing_ids = defaultdict(list)
+    if not new_candidate:
+        existing = (await db.execute(
+            text(f"SELECT {id_column}, {', '.join(columns)} FROM {table} WHERE candidate_id = :candidate_id"),
+            {"candidate_id": candidate_id}
+        )).fetchall()
+        for row in existing:
+            existing_ids[tuple(row[1:])].append(row[0])
+
+    new_rows = []
+    for row in rows:
+        key = tuple(row.get(column) for column in columns)
+        if existing_ids[key]:
+            existing_ids[key].pop()
+        else:
+            new_rows.append({"candidate_id": candidate_id, **dict(zip(columns, key))})
+
+    stale_ids = [row_id for row_ids in existing_ids.values() for row_id in row_ids]
+    if stale_ids:
+        await db.execute(
+            text(f"DELETE FROM {table} WHERE {id_column} IN :ids").bindparams(bindparam("ids", expanding=True)),
+            {"ids": stale_ids}
         )
+    if new_rows:
+        await db.execute(
+            text(f"INSERT INTO {table} (candidate_id, {', '.join(columns)}) "
+                 f"VALUES (:candidate_id, {', '.join(':' + column for column in columns)})"),
+            new_rows
+        )
+
+async def update_skills(db, candidate_id, skills, new_candidate=False):
+    if isinstance(skills, str):
+        skills_list = skills.split(",") if skills != "null" else []
+    else:
+        skills_list = skills or []
+    matcher = await get_skill_matcher(db)
+    rows = [
+        {
+            "skill": skill.strip() if skill.strip() else None,
+            "canonical_skill_id": matcher.normalize(skill)
+        }
+        for skill in skills_list
+    ]
+    await sync_child_rows(db, "skills", "skill_id", candidate_id, ["skill", "canonical_skill_id"], rows, new_candidate)
 
-def update_experiences(db, candidate_id, experiences):
+async def update_experiences(db, candidate_id, experiences, new_candidate=False):
     if isinstance(experiences, list):
-        db.execute(
-            text("DELETE FROM experiences WHERE candidate_id = :candidate_id"),
-            {"candidate_id": candidate_id}
+        rows = [
+            {
+                "job_title": sanitize_value(exp.get("job_title")),
+                "company_name": sanitize_value(exp.get("company_name")),
+                "start_date": sanitize_value(exp.get("start_date")),
+                "end_date": sanitize_value(exp.get("end_date"))
+            }
+            for exp in experiences
+        ]
+        await sync_child_rows(
+            db, "experiences", "experience_id", candidate_id,
+            ["job_title", "company_name", "start_date", "end_date"], rows, new_candidate
         )
-        for exp in experiences:
-            db.execute(
-                text("INSERT INTO experiences (candidate_id, job_title, company_name, start_date, end_date) "
-                     "VALUES (:candidate_id, :job_title, :company_name, :start_date, :end_date)"),
-                {
-                    "candidate_id": candidate_id,
-                    "job_title": sanitize_value(exp.get("job_title")),
-                    "company_name": sanitize_value(exp.get("company_name")),
-                    "start_date": sanitize_value(exp.get("start_date")),
-                    "end_date": sanitize_value(exp.get("end_date"))
-                }
-            )
-
-def update_projects(db, candidate_id, projects):
+
+async def update_projects(db, candidate_id, projects, new_candidate=False):
     if isinstance(projects, list):
-        db.execute(
-            text("DELETE FROM projects WHERE candidate_id = :candidate_id"),
-            {"candidate_id": candidate_id}
-        )
-        for project in projects:
-            db.execute(
-                text("INSERT INTO projects (candidate_id, name, description) VALUES (:candidate_id, :name, :description)"),
-                {
-                    "candidate_id": candidate_id,
-                    "name": sanitize_value(project.get("name")),
-                    "description": sanitize_value(project.get("description"))
-                }
-            )
-
-def update_education(db, candidate_id, education):
-    if isinstance(education, dict):
-        db.execute(
-            text("DELETE FROM education WHERE candidate_id = :candidate_id"),
-            {"candidate_id": candidate_id}
-        )
-        db.execute(
-            text("INSERT INTO education (candidate_id, degree, institution, start_date, end_date) "
-                 "VALUES (:candidate_id, :degree, :institution, :start_date, :end_date)"),
+        rows = [
             {
-                "candidate_id": candidate_id,
-                "degree": sanitize_value(education.get("degree")),
-                "institution": sanitize_value(education.get("institution")),
-                "start_date": sanitize_value(education.get("start_date")),
-                "end_date": sanitize_value(education.get("end_date"))
+                "name": sanitize_value(project.get("name")),
+                "description": sanitize_value(project.get("description"))
             }
+            for project in projects
+        ]
+        await sync_child_rows(db, "projects", "project_id", candidate_id, ["name", "description"], rows, new_candidate)
+
+async def update_education(db, candidate_id, education, new_candidate=False):
+    if isinstance(education, dict):
+        rows = [{
+            "degree": sanitize_value(education.get("degree")),
+            "institution": sanitize_value(education.get("institution")),
+            "start_date": sanitize_value(education.get("start_date")),
+            "end_date": sanitize_value(education.get("end_date"))
+        }]
+        await sync_child_rows(
+            db, "education", "education_id", candidate_id,
+            ["degree", "institution", "start_date", "end_date"], rows, new_candidate
         )
 
-def get_candidate_details(db, candidate_id):
-    candidate = db.query(Candidate).filter(Candidate.candidate_id == candidate_id).first()
+async def get_candidate_details(db, candidate_id):
+    candidate = await get_loader(db).candidate(candidate_id)
     if candidate and candidate.contacts:
         return candidate.contacts[0].email_address, candidate.name
     return None, None
 
-def generate_candidate_link(db, candidate_id):
+async def generate_candidate_link(db, candidate_id):
+    # Flushed, not committed: the caller commits the token with the rest of its transaction
     token = str(uuid.uuid4())
     expiration_time_utc = datetime.utcnow() + timedelta(minutes=30)
 
-    candidate = db.query(Candidate).filter(Candidate.candidate_id == candidate_id).first()
+    candidate = await get_loader(db).candidate(candidate_id)
     if candidate:
         candidate.interview_token = token
         candidate.token_expiry = expiration_time_utc
         candidate.is_valid = True
         candidate.is_interviewed = False
-        db.commit()
+        await db.flush()
 
-    return token, expiration_time_utc
\ No newline at end of file
+    return token, expiration_time_utc
\ No newline at end of file
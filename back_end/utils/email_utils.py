@@ -1,22 +1,160 @@
+import logging
 import smtplib
+import threading
+import time
+from datetime import datetime
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
 from config import settings
+from models import EmailOutbox
 
-def send_interview_email(to_email, subject, body):
+logger = logging.getLogger(__name__)
+
+
+def build_message(to_email, subject, body) -> MIMEMultipart:
     msg = MIMEMultipart()
     msg['From'] = settings.FROM_EMAIL
     msg['To'] = to_email
     msg['Subject'] = subject
 
     msg.attach(MIMEText(body, 'plain'))
+    return msg
+
+
+def queue_email(db, to_email, subject, body) -> EmailOutbox:
+    """Add an email to the outbox. It is only sent once the caller's transaction commits."""
+    email = EmailOutbox(
+        to_email=to_email,
+        subject=subject,
+        body=body,
+        status="pending",
+        attempts=0,
+        created_at=datetime.utcnow(),
+        next_attempt_at=datetime.utcnow()
+    )
+    db.add(email)
+    return email
+
+
+class SMTPConnectionPool:
+    """Authenticated SMTP connections kept open and reused across sends.
+
+    All methods block, so async callers run them with `asyncio.to_thread`.
+    Connections idle for longer than SMTP_MAX_IDLE_SECONDS are checked with
+    NOOP before reuse, since servers drop idle sessions.
+    """
+
+    def __init__(self, size: int):
+        self._idle = []  # (connection, released_at)
+        self._available = threading.BoundedSemaphore(size)
+        self._lock = threading.Lock()
+
+    def _connect(self):
+        if settings.SMTP_USE_SSL:
+            server = smtplib.SMTP_SSL(settings.SMTP_HOST, settings.SMTP_PORT, timeout=settings.SMTP_TIMEOUT_SECONDS)
+        else:
+            server = smtplib.SMTP(settings.SMTP_HOST, settings.SMTP_PORT, timeout=settings.SMTP_TIMEOUT_SECONDS)
+            if settings.SMTP_STARTTLS:
+                server.starttls()
+        # Local stand-ins (e.g. `python -m aiosmtpd -n`) accept mail without logging in
+        if settings.EMAIL_PASSWORD:
+            server.login(settings.SMTP_USERNAME or settings.FROM_EMAIL, settings.EMAIL_PASSWORD)
+        return server
+
+    def acquire(self):
+        self._available.acquire()
+        try:
+            while True:
+                with self._lock:
+                    connection, released_at = self._idle.pop() if self._idle else (None, None)
+                if connection is None:
+                    return self._connect()
+                if time.monotonic() - released_at < settings.SMTP_MAX_IDLE_SECONDS:
+                    return connection
+                try:
+                    if connection.noop()[0] == 250:
+                        return connection
+                except (smtplib.SMTPException, OSError):
+                    pass
+                self._close(connection)
+        except Exception:
+            self._available.release()
+            raise
 
+    def release(self, connection, broken: bool = False):
+        if broken:
+            self._close(connection)
+        else:
+            with self._lock:
+                self._idle.append((connection, time.monotonic()))
+        self._available.release()
+
+    def close_all(self):
+        with self._lock:
+            idle, self._idle = self._idle, []
+        for connection, _ in idle:
+            self._close(connection)
+
+    @staticmethod
+    def _close(connection):
+        try:
+            connection.quit()
+        except Exception:
+            connection.close()
+
+
+smtp_pool = SMTPConnectionPool(settings.SMTP_POOL_SIZE)
+
+
+def send_batch(messages):
+    """Send `(to_email, subject, body)` messages over one pooled connection.
+
+    Returns one error string (or None on success) per message. A dropped
+    connection is replaced once and the remaining messages continue on the
+    new one.
+    """
+    errors = []
+    connection = None
     try:
-        with smtplib.SMTP('smtp.gmail.com', 587) as server:
-            server.starttls()
-            server.login(settings.FROM_EMAIL, settings.EMAIL_PASSWORD)
-            text = msg.as_string()
-            server.sendmail(settings.FROM_EMAIL, to_email, text)
-            print(f"Email sent to {to_email}")
-    except Exception as e:
-        print(f"Error sending email: {e}")
\ No newline at end of file
+        for to_email, subject, body in messages:
+            msg = build_message(to_email, subject, body)
+            for attempt in range(2):
+                try:
+                    if connection is None:
+                        connection = smtp_pool.acquire()
+                except (smtplib.SMTPException, OSError) as e:
+                    # Could not connect or log in
+                    if attempt:
+                        errors.append(f"SMTP connection failed: {e}")
+                    continue
+                try:
+                    connection.sendmail(settings.FROM_EMAIL, to_email, msg.as_string())
+                    errors.append(None)
+                    break
+                except smtplib.SMTPServerDisconnected as e:
+                    smtp_pool.release(connection, broken=True)
+                    connection = None
+                    if attempt:
+                        errors.append(f"SMTP connection failed: {e}")
+                except smtplib.SMTPException as e:
+                    # Rejected recipient or message; the connection itself is still usable
+                    errors.append(f"SMTP error: {e}")
+                    break
+                except OSError as e:
+                    smtp_pool.release(connection, broken=True)
+                    connection = None
+                    if attempt:
+                        errors.append(f"SMTP connection failed: {e}")
+    finally:
+        if connection is not None:
+            smtp_pool.release(connection)
+    return errors
+
+
+def send_interview_email(to_email, subject, body):
+    """Send one email immediately. Request handlers should use `queue_email` instead."""
+    error = send_batch([(to_email, subject, body)])[0]
+    if error:
+        print(f"Error sending email: {error}")
+    else:
+        print(f"Email sent to {to_email}")
@@ -0,0 +1,73 @@
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
+
+from models import Candidate, JobListing
+
+# Everything the services read from a candidate: parsed resume, pre-score, interview email
+CANDIDATE_LOAD_OPTIONS = (
+    selectinload(Candidate.contacts),
+    selectinload(Candidate.skills),
+    selectinload(Candidate.educations),
+    selectinload(Candidate.projects),
+    selectinload(Candidate.experiences),
+)
+
+
+class EntityLoader:
+    """Memoized, batched job and candidate loads shared by every service using one session.
+
+    A session lives for one request (or one worker task), so the loader does
+    too: the first service to ask for a row loads it, with the relationships
+    the other services need, and later lookups in the same session are free.
+    Misses are remembered as None. Call `forget` after deleting rows.
+    """
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+        self._jobs = {}
+        self._candidates = {}
+
+    async def jobs(self, job_ids) -> dict:
+        missing = [job_id for job_id in dict.fromkeys(job_ids) if job_id not in self._jobs]
+        if missing:
+            found = {
+                job.job_id: job
+                for job in await self.db.scalars(select(JobListing).where(JobListing.job_id.in_(missing)))
+            }
+            for job_id in missing:
+                self._jobs[job_id] = found.get(job_id)
+        return {job_id: self._jobs[job_id] for job_id in job_ids}
+
+    async def job(self, job_id: int):
+        return (await self.jobs([job_id]))[job_id]
+
+    async def candidates(self, candidate_ids) -> dict:
+        missing = [candidate_id for candidate_id in dict.fromkeys(candidate_ids) if candidate_id not in self._candidates]
+        if missing:
+            found = {
+                candidate.candidate_id: candidate
+                for candidate in await self.db.scalars(
+                    select(Candidate)
+                    .options(*CANDIDATE_LOAD_OPTIONS)
+                    .where(Candidate.candidate_id.in_(missing))
+                )
+            }
+            for candidate_id in missing:
+                self._candidates[candidate_id] = found.get(candidate_id)
+        return {candidate_id: self._candidates[candidate_id] for candidate_id in candidate_ids}
+
+    async def candidate(self, candidate_id: int):
+        return (await self.candidates([candidate_id]))[candidate_id]
+
+    def forget(self):
+        self._jobs.clear()
+        self._candidates.clear()
+
+
+def get_loader(db: AsyncSession) -> EntityLoader:
+    """The loader for this session, created on first use and kept in `db.info`."""
+    loader = db.info.get("entity_loader")
+    if loader is None:
+        loader = db.info["entity_loader"] = EntityLoader(db)
+    return loader
@@ -0,0 +1,108 @@
+import hashlib
+import os
+import uuid
+import zipfile
+
+from fastapi import UploadFile
+
+from config import settings
+
+
+async def save_upload(file: UploadFile, folder: str = None, max_bytes: int = None):
+    """Stream an upload to disk in fixed-size chunks, hashing it on the way.
+
+    The file is written to a unique temporary path and atomically renamed to
+    `<sha256><ext>` once complete, so concurrent uploads never clobber each
+    other and identical files share one copy. Returns
+    `(stored_filename, sha256, size_in_bytes)`.
+    """
+    folder = folder or settings.UPLOAD_FOLDER
+    max_bytes = max_bytes or settings.MAX_UPLOAD_SIZE_MB * 1024 * 1024
+    os.makedirs(folder, exist_ok=True)
+
+    # Reject early when the multipart parser already knows the size
+    if file.size is not None and file.size > max_bytes:
+        raise ValueError(f"File '{file.filename}' exceeds the {settings.MAX_UPLOAD_SIZE_MB} MB upload limit")
+
+    extension = os.path.splitext(file.filename or "")[1].lower() or ".pdf"
+    tmp_path = os.path.join(folder, f".{uuid.uuid4().hex}.part")
+    digest = hashlib.sha256()
+    size = 0
+    try:
+        with open(tmp_path, "wb") as file_object:
+            while True:
+                chunk = await file.read(settings.UPLOAD_CHUNK_SIZE)
+                if not chunk:
+                    break
+                size += len(chunk)
+                if size > max_bytes:
+                    raise ValueError(f"File '{file.filename}' exceeds the {settings.MAX_UPLOAD_SIZE_MB} MB upload limit")
+                digest.update(chunk)
+                file_object.write(chunk)
+
+        file_hash = digest.hexdigest()
+        stored_filename = f"{file_hash}{extension}"
+        os.replace(tmp_path, os.path.join(folder, stored_filename))
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+    return stored_filename, file_hash, size
+
+
+def extract_zip_pdfs(zip_path: str, folder: str = None, max_bytes: int = None, max_files: int = None):
+    """Copy every PDF inside a zip archive to `folder` under content-addressed names.
+
+    Members are streamed in chunks with the same size limit as direct uploads.
+    Returns one entry per PDF member with either `stored_filename`/`sha256` or
+    an `error`, so one bad member does not fail the whole archive.
+    """
+    folder = folder or settings.UPLOAD_FOLDER
+    max_bytes = max_bytes or settings.MAX_UPLOAD_SIZE_MB * 1024 * 1024
+    max_files = max_files or settings.BULK_MAX_FILES
+    os.makedirs(folder, exist_ok=True)
+
+    results = []
+    with zipfile.ZipFile(zip_path) as archive:
+        members = [
+            member for member in archive.infolist()
+            if not member.is_dir()
+            and member.filename.lower().endswith(".pdf")
+            and not os.path.basename(member.filename).startswith(".")
+        ]
+        for member in members[:max_files]:
+            entry = {"filename": member.filename}
+            # file_size comes from the archive header; the copy below enforces the limit on real bytes
+            if member.file_size > max_bytes:
+                entry["error"] = f"File exceeds the {settings.MAX_UPLOAD_SIZE_MB} MB upload limit"
+                results.append(entry)
+                continue
+
+            tmp_path = os.path.join(folder, f".{uuid.uuid4().hex}.part")
+            digest = hashlib.sha256()
+            size = 0
+            try:
+                with archive.open(member) as source, open(tmp_path, "wb") as file_object:
+                    while True:
+                        chunk = source.read(settings.UPLOAD_CHUNK_SIZE)
+                        if not chunk:
+                            break
+                        size += len(chunk)
+                        if size > max_bytes:
+                            raise ValueError(f"File exceeds the {settings.MAX_UPLOAD_SIZE_MB} MB upload limit")
+                        digest.update(chunk)
+                        file_object.write(chunk)
+                entry["sha256"] = digest.hexdigest()
+                entry["stored_filename"] = f"{entry['sha256']}.pdf"
+                os.replace(tmp_path, os.path.join(folder, entry["stored_filename"]))
+            except (ValueError, zipfile.BadZipFile, OSError) as e:
+                entry["error"] = str(e)
+                if os.path.exists(tmp_path):
+                    os.remove(tmp_path)
+            results.append(entry)
+
+        for member in members[max_files:]:
+            results.append({"filename": member.filename, "error": f"Batch is limited to {max_files} files"})
+
+    return results
@@ -1,15 +1,14 @@
-from langchain_openai import ChatOpenAI
 from langchain_core.prompts import PromptTemplate
-from config import settings
 from services import prompt_service
-from sqlalchemy.orm import Session
+from utils import llm_utils
+from sqlalchemy.ext.asyncio import AsyncSession
 import json
 import re
 import logging
 
 logger = logging.getLogger(__name__)
 
-async def generate_job_description(title: str, keywords: str, db: Session):
+async def generate_job_description(title: str, keywords: str, db: AsyncSession):
     try:
         # Fetch the prompt from the database
         job_prompt = await prompt_service.get_prompt_by_name(db, "JOB_DESCRIPTION_PROMPT")
@@ -17,23 +16,21 @@ async def generate_job_description(title: str, keywords: str, db: Session):
             logger.error("Job description prompt not found in database")
             raise ValueError("Job description prompt not found in database")
 
-        llm = ChatOpenAI(model="gpt-4-0125-preview", openai_api_key=settings.OPENAI_API_KEY)
-        
         prompt_template = PromptTemplate(
             input_variables=["title", "keywords"],
             template=job_prompt.content
         )
         
         prompt = prompt_template.format(title=title, keywords=keywords)
-        response = await llm.ainvoke(prompt)
+        response_content = await llm_utils.complete(prompt, purpose=llm_utils.JOB_DESCRIPTION)
         
-        if isinstance(response.content, str):
+        if isinstance(response_content, str):
             try:
                 # Clean response by stripping whitespace and removing unnecessary characters
-                cleaned_response = response.content.strip()
+                cleaned_response = response_content.strip()
                 cleaned_response = re.sub(r'```(json)?', '', cleaned_response)  # Remove ```json or ``` markers
                 cleaned_response = cleaned_response.replace('"null"', 'null').replace('JSON', '').replace('json', '')
-                logger.info("Original response content: %s", response.content)
+                logger.info("Original response content: %s", response_content)
                 logger.info("Cleaned response: %s", cleaned_response)
                 
                 # Parse the cleaned response
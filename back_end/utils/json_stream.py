@@ -0,0 +1,187 @@
+import json
+
+_WHITESPACE = " \t\n\r"
+_LITERALS = ("true", "false", "null")
+_NUMBER_CHARS = set("0123456789+-.eE")
+
+
+class JSONStreamError(ValueError):
+    """The streamed text can no longer become valid JSON."""
+
+
+class IncrementalJSONParser:
+    """Validates JSON one chunk at a time and reports top-level fields as soon as they complete.
+
+    Text before the first `{` or `[` (for example a Markdown code fence) and
+    anything after the root value closes are ignored. `feed()` raises
+    JSONStreamError at the first character that cannot be part of valid JSON
+    and returns the `(key, value)` pairs of the root object (or `(index,
+    value)` items of a root array) completed by that chunk.
+    """
+
+    def __init__(self):
+        self.text = ""
+        self.fields = {}
+        self.done = False
+        self._position = 0
+        self._started = False
+        self._root_kind = None
+        self._root_start = None
+        self._end = None
+        self._stack = []  # containers: [kind, state]
+        self._in_string = False
+        self._escape = False
+        self._scalar = None  # characters of the number or literal being read
+        self._key_start = None
+        self._key = None
+        self._value_start = None
+        self._root_items = 0
+
+    def feed(self, chunk: str):
+        completed = []
+        self.text += chunk
+        while self._position < len(self.text) and not self.done:
+            self._step(self.text[self._position], completed)
+            self._position += 1
+        return completed
+
+    def value(self):
+        """The complete root value. Only valid once `done` is True."""
+        if not self.done:
+            raise JSONStreamError("JSON document is incomplete")
+        return json.loads(self.text[self._root_start:self._end])
+
+    def _error(self, char):
+        raise JSONStreamError(f"Unexpected {char!r} at position {self._position}")
+
+    def _step(self, char, completed):
+        if not self._started:
+            if char in "{[":
+                self._started = True
+                self._root_start = self._position
+                self._root_kind = "object" if char == "{" else "array"
+                self._stack.append([self._root_kind, "first"])
+            return
+
+        if self._in_string:
+            if self._escape:
+                self._escape = False
+            elif char == "\\":
+                self._escape = True
+            elif char == '"':
+                self._in_string = False
+                self._end_value(completed)
+            elif char < " ":
+                self._error(char)
+            return
+
+        if self._scalar is not None:
+            if char.isalnum() or char in _NUMBER_CHARS:
+                self._scalar.append(char)
+                self._check_scalar(complete=False)
+                return
+            self._check_scalar(complete=True)
+            self._scalar = None
+            self._end_value(completed, end=self._position)
+
+        if char in _WHITESPACE:
+            return
+
+        container = self._stack[-1]
+        kind, state = container
+        if kind == "object":
+            if state in ("first", "key"):
+                if char == '"':
+                    container[1] = "in_key"
+                    self._in_string = True
+                    self._key_start = self._position
+                elif char == "}" and state == "first":
+                    self._close(completed)
+                else:
+                    self._error(char)
+            elif state == "colon":
+                if char != ":":
+                    self._error(char)
+                container[1] = "value"
+            elif state == "value":
+                self._start_value(char)
+            elif state == "after":
+                if char == ",":
+                    container[1] = "key"
+                elif char == "}":
+                    self._close(completed)
+                else:
+                    self._error(char)
+        else:
+            if state in ("first", "value"):
+                if char == "]" and state == "first":
+                    self._close(completed)
+                else:
+                    self._start_value(char)
+            elif state == "after":
+                if char == ",":
+                    container[1] = "value"
+                elif char == "]":
+                    self._close(completed)
+                else:
+                    self._error(char)
+
+    def _start_value(self, char):
+        if len(self._stack) == 1:
+            self._value_start = self._position
+        if char == '"':
+            self._stack[-1][1] = "in_value"
+            self._in_string = True
+        elif char in "{[":
+            self._stack[-1][1] = "in_value"
+            self._stack.append(["object" if char == "{" else "array", "first"])
+        elif char.isalnum() or char == "-":
+            self._stack[-1][1] = "in_value"
+            self._scalar = [char]
+            self._check_scalar(complete=False)
+        else:
+            self._error(char)
+
+    def _check_scalar(self, complete: bool):
+        token = "".join(self._scalar)
+        if token[0].isalpha():
+            valid = token in _LITERALS if complete else any(literal.startswith(token) for literal in _LITERALS)
+        else:
+            valid = all(char in _NUMBER_CHARS for char in token)
+            if valid and complete:
+                try:
+                    json.loads(token)
+                except json.JSONDecodeError:
+                    valid = False
+        if not valid:
+            raise JSONStreamError(f"Invalid value {token!r} at position {self._position}")
+
+    def _end_value(self, completed, end=None):
+        end = self._position + 1 if end is None else end
+        container = self._stack[-1]
+        if container[1] == "in_key":
+            if len(self._stack) == 1:
+                self._key = json.loads(self.text[self._key_start:end])
+            container[1] = "colon"
+            return
+        container[1] = "after"
+        if len(self._stack) == 1:
+            self._complete_field(completed, end)
+
+    def _close(self, completed):
+        self._stack.pop()
+        if not self._stack:
+            self.done = True
+            self._end = self._position + 1
+            return
+        self._end_value(completed)
+
+    def _complete_field(self, completed, end):
+        value = json.loads(self.text[self._value_start:end])
+        if self._root_kind == "object":
+            key = self._key
+        else:
+            key = self._root_items
+            self._root_items += 1
+        self.fields[key] = value
+        completed.append((key, value))
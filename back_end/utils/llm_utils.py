@@ -0,0 +1,293 @@
+import asyncio
+import logging
+import random
+import time
+from contextlib import aclosing
+
+import httpx
+import openai
+from langchain_openai import ChatOpenAI
+
+from config import settings
+from utils.json_stream import IncrementalJSONParser, JSONStreamError
+from utils.metrics import registry
+from utils.resume_text_utils import count_tokens
+
+logger = logging.getLogger(__name__)
+
+# Purposes are named after the prompt that drives the call so limits and logs
+# line up with the prompts stored in the database.
+RESUME_PARSING = "RESUME_PARSING_PROMPT"
+MATCHING_EVALUATION = "MATCHING_EVALUATION_PROMPT"
+JOB_DESCRIPTION = "JOB_DESCRIPTION_PROMPT"
+
+RETRYABLE_ERRORS = (
+    openai.RateLimitError,
+    openai.APITimeoutError,
+    openai.APIConnectionError,
+    openai.InternalServerError,
+    httpx.TransportError,
+    asyncio.TimeoutError,
+)
+
+
+LLM_REQUESTS = registry.counter("llm_requests_total", "LLM calls by purpose and outcome", ("purpose", "outcome"))
+LLM_DURATION = registry.histogram(
+    "llm_request_duration_seconds", "Wall time of LLM calls, including retries and waiting for a slot", ("purpose",)
+)
+LLM_QUEUE_WAIT = registry.histogram(
+    "llm_queue_wait_seconds", "Time spent waiting for a concurrency slot", ("purpose",)
+)
+LLM_TIME_TO_FIRST_TOKEN = registry.histogram(
+    "llm_time_to_first_token_seconds", "Time from sending a streamed request to its first chunk", ("purpose",)
+)
+LLM_TOKENS = registry.counter("llm_tokens_total", "Tokens sent and received", ("purpose", "kind"))
+LLM_RETRIES = registry.counter("llm_retries_total", "Retried LLM calls after transient errors", ("purpose",))
+LLM_COST = registry.counter("llm_cost_usd_total", "Estimated spend from token counts and configured prices", ("purpose",))
+
+
+class LLMText(str):
+    """Completion text carrying the provider's token usage (`input_tokens`/`output_tokens`), when known."""
+
+    def __new__(cls, text, usage=None):
+        value = super().__new__(cls, text)
+        value.usage = usage
+        return value
+
+
+class _CallStats:
+    """Per-call bookkeeping turned into metrics when the call ends."""
+
+    def __init__(self, purpose: str, prompt: str):
+        self.purpose = purpose
+        self.prompt = prompt
+        self.started = time.perf_counter()
+        self.slot_acquired = None
+        self.first_chunk = None
+        self.output = []
+        self.usage = None
+
+    def record_slot(self):
+        if self.slot_acquired is None:
+            LLM_QUEUE_WAIT.observe(time.perf_counter() - self.started, purpose=self.purpose)
+        self.slot_acquired = time.perf_counter()
+
+    def record_chunk(self, chunk, streamed=True):
+        if streamed and self.first_chunk is None:
+            self.first_chunk = time.perf_counter()
+            LLM_TIME_TO_FIRST_TOKEN.observe(self.first_chunk - self.slot_acquired, purpose=self.purpose)
+        self.output.append(chunk)
+        if getattr(chunk, "usage", None):
+            self.usage = chunk.usage
+
+    def finish(self, outcome: str):
+        LLM_REQUESTS.inc(purpose=self.purpose, outcome=outcome)
+        LLM_DURATION.observe(time.perf_counter() - self.started, purpose=self.purpose)
+
+        if self.usage:
+            input_tokens = self.usage.get("input_tokens", 0)
+            output_tokens = self.usage.get("output_tokens", 0)
+        else:
+            # Backends that don't report usage (or streams cut short) are estimated locally
+            input_tokens = count_tokens(self.prompt)
+            output_tokens = count_tokens("".join(self.output)) if self.output else 0
+        LLM_TOKENS.inc(input_tokens, purpose=self.purpose, kind="prompt")
+        LLM_TOKENS.inc(output_tokens, purpose=self.purpose, kind="completion")
+        LLM_COST.inc(
+            (input_tokens * settings.LLM_INPUT_PRICE_PER_1K + output_tokens * settings.LLM_OUTPUT_PRICE_PER_1K) / 1000,
+            purpose=self.purpose,
+        )
+
+
+class OpenAIBackend:
+    """Default backend: a single ChatOpenAI client on a pooled HTTP connection pool."""
+
+    def __init__(self, model: str = None, api_key: str = None):
+        self._http_client = httpx.AsyncClient(
+            limits=httpx.Limits(
+                max_connections=settings.LLM_MAX_CONNECTIONS,
+                max_keepalive_connections=settings.LLM_MAX_CONNECTIONS,
+            ),
+            timeout=settings.LLM_TIMEOUT_SECONDS,
+        )
+        self._llm = ChatOpenAI(
+            model=model or settings.LLM_MODEL,
+            openai_api_key=api_key or settings.OPENAI_API_KEY,
+            http_async_client=self._http_client,
+            timeout=settings.LLM_TIMEOUT_SECONDS,
+            max_retries=0,  # retries are handled by the gateway
+            stream_usage=True,
+        )
+
+    async def complete(self, prompt: str) -> str:
+        response = await self._llm.ainvoke(prompt)
+        return LLMText(response.content, response.usage_metadata)
+
+    async def stream(self, prompt: str):
+        async for chunk in self._llm.astream(prompt):
+            # Usage arrives on a final, empty chunk
+            if chunk.content or chunk.usage_metadata:
+                yield LLMText(chunk.content, chunk.usage_metadata)
+
+    async def aclose(self):
+        await self._http_client.aclose()
+
+
+_backend = None
+_global_semaphore = None
+_purpose_semaphores = {}
+
+
+def set_backend(backend):
+    """Replace the backend, e.g. with a stub exposing `async complete(prompt) -> str` in tests."""
+    global _backend
+    _backend = backend
+
+
+def get_backend():
+    global _backend
+    if _backend is None:
+        _backend = OpenAIBackend()
+    return _backend
+
+
+def _get_semaphores(purpose: str):
+    global _global_semaphore
+    if _global_semaphore is None:
+        _global_semaphore = asyncio.Semaphore(settings.LLM_MAX_CONCURRENCY)
+    if purpose not in _purpose_semaphores:
+        limit = settings.LLM_PURPOSE_CONCURRENCY.get(purpose, settings.LLM_MAX_CONCURRENCY)
+        _purpose_semaphores[purpose] = asyncio.Semaphore(limit)
+    return _global_semaphore, _purpose_semaphores[purpose]
+
+
+def _backoff_delay(attempt: int) -> float:
+    # Exponential backoff with full jitter
+    ceiling = min(settings.LLM_RETRY_MAX_DELAY, settings.LLM_RETRY_BASE_DELAY * (2 ** attempt))
+    return random.uniform(0, ceiling)
+
+
+async def complete(prompt: str, purpose: str) -> str:
+    """Run a single completion through the shared backend and return the response text.
+
+    The call waits for a per-purpose slot and then a global slot, so one purpose
+    cannot starve the others, and transient provider errors are retried with
+    exponential backoff and jitter. Latency, tokens, retries and estimated
+    cost are recorded per purpose.
+    """
+    global_semaphore, purpose_semaphore = _get_semaphores(purpose)
+    backend = get_backend()
+    stats = _CallStats(purpose, prompt)
+
+    attempt = 0
+    while True:
+        try:
+            async with purpose_semaphore, global_semaphore:
+                stats.record_slot()
+                response = await backend.complete(prompt)
+            stats.record_chunk(response, streamed=False)
+            stats.finish("success")
+            return response
+        except RETRYABLE_ERRORS as e:
+            if attempt >= settings.LLM_MAX_RETRIES:
+                logger.error("LLM call for %s failed after %d retries: %s", purpose, attempt, e)
+                stats.finish("error")
+                raise
+            delay = _backoff_delay(attempt)
+            attempt += 1
+            LLM_RETRIES.inc(purpose=purpose)
+            logger.warning("LLM call for %s failed (%s), retry %d in %.2fs", purpose, e, attempt, delay)
+            await asyncio.sleep(delay)
+        except Exception:
+            stats.finish("error")
+            raise
+
+
+async def stream(prompt: str, purpose: str):
+    """Yield the completion text chunk by chunk as the provider produces it.
+
+    Holds the same concurrency slots as `complete()` for the whole stream.
+    Transient errors are retried only before the first chunk arrives; closing
+    the iterator early closes the HTTP response, so the provider stops
+    generating, and is recorded with outcome "aborted". Backends without
+    `stream()` yield the full text as one chunk.
+    """
+    global_semaphore, purpose_semaphore = _get_semaphores(purpose)
+    backend = get_backend()
+    stats = _CallStats(purpose, prompt)
+    outcome = "aborted"
+
+    try:
+        attempt = 0
+        while True:
+            started = False
+            try:
+                async with purpose_semaphore, global_semaphore:
+                    stats.record_slot()
+                    if not hasattr(backend, "stream"):
+                        response = await backend.complete(prompt)
+                        stats.record_chunk(response, streamed=False)
+                        yield response
+                        outcome = "success"
+                        return
+                    async with aclosing(backend.stream(prompt)) as chunks:
+                        async for chunk in chunks:
+                            started = True
+                            stats.record_chunk(chunk)
+                            if chunk:
+                                yield chunk
+                    outcome = "success"
+                    return
+            except RETRYABLE_ERRORS as e:
+                if started or attempt >= settings.LLM_MAX_RETRIES:
+                    logger.error("LLM stream for %s failed after %d retries: %s", purpose, attempt, e)
+                    outcome = "error"
+                    raise
+                delay = _backoff_delay(attempt)
+                attempt += 1
+                LLM_RETRIES.inc(purpose=purpose)
+                logger.warning("LLM stream for %s failed (%s), retry %d in %.2fs", purpose, e, attempt, delay)
+                await asyncio.sleep(delay)
+            except Exception:
+                outcome = "error"
+                raise
+    finally:
+        stats.finish(outcome)
+
+
+async def complete_json(prompt: str, purpose: str, on_field=None):
+    """Stream a completion that should be a JSON document and parse it as it arrives.
+
+    `on_field(key, value)` is called as each top-level field of the root
+    object (or item of a root array) completes; if it returns True the
+    generation is stopped and a dict of the fields completed so far is
+    returned. Output that stops being valid JSON aborts the stream at once and
+    is retried up to LLM_JSON_RETRIES times before JSONStreamError is raised.
+    """
+    attempt = 0
+    while True:
+        parser = IncrementalJSONParser()
+        try:
+            async with aclosing(stream(prompt, purpose)) as chunks:
+                async for chunk in chunks:
+                    for key, value in parser.feed(chunk):
+                        if on_field is not None and on_field(key, value):
+                            logger.info("Stopped %s stream early after field %r", purpose, key)
+                            return dict(parser.fields)
+            # The stream is drained even once the document is complete: the usage report arrives last
+            return parser.value()
+        except JSONStreamError as e:
+            if attempt >= settings.LLM_JSON_RETRIES:
+                logger.error("Invalid JSON from LLM for %s: %s\nReceived: %s", purpose, e, parser.text)
+                raise
+            attempt += 1
+            logger.warning("Invalid JSON from LLM for %s (%s), aborted after %d chars, retry %d",
+                           purpose, e, len(parser.text), attempt)
+
+
+async def close():
+    """Release pooled connections held by the backend."""
+    global _backend
+    if _backend is not None and hasattr(_backend, "aclose"):
+        await _backend.aclose()
+    _backend = None
@@ -1,9 +1,79 @@
+import asyncio
+import multiprocessing
+import os
+import signal
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from PyPDF2 import PdfReader
+from config import settings
+
+_executor = None
+_worker_pids = None  # The current pool's workers report their pids here, so a timeout can kill them
+_KILL_SIGNAL = getattr(signal, "SIGKILL", signal.SIGTERM)  # SIGTERM terminates the process on Windows
 
 def extract_text_from_pdf(pdf_file_path):
-    text = ''
     with open(pdf_file_path, 'rb') as file:
         reader = PdfReader(file)
-        for page in reader.pages:
-            text += page.extract_text() or ''
-    return text
\ No newline at end of file
+        # Join once instead of growing a string page by page; form feeds keep page boundaries
+        return '\f'.join(page.extract_text() or '' for page in reader.pages)
+
+def _report_pid(pid_queue):
+    pid_queue.put(os.getpid())
+
+def _get_executor():
+    global _executor, _worker_pids
+    if _executor is None:
+        _worker_pids = multiprocessing.SimpleQueue()
+        _executor = ProcessPoolExecutor(
+            max_workers=settings.PDF_EXTRACTION_WORKERS, initializer=_report_pid, initargs=(_worker_pids,)
+        )
+    return _executor
+
+def _kill_workers(pid_queue):
+    while not pid_queue.empty():
+        try:
+            os.kill(pid_queue.get(), _KILL_SIGNAL)
+        except OSError:
+            pass  # Already gone
+
+def _reset_executor(executor=None, kill=False):
+    """Drop the pool (only if it is still `executor`, when given) so the next call starts a fresh one.
+
+    With `kill`, its worker processes are terminated first: a worker stuck on
+    a pathological PDF ignores cancellation and would otherwise hold its
+    slot for good.
+    """
+    global _executor
+    if _executor is None or (executor is not None and executor is not _executor):
+        return
+    if kill:
+        _kill_workers(_worker_pids)
+    _executor.shutdown(wait=False, cancel_futures=True)
+    _executor = None
+_worker_pids = None  # The current pool's workers report their pids here, so a timeout can kill them
+_KILL_SIGNAL = getattr(signal, "SIGKILL", signal.SIGTERM)  # SIGTERM terminates the process on Windows
+
+async def extract_text_from_pdf_async(pdf_file_path, timeout=None):
+    """Extract PDF text in the shared process pool without blocking the event loop."""
+    timeout = timeout or settings.PDF_EXTRACTION_TIMEOUT_SECONDS
+    loop = asyncio.get_running_loop()
+    for attempt in range(2):
+        executor = _get_executor()
+        try:
+            return await asyncio.wait_for(
+                loop.run_in_executor(executor, extract_text_from_pdf, pdf_file_path),
+                timeout=timeout
+            )
+        except asyncio.TimeoutError:
+            _reset_executor(executor, kill=True)
+            raise ValueError(f"PDF text extraction timed out after {timeout} seconds")
+        except BrokenProcessPool:
+            if executor is not _executor and attempt == 0:
+                # The pool was killed because of another file's timeout; this file gets a fresh pool
+                continue
+            # A worker died (e.g. on a malformed PDF); start a fresh pool for the next call
+            _reset_executor(executor)
+            raise ValueError("PDF text extraction worker crashed")
+
+def shutdown_executor():
+    _reset_executor()
@@ -0,0 +1,294 @@
+import re
+
+# Bump whenever the pre-extraction output changes so cached parses are invalidated
+PREPROCESSOR_VERSION = "1"
+
+EMAIL_RE = re.compile(r"[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,}")
+PHONE_RE = re.compile(r"(?<![\w/])\+?\(?\d[\d\s().-]{7,18}\d(?![\w/])")
+LINK_RE = re.compile(
+    r"(?:https?://|www\.)[^\s<>()]+|(?:linkedin\.com|github\.com|gitlab\.com|behance\.net)/[^\s<>()]+",
+    re.IGNORECASE,
+)
+DATE_RANGE_RE = re.compile(r"\b(?:19|20)\d{2}\s*[-–/.]\s*(?:\d{2}|(?:19|20)\d{2})\b")
+PAGE_NUMBER_RE = re.compile(r"^(?:page\s*)?\d+\s*(?:(?:of|/)\s*\d+)?$", re.IGNORECASE)
+BOILERPLATE_RE = re.compile(
+    r"^(?:curriculum vitae|resume|r[ée]sum[ée]|cv|references? (?:are )?available (?:up)?on request\.?)$",
+    re.IGNORECASE,
+)
+
+# Sections the parsing prompt still needs the model for
+MODEL_SECTIONS = ("experience", "education", "projects", "skills")
+
+SECTION_HEADINGS = {
+    "experience": (
+        "experience", "work experience", "professional experience", "employment",
+        "employment history", "work history", "career history", "internships",
+    ),
+    "education": ("education", "academic background", "academics", "qualifications", "academic qualifications"),
+    "projects": ("projects", "personal projects", "academic projects", "key projects", "selected projects"),
+    "skills": (
+        "skills", "technical skills", "key skills", "core competencies", "competencies",
+        "technologies", "tools and technologies", "skills and tools", "tech stack",
+    ),
+    # Sections the prompt does not ask for; they are dropped before the LLM call
+    "summary": ("summary", "professional summary", "profile", "objective", "career objective", "about me"),
+    "references": ("references",),
+    "interests": ("interests", "hobbies", "hobbies and interests"),
+    "declaration": ("declaration",),
+}
+_HEADING_LOOKUP = {alias: section for section, aliases in SECTION_HEADINGS.items() for alias in aliases}
+
+
+def _clean_line(raw_line: str) -> str:
+    return re.sub(r"[ \t\v\u00a0]+", " ", raw_line).strip()
+
+
+def normalize_text(text: str) -> str:
+    """Collapse runs of whitespace and drop page numbers, boilerplate and repeated page headers/footers.
+
+    Pages are expected to be separated by form feeds, as produced by
+    `pdf_utils.extract_text_from_pdf`.
+    """
+    pages = [
+        [_clean_line(raw_line) for raw_line in page.replace("\r", "\n").split("\n")]
+        for page in (text or "").split("\f")
+    ]
+
+    # A line at the top or bottom of more than one page is a running header/footer
+    edge_counts = {}
+    for page in pages:
+        content = [line for line in page if line]
+        for line in set(content[:2] + content[-2:]):
+            edge_counts[line.lower()] = edge_counts.get(line.lower(), 0) + 1
+    running_lines = {line for line, count in edge_counts.items() if count > 1}
+
+    lines = []
+    seen_running_lines = set()
+    for page in pages:
+        for line in page:
+            if not line:
+                if lines and lines[-1]:
+                    lines.append("")
+                continue
+            if PAGE_NUMBER_RE.match(line) or BOILERPLATE_RE.match(line):
+                continue
+            key = line.lower()
+            if key in running_lines and _heading_section(line) is None:
+                # Keep the first occurrence: the name is often repeated at the top of every page
+                if key in seen_running_lines:
+                    continue
+                seen_running_lines.add(key)
+            lines.append(line)
+    return "\n".join(lines).strip()
+
+
+def _heading_section(line: str):
+    candidate = re.sub(r"[^a-z& ]", "", line.lower()).replace("&", "and").strip()
+    if not candidate or len(candidate.split()) > 4:
+        return None
+    return _HEADING_LOOKUP.get(candidate)
+
+
+def _find_phone(text: str):
+    for match in PHONE_RE.finditer(text):
+        value = match.group().strip()
+        digits = re.sub(r"\D", "", value)
+        if 9 <= len(digits) <= 15 and not DATE_RANGE_RE.search(value):
+            return value
+    return None
+
+
+def pre_extract(text: str) -> dict:
+    """Pull contacts, links and section boundaries out of raw resume text without an LLM.
+
+    Returns a dict with `email`, `phone_number`, `links`, the `header` (text
+    before the first recognised section, usually the name) and `sections`
+    mapping section names to their text.
+    """
+    normalized = normalize_text(text)
+
+    links = []
+    for link in LINK_RE.findall(normalized):
+        link = link.rstrip(".,;")
+        if link not in links:
+            links.append(link)
+
+    email_match = EMAIL_RE.search(normalized)
+    email = email_match.group() if email_match else None
+    phone_number = _find_phone(normalized)
+
+    header_lines = []
+    sections = {}
+    current = None
+    for line in normalized.split("\n"):
+        section = _heading_section(line) if line else None
+        if section:
+            current = section
+            sections.setdefault(current, [])
+            continue
+        # Contact details are returned separately, so keep them out of the model input
+        line = LINK_RE.sub("", EMAIL_RE.sub("", line))
+        if phone_number:
+            line = line.replace(phone_number, "")
+        line = re.sub(r"^[\s|,;:•·-]+|[\s|,;:•·-]+$", "", line)
+        if current is None:
+            if line:
+                header_lines.append(line)
+        else:
+            sections[current].append(line)
+
+    return {
+        "email": email,
+        "phone_number": phone_number,
+        "links": links,
+        "header": "\n".join(header_lines),
+        "sections": {name: "\n".join(lines).strip() for name, lines in sections.items()},
+    }
+
+
+def build_model_text(pre_extracted: dict) -> str:
+    """Compact text for the parsing prompt: the header plus only the sections the model still has to read."""
+    sections = pre_extracted["sections"]
+    if not any(sections.get(name) for name in MODEL_SECTIONS):
+        # No recognisable headings: fall back to everything that is left
+        parts = [pre_extracted["header"]] + list(sections.values())
+        return "\n".join(part for part in parts if part).strip()
+
+    parts = [pre_extracted["header"]]
+    for name in MODEL_SECTIONS:
+        if sections.get(name):
+            parts.append(f"{name.capitalize()}:\n{sections[name]}")
+    return "\n\n".join(part for part in parts if part).strip()
+
+
+def apply_local_fields(parsed_data: dict, pre_extracted: dict) -> dict:
+    """Fill contact fields found locally into the model's output."""
+    if not isinstance(parsed_data, dict) or not parsed_data:
+        return parsed_data
+    for field in ("email", "phone_number"):
+        if pre_extracted.get(field):
+            parsed_data[field] = pre_extracted[field]
+    return parsed_data
+
+
+_encoding = None
+
+
+def count_tokens(text: str) -> int:
+    """Token count for budget checks; falls back to a ~4 characters/token estimate if tiktoken is unavailable."""
+    global _encoding
+    if _encoding is None:
+        try:
+            import tiktoken
+            _encoding = tiktoken.get_encoding("cl100k_base")
+        except Exception:
+            _encoding = False
+    if _encoding is False:
+        return len(text) // 4 + 1
+    return len(_encoding.encode(text, disallowed_special=()))
+
+
+def _split_to_budget(text: str, token_budget: int):
+    """Split text on line boundaries into pieces that each fit the budget."""
+    pieces, current, current_tokens = [], [], 0
+    for line in text.split("\n"):
+        line_tokens = count_tokens(line) + 1
+        if current and current_tokens + line_tokens > token_budget:
+            pieces.append("\n".join(current))
+            current, current_tokens = [], 0
+        current.append(line)
+        current_tokens += line_tokens
+    if current:
+        pieces.append("\n".join(current))
+    return pieces
+
+
+def chunk_model_text(pre_extracted: dict, token_budget: int):
+    """Split the model input into section-aligned chunks of at most `token_budget` tokens.
+
+    Every chunk repeats the header so the model keeps the candidate's name in
+    context. Sections are kept whole where they fit and split on line
+    boundaries where they don't.
+    """
+    header = pre_extracted["header"]
+    sections = pre_extracted["sections"]
+    if any(sections.get(name) for name in MODEL_SECTIONS):
+        units = [(name.capitalize(), sections[name]) for name in MODEL_SECTIONS if sections.get(name)]
+    else:
+        header, units = "", [("", build_model_text(pre_extracted))]
+
+    budget = max(token_budget - count_tokens(header), 1)
+    blocks = []
+    for label, text in units:
+        for index, piece in enumerate(_split_to_budget(text, budget)):
+            title = f"{label} (continued)" if label and index else label
+            blocks.append(f"{title}:\n{piece}" if title else piece)
+
+    chunks, current, current_tokens = [], [], 0
+    for block in blocks:
+        block_tokens = count_tokens(block)
+        if current and current_tokens + block_tokens > budget:
+            chunks.append(current)
+            current, current_tokens = [], 0
+        current.append(block)
+        current_tokens += block_tokens
+    if current:
+        chunks.append(current)
+
+    return ["\n\n".join(([header] if header else []) + blocks) for blocks in chunks]
+
+
+def _clean_value(value):
+    return None if value in (None, "null", "") else value
+
+
+def merge_parsed_chunks(results) -> dict:
+    """Merge per-chunk parses (in document order) into the single shape submit_resume expects."""
+    merged = {
+        "name": None,
+        "email": None,
+        "phone_number": None,
+        "skills": None,
+        "education": None,
+        "projects": [],
+        "experiences": [],
+    }
+    skills, seen_skills = [], set()
+    seen_projects, seen_experiences = set(), set()
+
+    for result in results:
+        if not isinstance(result, dict):
+            continue
+        for field in ("name", "email", "phone_number"):
+            if merged[field] is None:
+                merged[field] = _clean_value(result.get(field))
+
+        raw_skills = _clean_value(result.get("skills"))
+        if isinstance(raw_skills, str):
+            raw_skills = raw_skills.split(",")
+        for skill in raw_skills or []:
+            skill = str(skill).strip()
+            if skill and skill.lower() not in seen_skills:
+                seen_skills.add(skill.lower())
+                skills.append(skill)
+
+        education = result.get("education")
+        if merged["education"] is None and isinstance(education, dict) and any(
+            _clean_value(value) for value in education.values()
+        ):
+            merged["education"] = education
+
+        for field, seen in (("projects", seen_projects), ("experiences", seen_experiences)):
+            items = result.get(field)
+            if not isinstance(items, list):
+                continue
+            for item in items:
+                if not isinstance(item, dict):
+                    continue
+                key = tuple(sorted((k, str(v).lower()) for k, v in item.items()))
+                if key not in seen:
+                    seen.add(key)
+                    merged[field].append(item)
+
+    merged["skills"] = ", ".join(skills) if skills else None
+    return merged
@@ -0,0 +1,132 @@
+import math
+import re
+from array import array
+from collections import Counter
+
+import numpy as np
+
+TOKEN_RE = re.compile(r"[a-z0-9][a-z0-9+#]*(?:\.[a-z0-9]+)*")
+STOPWORDS = frozenset(
+    "a an and are as at be by for from has have in is it its of on or our that the to was we were will with "
+    "you your this these those who which while within".split()
+)
+
+
+def tokenize(text: str):
+    return [token for token in TOKEN_RE.findall((text or "").lower()) if token not in STOPWORDS]
+
+
+class BM25Index:
+    """Incrementally updatable BM25 index over short documents.
+
+    Documents are stored as compact sparse vectors (int32 term ids and float32
+    term frequencies) and postings as typed arrays, so memory stays a few bytes
+    per token. Updating a document tombstones its old slot and appends a new
+    one; postings are compacted once too many slots are dead.
+    """
+
+    def __init__(self, k1: float = 1.2, b: float = 0.75):
+        self.k1 = k1
+        self.b = b
+        self._vocabulary = {}
+        self._document_frequency = array("i")
+        self._postings_slots = []
+        self._postings_tfs = []
+        self._slot_doc_ids = []
+        self._slot_vectors = []
+        self._slot_lengths = array("f")
+        self._alive = array("b")
+        self._doc_slots = {}
+        self._total_length = 0.0
+        self._dead_slots = 0
+
+    def __len__(self):
+        return len(self._doc_slots)
+
+    def _term_id(self, term: str) -> int:
+        term_id = self._vocabulary.get(term)
+        if term_id is None:
+            term_id = len(self._vocabulary)
+            self._vocabulary[term] = term_id
+            self._document_frequency.append(0)
+            self._postings_slots.append(array("i"))
+            self._postings_tfs.append(array("f"))
+        return term_id
+
+    def upsert(self, doc_id, tokens):
+        self.remove(doc_id)
+        counts = Counter(tokens)
+        if not counts:
+            return
+
+        slot = len(self._slot_doc_ids)
+        term_ids = np.fromiter((self._term_id(term) for term in counts), dtype=np.int32, count=len(counts))
+        tfs = np.fromiter(counts.values(), dtype=np.float32, count=len(counts))
+        for term_id, tf in zip(term_ids.tolist(), tfs.tolist()):
+            self._postings_slots[term_id].append(slot)
+            self._postings_tfs[term_id].append(tf)
+            self._document_frequency[term_id] += 1
+
+        length = float(tfs.sum())
+        self._slot_doc_ids.append(doc_id)
+        self._slot_vectors.append((term_ids, tfs))
+        self._slot_lengths.append(length)
+        self._alive.append(1)
+        self._doc_slots[doc_id] = slot
+        self._total_length += length
+
+    def remove(self, doc_id):
+        slot = self._doc_slots.pop(doc_id, None)
+        if slot is None:
+            return
+        term_ids, _ = self._slot_vectors[slot]
+        for term_id in term_ids.tolist():
+            self._document_frequency[term_id] -= 1
+        self._alive[slot] = 0
+        self._total_length -= self._slot_lengths[slot]
+        self._slot_vectors[slot] = (np.empty(0, dtype=np.int32), np.empty(0, dtype=np.float32))
+        self._dead_slots += 1
+        if self._dead_slots > 1000 and self._dead_slots > len(self._doc_slots):
+            self._compact()
+
+    def _compact(self):
+        live = [(self._slot_doc_ids[slot], self._slot_vectors[slot]) for slot in self._doc_slots.values()]
+        terms = {term_id: term for term, term_id in self._vocabulary.items()}
+        self.__init__(self.k1, self.b)
+        for doc_id, (term_ids, tfs) in live:
+            tokens = []
+            for term_id, tf in zip(term_ids.tolist(), tfs.tolist()):
+                tokens.extend([terms[term_id]] * int(tf))
+            self.upsert(doc_id, tokens)
+
+    def search(self, tokens, k: int = 50):
+        """Top-k `(doc_id, score)` pairs for a bag of query tokens."""
+        documents = len(self._doc_slots)
+        if not documents:
+            return []
+
+        lengths = np.frombuffer(self._slot_lengths, dtype=np.float32)
+        alive = np.frombuffer(self._alive, dtype=np.int8).astype(bool)
+        average_length = self._total_length / documents
+        norm = self.k1 * (1 - self.b + self.b * lengths / average_length)
+        scores = np.zeros(len(lengths), dtype=np.float32)
+
+        for term, query_tf in Counter(tokens).items():
+            term_id = self._vocabulary.get(term)
+            if term_id is None or self._document_frequency[term_id] <= 0:
+                continue
+            df = self._document_frequency[term_id]
+            idf = math.log(1 + (documents - df + 0.5) / (df + 0.5))
+            slots = np.frombuffer(self._postings_slots[term_id], dtype=np.int32)
+            tfs = np.frombuffer(self._postings_tfs[term_id], dtype=np.float32)
+            # Each slot appears at most once per term, so plain fancy-index addition is safe
+            scores[slots] += query_tf * idf * tfs * (self.k1 + 1) / (tfs + norm[slots])
+
+        scores[~alive] = 0
+        candidates = np.flatnonzero(scores > 0)
+        if not len(candidates):
+            return []
+        if len(candidates) > k:
+            candidates = candidates[np.argpartition(-scores[candidates], k - 1)[:k]]
+        candidates = candidates[np.argsort(-scores[candidates], kind="stable")]
+        return [(self._slot_doc_ids[slot], float(scores[slot])) for slot in candidates.tolist()]
@@ -0,0 +1,213 @@
+import logging
+import time
+from collections import deque
+
+from sqlalchemy import select
+
+from config import settings
+from models import SkillAlias, SkillAliasDeletion, CanonicalSkill
+
+logger = logging.getLogger(__name__)
+
+
+def normalize_skill_text(text: str) -> str:
+    return " ".join((text or "").lower().split())
+
+
+def _is_word_char(char: str) -> bool:
+    return char.isalnum() or char == "_"
+
+
+class AhoCorasick:
+    """Multi-pattern matcher that finds every pattern in a text in one linear pass.
+
+    Patterns can be added or removed at any time. Adding only extends the trie;
+    the failure links are recomputed lazily on the next search, which is linear
+    in the size of the trie and much cheaper than reloading the taxonomy.
+    """
+
+    def __init__(self):
+        self._goto = [{}]
+        self._fail = [0]
+        self._outputs = [{}]  # node -> {value: pattern length}
+        self._output_link = [0]  # nearest node on the failure chain with outputs
+        self._dirty = False
+
+    def add(self, pattern: str, value):
+        node = 0
+        for char in pattern:
+            next_node = self._goto[node].get(char)
+            if next_node is None:
+                next_node = len(self._goto)
+                self._goto[node][char] = next_node
+                self._goto.append({})
+                self._fail.append(0)
+                self._outputs.append({})
+                self._output_link.append(0)
+            node = next_node
+        self._outputs[node][value] = len(pattern)
+        self._dirty = True
+
+    def remove(self, pattern: str, value):
+        node = 0
+        for char in pattern:
+            node = self._goto[node].get(char)
+            if node is None:
+                return
+        self._outputs[node].pop(value, None)
+        self._dirty = True
+
+    def _build(self):
+        queue = deque()
+        for node in self._goto[0].values():
+            self._fail[node] = 0
+            self._output_link[node] = 0
+            queue.append(node)
+        while queue:
+            node = queue.popleft()
+            for char, child in self._goto[node].items():
+                fail = self._fail[node]
+                while fail and char not in self._goto[fail]:
+                    fail = self._fail[fail]
+                self._fail[child] = self._goto[fail].get(char, 0)
+                link = self._fail[child]
+                self._output_link[child] = link if self._outputs[link] else self._output_link[link]
+                queue.append(child)
+        self._dirty = False
+
+    def iter_matches(self, text: str):
+        """Yield `(start, end, value)` for every pattern occurrence in `text`."""
+        if self._dirty:
+            self._build()
+        node = 0
+        for index, char in enumerate(text):
+            while node and char not in self._goto[node]:
+                node = self._fail[node]
+            node = self._goto[node].get(char, 0)
+            match_node = node if self._outputs[node] else self._output_link[node]
+            while match_node:
+                for value, length in self._outputs[match_node].items():
+                    yield index - length + 1, index + 1, value
+                match_node = self._output_link[match_node]
+
+
+class SkillMatcher:
+    """In-memory index of the canonical skill taxonomy.
+
+    Aliases are loaded from `skill_alias` and kept in an Aho-Corasick automaton
+    so resume text and job descriptions can be mapped to canonical skill ids in
+    a single pass. `refresh()` picks up aliases added since the last load by
+    their id and drops aliases deleted elsewhere by reading `skill_alias_deletion`
+    past the last deletion it has seen.
+    """
+
+    def __init__(self):
+        self._automaton = AhoCorasick()
+        self._aliases = {}  # alias_id -> (alias, canonical_skill_id)
+        self._by_alias = {}  # alias -> canonical_skill_id
+        self._names = {}  # canonical_skill_id -> name
+        self._max_alias_id = 0
+        self._max_deletion_id = 0
+        self._checked_at = 0.0
+
+    async def refresh(self, db, force: bool = False):
+        if not force and time.monotonic() - self._checked_at < settings.SKILL_TAXONOMY_REFRESH_SECONDS:
+            return
+        self._checked_at = time.monotonic()
+
+        new_aliases = (await db.execute(
+            select(SkillAlias.alias_id, SkillAlias.alias, SkillAlias.canonical_skill_id)
+            .where(SkillAlias.alias_id > self._max_alias_id)
+        )).all()
+        for alias_id, alias, canonical_skill_id in new_aliases:
+            self.add_alias(alias_id, alias, canonical_skill_id)
+
+        # Read after the new aliases, so an alias added and deleted in between is still dropped
+        deletions = (await db.execute(
+            select(SkillAliasDeletion.deletion_id, SkillAliasDeletion.alias_id)
+            .where(SkillAliasDeletion.deletion_id > self._max_deletion_id)
+        )).all()
+        for deletion_id, alias_id in deletions:
+            self.remove_alias(alias_id)
+            self._max_deletion_id = max(self._max_deletion_id, deletion_id)
+
+        if new_aliases:
+            self._names.update(dict((await db.execute(select(CanonicalSkill.canonical_skill_id, CanonicalSkill.name))).all()))
+
+    def add_alias(self, alias_id: int, alias: str, canonical_skill_id: int, name: str = None):
+        alias = normalize_skill_text(alias)
+        self._aliases[alias_id] = (alias, canonical_skill_id)
+        self._by_alias[alias] = canonical_skill_id
+        self._automaton.add(alias, canonical_skill_id)
+        self._max_alias_id = max(self._max_alias_id, alias_id)
+        if name:
+            self._names[canonical_skill_id] = name
+
+    def remove_alias(self, alias_id: int):
+        alias, canonical_skill_id = self._aliases.pop(alias_id, (None, None))
+        if alias is None:
+            return
+        # The same text may have been re-added under a new id before this deletion was replayed
+        readded = [skill_id for other, skill_id in self._aliases.values() if other == alias]
+        if canonical_skill_id not in readded:
+            self._automaton.remove(alias, canonical_skill_id)
+        if not readded:
+            self._by_alias.pop(alias, None)
+
+    def remove_canonical_skill(self, canonical_skill_id: int):
+        for alias_id, (_, skill_id) in list(self._aliases.items()):
+            if skill_id == canonical_skill_id:
+                self.remove_alias(alias_id)
+        self._names.pop(canonical_skill_id, None)
+
+    def name(self, canonical_skill_id: int):
+        return self._names.get(canonical_skill_id)
+
+    def aliases(self, canonical_skill_id: int):
+        """Normalized alias texts of a canonical skill, its own name included."""
+        return [alias for alias, skill_id in self._aliases.values() if skill_id == canonical_skill_id]
+
+    def find_skill_ids(self, text: str):
+        """Canonical skill ids mentioned in `text`, in order of first appearance.
+
+        Matches must sit on word boundaries, and overlapping matches resolve to
+        the longest one, so "Py" never matches inside "Python".
+        """
+        text = normalize_skill_text(text)
+        matches = sorted(
+            (
+                (start, end, value)
+                for start, end, value in self._automaton.iter_matches(text)
+                if (start == 0 or not _is_word_char(text[start - 1]))
+                and (end == len(text) or not _is_word_char(text[end]))
+            ),
+            key=lambda match: (match[0], -(match[1] - match[0])),
+        )
+
+        skill_ids, seen, covered_until = [], set(), 0
+        for start, end, value in matches:
+            if start < covered_until:
+                continue
+            covered_until = end
+            if value not in seen:
+                seen.add(value)
+                skill_ids.append(value)
+        return skill_ids
+
+    def normalize(self, skill: str):
+        """Canonical skill id for a single free-text skill, or None if it is not in the taxonomy."""
+        if not skill:
+            return None
+        canonical_skill_id = self._by_alias.get(normalize_skill_text(skill))
+        if canonical_skill_id is not None:
+            return canonical_skill_id
+        skill_ids = self.find_skill_ids(skill)
+        return skill_ids[0] if len(skill_ids) == 1 else None
+
+
+skill_matcher = SkillMatcher()
+
+
+async def get_skill_matcher(db) -> SkillMatcher:
+    await skill_matcher.refresh(db)
+    return skill_matcher
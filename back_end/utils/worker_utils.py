@@ -0,0 +1,123 @@
+import asyncio
+import logging
+import time
+from contextlib import asynccontextmanager
+
+logger = logging.getLogger(__name__)
+
+
+class WorkerPool:
+    """A fixed number of asyncio workers draining a database-backed queue.
+
+    `claim` is an async callable returning the next claimed item (or None when
+    the queue is empty) and `process` handles one item. Idle workers sleep
+    until `notify()` is called or `poll_interval` passes, so new work is picked
+    up immediately on this process and within one poll on every other one.
+    `recover`, if given, runs on start and every `recover_interval` seconds to
+    requeue work abandoned by crashed or restarted workers.
+    """
+
+    def __init__(self, name, claim, process, concurrency, poll_interval, recover=None, recover_interval=60):
+        self.name = name
+        self.claim = claim
+        self.process = process
+        self.concurrency = concurrency
+        self.poll_interval = poll_interval
+        self.recover = recover
+        self.recover_interval = recover_interval
+        self._wakeup = None
+        self._tasks = []
+
+    def start(self):
+        if self._tasks:
+            return
+        self._wakeup = asyncio.Event()
+        self._tasks = [
+            asyncio.create_task(self._run(), name=f"{self.name}-{index}")
+            for index in range(self.concurrency)
+        ]
+        if self.recover is not None:
+            self._tasks.append(asyncio.create_task(self._recover_loop(), name=f"{self.name}-recover"))
+        logger.info("Started %d %s workers", self.concurrency, self.name)
+
+    def notify(self):
+        if self._wakeup is not None:
+            self._wakeup.set()
+
+    async def stop(self):
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    async def _run(self):
+        while True:
+            self._wakeup.clear()
+            try:
+                item = await self.claim()
+            except Exception:
+                logger.exception("%s worker failed to claim work", self.name)
+                item = None
+
+            if item is None:
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout=self.poll_interval)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+
+            try:
+                await self.process(item)
+            except Exception:
+                logger.exception("%s worker failed to process %s", self.name, item)
+
+    async def _recover_loop(self):
+        while True:
+            try:
+                await self.recover()
+            except Exception:
+                logger.exception("%s recovery failed", self.name)
+            await asyncio.sleep(self.recover_interval)
+
+
+@asynccontextmanager
+async def heartbeat(touch, interval: float):
+    """Await `touch()` every `interval` seconds while the block runs.
+
+    Workers wrap long stages (LLM calls, PDF parsing) in this so the stale
+    sweeper can tell a slow item from one whose worker died. `touch` must
+    use its own session: the block's session may be mid-query.
+    """
+    async def beat():
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                await touch()
+            except Exception:
+                logger.exception("Heartbeat failed")
+
+    task = asyncio.create_task(beat())
+    try:
+        yield
+    finally:
+        task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
+
+
+class RateLimiter:
+    """Spaces calls evenly so no more than `rate_per_minute` start in any minute."""
+
+    def __init__(self, rate_per_minute: float):
+        self.interval = 60.0 / rate_per_minute if rate_per_minute > 0 else 0.0
+        self._next_slot = 0.0
+        self._lock = asyncio.Lock()
+
+    async def wait(self):
+        if not self.interval:
+            return
+        async with self._lock:
+            now = time.monotonic()
+            delay = self._next_slot - now
+            self._next_slot = max(now, self._next_slot) + self.interval
+        if delay > 0:
+            await asyncio.sleep(delay)
@@ -17,7 +17,7 @@ import { useNavigate } from 'react-router-dom';
 const parseResume = async (file: File): Promise<any> => {
   try {
     const uploadData = await uploadResume(file);
-    const filename = extractFileName(uploadData.info);
+    const filename = uploadData.filename ?? extractFileName(uploadData.info);
     const parsedResume = await retrieveResume(filename);
     console.log(parsedResume)
     return parsedResume;
@@ -348,4 +348,4 @@ export default function ResumeParser() {
       </div>
     </>
   )
-}
\ No newline at end of file
+}
\ No newline at end of file